@@ -17,6 +17,12 @@ def get_user_by_email(db: Session, email: str):
 def get_user_by_id(db: Session, user_id: int):
     return db.query(User).filter(User.id == user_id).first()
 
+# Users among user_ids in one query; unknown ids are left out
+def get_users_by_ids(db: Session, user_ids):
+    if not user_ids:
+        return []
+    return db.query(User).filter(User.id.in_(set(user_ids))).order_by(User.id).all()
+
 def create_role(db: Session, role: RoleCreate):
     db_role = Role(name=role.name, description=role.description)
     db.add(db_role)
@@ -3,8 +3,8 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 import bcrypt
 from .database import get_db
-from .schemas import UserCreate, UserResponse, Token, RoleCreate, RoleResponse
-from .crud import create_user, get_user_by_email, create_role, get_roles, get_user_by_id, update_user, soft_delete_user, hard_delete_user, reactivate_user
+from .schemas import UserCreate, UserResponse, UserLookup, Token, RoleCreate, RoleResponse
+from .crud import create_user, get_user_by_email, create_role, get_roles, get_user_by_id, get_users_by_ids, update_user, soft_delete_user, hard_delete_user, reactivate_user
 from .auth import create_access_token, get_current_user
 
 app = FastAPI(
@@ -41,6 +41,11 @@ def get_user(user_id: int, current_user: dict = Depends(get_current_user), db: S
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
 
+# Many users in one call (used by project_service for bulk invitations); unknown ids are left out
+@app.post("/users/lookup", response_model=list[UserResponse])
+def lookup_users(lookup: UserLookup, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    return get_users_by_ids(db, lookup.ids)
+
 @app.post("/roles", response_model=RoleResponse)
 def create_new_role(role: RoleCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
     # Chỉ admin
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 class UserCreate(BaseModel):
     name: str
@@ -20,6 +20,11 @@ class UserResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Ids for POST /users/lookup
+class UserLookup(BaseModel):
+    ids: List[int] = Field(..., max_length=1000)
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -38,6 +38,15 @@ def test_get_user(client, db_session, test_user):
     assert data["id"] == test_user.id
     assert data["email"] == "test@example.com"
 
+def test_lookup_users(client, db_session, test_user):
+    other = create_user(db_session, UserCreate(name="Other", email="other@example.com", password="otherpass", role="member"))
+    login = client.post("/token", data={"username": "test@example.com", "password": "testpass"})
+    token = login.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post("/users/lookup", json={"ids": [other.id, 999, test_user.id, other.id]}, headers=headers)
+    assert response.status_code == 200
+    assert [user["id"] for user in response.json()] == [test_user.id, other.id]
+
 def test_update_user(client, db_session, test_user):
     login = client.post("/token", data={"username": "test@example.com", "password": "testpass"})
     token = login.json()["access_token"]
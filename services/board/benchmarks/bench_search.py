@@ -0,0 +1,102 @@
+"""Search latency on a large SQLite board database.
+
+before: what clients do today, a LIKE scan of every title and description.
+after:  GET /search/tasks's path, the task_search_terms inverted index from
+        src/search.py (document frequencies, then one ranked page).
+
+Titles and descriptions are drawn from a Zipf-like vocabulary, so queries hit
+rare, medium and common terms. The database is built once and reused.
+
+Usage (from services/board):
+    python -m benchmarks.bench_search --tasks 1000000 --db /tmp/board_search.db
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, insert, or_
+from sqlalchemy.orm import Session
+
+from src.database import Base
+from src.models import Board, List, Task, TaskSearchTerm, BoardTaskStat
+from src.search import task_terms, query_terms, document_frequencies, projects_with_term, search_tasks
+
+VOCABULARY = [f"word{i}" for i in range(20000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+def build(engine, tasks: int, projects: int, batch: int = 20000):
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    with Session(engine) as db:
+        db.execute(insert(Board), [{"id": i + 1, "project_id": i + 1, "name": f"Board {i}"} for i in range(projects)])
+        db.execute(insert(List), [{"id": i + 1, "board_id": i + 1, "name": "List"} for i in range(projects)])
+        for start in range(0, tasks, batch):
+            rows, postings = [], []
+            for task_id in range(start + 1, min(start + batch, tasks) + 1):
+                project_id = rng.randint(1, projects)
+                title = " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=4))
+                description = " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=12))
+                rows.append({"id": task_id, "list_id": project_id, "title": title, "description": description,
+                             "status": "todo", "position": float(task_id)})
+                postings += [{"term": term, "project_id": project_id, "task_id": task_id, "weight": weight}
+                             for term, weight in task_terms(title, description).items()]
+            db.execute(insert(Task), rows)
+            db.execute(insert(TaskSearchTerm), postings)
+            db.commit()
+            print(f"  built {min(start + batch, tasks)} tasks", end="\r", flush=True)
+        db.execute(insert(BoardTaskStat), [{"board_id": 1, "dimension": "status", "value": "todo", "task_count": tasks}])
+        db.commit()
+    print()
+
+def timed(fn, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--db", default="/tmp/board_search.db")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    if not os.path.exists(args.db) or os.path.getsize(args.db) == 0:
+        print(f"building {args.tasks} tasks in {args.db}")
+        build(engine, args.tasks, args.projects)
+
+    rng = random.Random(7)
+    # Two-term queries mixing a common term with a medium or rare one
+    queries = [f"{rng.choice(VOCABULARY[:50])} {rng.choice(VOCABULARY[50:5000])}" for _ in range(args.queries)]
+
+    with Session(engine) as db:
+        def before(query):
+            # Every match is needed before anything can be ranked
+            filters = [or_(Task.title.like(f"%{term}%"), Task.description.like(f"%{term}%")) for term in query.split()]
+            return db.query(Task.id, Task.title, Task.description).filter(*filters).all()
+
+        def after(query):
+            terms = query_terms(query)
+            frequencies = document_frequencies(db, terms)
+            rarest = min(terms, key=frequencies.get)
+            allowed = projects_with_term(db, rarest)
+            return search_tasks(db, terms, frequencies, allowed, args.limit)
+
+        before_p50, before_p95 = timed(before, queries[:10])
+        after_p50, after_p95 = timed(after, queries)
+
+    print(f"{args.tasks} tasks, {args.projects} projects")
+    print(f"before (LIKE scan, all matches): p50 {before_p50:8.1f} ms  p95 {before_p95:8.1f} ms")
+    print(f"after  (inverted index, TF-IDF): p50 {after_p50:8.1f} ms  p95 {after_p95:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare the old and new way board_service calls project_service.
+
+before: module-level requests.get on a 40-thread pool (uvicorn's default
+        threadpool size), new TCP connection per call, no timeout.
+after:  the shared UpstreamClients pool from src/http_client.py, awaited
+        on the event loop over keep-alive connections.
+
+A local uvicorn stub stands in for project_service and answers
+/projects/{id}/members/{user_id} after a simulated delay.
+
+Usage (from services/board):
+    python -m benchmarks.bench_upstream_http --requests 2000 --latency-ms 5
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import uvicorn
+
+from src.http_client import UpstreamClients
+
+def make_stub(latency: float):
+    body = json.dumps({"id": 1, "project_id": 1, "user_id": 1, "role": "member"}).encode()
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        await asyncio.sleep(latency)
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+def run_stub(port: int, latency: float):
+    uvicorn.run(make_stub(latency), host="127.0.0.1", port=port, log_level="error", backlog=4096)
+
+def start_stub(latency: float):
+    # Separate process so the stub does not share the GIL with the client being measured
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    process = multiprocessing.Process(target=run_stub, args=(port, latency), daemon=True)
+    process.start()
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(500):
+        try:
+            requests.get(f"{base_url}/ready", timeout=1)
+            break
+        except requests.ConnectionError:
+            time.sleep(0.01)
+    return process, base_url
+
+def bench_before(base_url: str, n: int, threads: int):
+    def call(i):
+        response = requests.get(f"{base_url}/projects/1/members/{i}")
+        return response.status_code
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        codes = list(pool.map(call, range(n)))
+    elapsed = time.perf_counter() - start
+    assert all(code == 200 for code in codes)
+    return elapsed
+
+async def bench_after(base_url: str, n: int, concurrency: int):
+    clients = UpstreamClients(max_connections=concurrency, pool_timeout=60)
+    # Warm the pool like a long-lived app would be
+    await asyncio.gather(*(clients.request(base_url, "GET", "/projects/1/members/0") for _ in range(concurrency)))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(clients.request(base_url, "GET", f"/projects/1/members/{i}") for i in range(n)))
+    elapsed = time.perf_counter() - start
+    await clients.aclose()
+    assert all(status_code == 200 for status_code, _ in results)
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    process, base_url = start_stub(args.latency_ms / 1000)
+    try:
+        before = bench_before(base_url, args.requests, args.threads)
+        after = asyncio.run(bench_after(base_url, args.requests, args.concurrency))
+    finally:
+        process.terminate()
+
+    print(f"upstream latency {args.latency_ms} ms, {args.requests} requests")
+    print(f"before (requests.get, {args.threads} threads): {args.requests / before:8.0f} req/s")
+    print(f"after  (pooled aiohttp, {args.concurrency} conns): {args.requests / after:8.0f} req/s")
+    print(f"speedup: {before / after:.1f}x")
+
+if __name__ == "__main__":
+    main()
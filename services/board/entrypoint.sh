@@ -16,10 +16,36 @@ if [ -z "$(ls -A migrations/versions)" ]; then
     alembic revision --autogenerate -m "Initial board schema"
 fi
 
+# Move databases from a revision autogenerated on boot onto the committed history (see src/adopt_migrations.py)
+echo "[DOING] - Checking migration history..."
+python -m src.adopt_migrations || { echo "Migration failed"; exit 1; }
+
 # Apply migrations
 echo "[DOING] - Applying migrations..."
 alembic upgrade head || { echo "Migration failed"; exit 1; }
 
+# Start the event broker that relays board change events between the workers
+echo "[DOING] - Starting event broker..."
+export EVENT_BROKER_URL="${EVENT_BROKER_URL:-tcp://127.0.0.1:7001}"
+if [[ "$EVENT_BROKER_URL" == tcp://127.0.0.1:* ]]; then
+    python -m src.broker --host 127.0.0.1 --port "${EVENT_BROKER_URL##*:}" &
+fi
+
+# Due-date reminder scheduler (see src/reminders.py); its events reach the workers through the broker
+echo "[DOING] - Starting reminder scheduler..."
+python -m src.reminders &
+
+# Periodic maintenance jobs (see src/jobs.py)
+echo "[DOING] - Scheduling maintenance jobs..."
+(
+    while sleep "${MAINTENANCE_INTERVAL:-3600}"; do
+        python -m src.jobs compact-changes || echo "[WARN] - compact-changes failed"
+        python -m src.jobs purge-deleted || echo "[WARN] - purge-deleted failed"
+        python -m src.jobs compact-activity || echo "[WARN] - compact-activity failed"
+        python -m src.jobs archive-tasks || echo "[WARN] - archive-tasks failed"
+    done
+) &
+
 # Start application
 echo "[DOING] - Starting application..."
 exec uvicorn src.main:app --host 0.0.0.0 --port 8000 --workers 4
\ No newline at end of file
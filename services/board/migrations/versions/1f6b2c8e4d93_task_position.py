@@ -0,0 +1,36 @@
+"""Task position
+
+Revision ID: 1f6b2c8e4d93
+Revises: 3a7c1e52d9b0
+Create Date: 2026-10-18 09:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f6b2c8e4d93'
+down_revision: Union[str, Sequence[str], None] = '3a7c1e52d9b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases autogenerated on boot after Task.position was added already have it
+    inspector = sa.inspect(op.get_bind())
+    if 'position' in {column['name'] for column in inspector.get_columns('tasks')}:
+        return
+    op.add_column('tasks', sa.Column('position', sa.Double(), server_default='0', nullable=False))
+    op.execute('UPDATE tasks SET position = id * 1024')  # Keep the old insertion order
+    op.create_index('ix_tasks_list_id_position', 'tasks', ['list_id', 'position'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_list_id_position', table_name='tasks')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('position')
@@ -0,0 +1,92 @@
+"""Initial board schema
+
+Revision ID: 3a7c1e52d9b0
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7c1e52d9b0'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by the old autogenerate-on-first-boot entrypoint already have
+    # these tables; only create what is missing so they can move onto this history.
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('boards'):
+        op.create_table('boards',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_boards_id'), 'boards', ['id'], unique=False)
+    if not inspector.has_table('lists'):
+        op.create_table('lists',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('board_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['board_id'], ['boards.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_lists_id'), 'lists', ['id'], unique=False)
+    if not inspector.has_table('tasks'):
+        op.create_table('tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('list_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('assignee_id', sa.Integer(), nullable=True),
+        sa.Column('priority', sa.String(length=50), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('due_date', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['list_id'], ['lists.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_tasks_id'), 'tasks', ['id'], unique=False)
+    if not inspector.has_table('task_attachments'):
+        op.create_table('task_attachments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('file_url', sa.String(length=512), nullable=False),
+        sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_task_attachments_id'), 'task_attachments', ['id'], unique=False)
+    if not inspector.has_table('task_labels'):
+        op.create_table('task_labels',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('label', sa.String(length=100), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_task_labels_id'), 'task_labels', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_labels_id'), table_name='task_labels')
+    op.drop_table('task_labels')
+    op.drop_index(op.f('ix_task_attachments_id'), table_name='task_attachments')
+    op.drop_table('task_attachments')
+    op.drop_index(op.f('ix_tasks_id'), table_name='tasks')
+    op.drop_table('tasks')
+    op.drop_index(op.f('ix_lists_id'), table_name='lists')
+    op.drop_table('lists')
+    op.drop_index(op.f('ix_boards_id'), table_name='boards')
+    op.drop_table('boards')
@@ -0,0 +1,46 @@
+"""Board change log
+
+Revision ID: 4f8a2c7e1b95
+Revises: e9b3d6a1c8f4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8a2c7e1b95'
+down_revision: Union[str, Sequence[str], None] = 'e9b3d6a1c8f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('boards', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('boards', sa.Column('changes_horizon', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('board_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('board_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['board_id'], ['boards.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_board_changes_board_id_version', 'board_changes', ['board_id', 'version'], unique=False)
+    op.create_index('ix_board_changes_board_id_entity', 'board_changes', ['board_id', 'entity', 'entity_id', 'version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_board_changes_board_id_entity', table_name='board_changes')
+    op.drop_index('ix_board_changes_board_id_version', table_name='board_changes')
+    op.drop_table('board_changes')
+    op.drop_column('boards', 'changes_horizon')
+    op.drop_column('boards', 'version')
@@ -0,0 +1,34 @@
+"""Task filter indexes
+
+Revision ID: 8d41f0b6c2a7
+Revises: 1f6b2c8e4d93
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f0b6c2a7'
+down_revision: Union[str, Sequence[str], None] = '1f6b2c8e4d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_list_id_status_position', 'tasks', ['list_id', 'status', 'position'], unique=False)
+    op.create_index('ix_tasks_list_id_priority_position', 'tasks', ['list_id', 'priority', 'position'], unique=False)
+    op.create_index('ix_tasks_list_id_assignee_id_position', 'tasks', ['list_id', 'assignee_id', 'position'], unique=False)
+    op.create_index('ix_tasks_list_id_due_date', 'tasks', ['list_id', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_list_id_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_list_id_assignee_id_position', table_name='tasks')
+    op.drop_index('ix_tasks_list_id_priority_position', table_name='tasks')
+    op.drop_index('ix_tasks_list_id_status_position', table_name='tasks')
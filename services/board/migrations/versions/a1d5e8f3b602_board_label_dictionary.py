@@ -0,0 +1,66 @@
+"""Board label dictionary
+
+Revision ID: a1d5e8f3b602
+Revises: 4f8a2c7e1b95
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d5e8f3b602'
+down_revision: Union[str, Sequence[str], None] = '4f8a2c7e1b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('board_labels',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('board_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['board_id'], ['boards.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('board_id', 'name', name='uq_board_labels_board_id_name')
+    )
+    op.create_index(op.f('ix_board_labels_id'), 'board_labels', ['id'], unique=False)
+    with op.batch_alter_table('task_labels') as batch_op:
+        batch_op.add_column(sa.Column('label_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_task_labels_label_id', 'board_labels', ['label_id'], ['id'])
+    # One dictionary entry per distinct label already used on a board
+    op.execute(
+        "INSERT INTO board_labels (board_id, name) "
+        "SELECT lists.board_id, task_labels.label FROM task_labels "
+        "JOIN tasks ON tasks.id = task_labels.task_id JOIN lists ON lists.id = tasks.list_id "
+        "GROUP BY lists.board_id, task_labels.label"
+    )
+    op.execute(
+        "UPDATE task_labels SET label_id = ("
+        "SELECT board_labels.id FROM board_labels "
+        "JOIN lists ON lists.board_id = board_labels.board_id JOIN tasks ON tasks.list_id = lists.id "
+        "WHERE tasks.id = task_labels.task_id AND board_labels.name = task_labels.label)"
+    )
+    # add_label used to allow duplicates; keep the oldest row of each
+    op.execute(
+        "DELETE FROM task_labels WHERE label_id IS NOT NULL AND id NOT IN ("
+        "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM task_labels GROUP BY task_id, label_id) AS keep)"
+    )
+    with op.batch_alter_table('task_labels') as batch_op:
+        batch_op.create_unique_constraint('uq_task_labels_task_id_label_id', ['task_id', 'label_id'])
+    op.create_index('ix_task_labels_label_id_task_id', 'task_labels', ['label_id', 'task_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_labels_label_id_task_id', table_name='task_labels')
+    with op.batch_alter_table('task_labels') as batch_op:
+        batch_op.drop_constraint('uq_task_labels_task_id_label_id', type_='unique')
+        batch_op.drop_constraint('fk_task_labels_label_id', type_='foreignkey')
+        batch_op.drop_column('label_id')
+    op.drop_index(op.f('ix_board_labels_id'), table_name='board_labels')
+    op.drop_table('board_labels')
@@ -0,0 +1,28 @@
+"""Assignee status index
+
+Revision ID: a9e2d7c4f150
+Revises: f3c8a1d6e2b7
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e2d7c4f150'
+down_revision: Union[str, Sequence[str], None] = 'f3c8a1d6e2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_assignee_id_status_due_date', 'tasks', ['assignee_id', 'status', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assignee_id_status_due_date', table_name='tasks')
@@ -0,0 +1,37 @@
+"""Stored task attachments
+
+Revision ID: b7e4c1f9a2d3
+Revises: a1d5e8f3b602
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4c1f9a2d3'
+down_revision: Union[str, Sequence[str], None] = 'a1d5e8f3b602'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('task_attachments', sa.Column('filename', sa.String(length=255), nullable=True))
+    op.add_column('task_attachments', sa.Column('size', sa.BigInteger(), nullable=True))
+    op.add_column('task_attachments', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.add_column('task_attachments', sa.Column('content_type', sa.String(length=255), nullable=True))
+    op.create_index(op.f('ix_task_attachments_sha256'), 'task_attachments', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_attachments_sha256'), table_name='task_attachments')
+    with op.batch_alter_table('task_attachments') as batch_op:
+        batch_op.drop_column('content_type')
+        batch_op.drop_column('sha256')
+        batch_op.drop_column('size')
+        batch_op.drop_column('filename')
@@ -0,0 +1,30 @@
+"""Board templates
+
+Revision ID: b8f3d5e1a274
+Revises: e6d1f8a3b527
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f3d5e1a274'
+down_revision: Union[str, Sequence[str], None] = 'e6d1f8a3b527'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('boards', sa.Column('is_template', sa.Boolean(), server_default='0', nullable=False))
+    op.create_index('ix_boards_project_id_is_template', 'boards', ['project_id', 'is_template'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_boards_project_id_is_template', table_name='boards')
+    op.drop_column('boards', 'is_template')
@@ -0,0 +1,41 @@
+"""Task activity
+
+Revision ID: c4b7e2a9d318
+Revises: a9e2d7c4f150
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4b7e2a9d318'
+down_revision: Union[str, Sequence[str], None] = 'a9e2d7c4f150'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_activity',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('board_id', sa.Integer(), nullable=True),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=20), nullable=False),
+    sa.Column('changes', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_activity_task_id_id', 'task_activity', ['task_id', 'id'], unique=False)
+    op.create_index('ix_task_activity_created_at', 'task_activity', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_activity_created_at', table_name='task_activity')
+    op.drop_index('ix_task_activity_task_id_id', table_name='task_activity')
+    op.drop_table('task_activity')
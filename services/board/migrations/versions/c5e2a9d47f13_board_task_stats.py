@@ -0,0 +1,56 @@
+"""Board task stats
+
+Revision ID: c5e2a9d47f13
+Revises: 8d41f0b6c2a7
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a9d47f13'
+down_revision: Union[str, Sequence[str], None] = '8d41f0b6c2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('board_task_stats',
+    sa.Column('board_id', sa.Integer(), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=50), nullable=False),
+    sa.Column('task_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['board_id'], ['boards.id'], ),
+    sa.PrimaryKeyConstraint('board_id', 'dimension', 'value')
+    )
+    # Overdue counts read (list_id, due_date, status) from the index alone
+    op.create_index('ix_tasks_list_id_due_date_status', 'tasks', ['list_id', 'due_date', 'status'], unique=False)
+    op.drop_index('ix_tasks_list_id_due_date', table_name='tasks')
+    # Seed the counters from the existing tasks
+    op.execute(
+        "INSERT INTO board_task_stats (board_id, dimension, value, task_count) "
+        "SELECT lists.board_id, 'status', COALESCE(tasks.status, ''), COUNT(*) FROM tasks JOIN lists ON lists.id = tasks.list_id "
+        "GROUP BY lists.board_id, COALESCE(tasks.status, '')"
+    )
+    op.execute(
+        "INSERT INTO board_task_stats (board_id, dimension, value, task_count) "
+        "SELECT lists.board_id, 'priority', COALESCE(tasks.priority, ''), COUNT(*) FROM tasks JOIN lists ON lists.id = tasks.list_id "
+        "GROUP BY lists.board_id, COALESCE(tasks.priority, '')"
+    )
+    op.execute(
+        "INSERT INTO board_task_stats (board_id, dimension, value, task_count) "
+        "SELECT lists.board_id, 'assignee_id', COALESCE(CAST(tasks.assignee_id AS CHAR), ''), COUNT(*) FROM tasks JOIN lists ON lists.id = tasks.list_id "
+        "GROUP BY lists.board_id, COALESCE(CAST(tasks.assignee_id AS CHAR), '')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_tasks_list_id_due_date', 'tasks', ['list_id', 'due_date'], unique=False)
+    op.drop_index('ix_tasks_list_id_due_date_status', table_name='tasks')
+    op.drop_table('board_task_stats')
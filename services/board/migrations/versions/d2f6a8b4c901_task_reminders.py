@@ -0,0 +1,38 @@
+"""Task reminders
+
+Revision ID: d2f6a8b4c901
+Revises: b7e4c1f9a2d3
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6a8b4c901'
+down_revision: Union[str, Sequence[str], None] = 'b7e4c1f9a2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_reminders',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('task_id', 'kind', 'due_date')
+    )
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'], unique=False)
+    op.create_index('ix_tasks_assignee_id_due_date', 'tasks', ['assignee_id', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assignee_id_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
+    op.drop_table('task_reminders')
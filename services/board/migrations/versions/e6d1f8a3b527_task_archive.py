@@ -0,0 +1,79 @@
+"""Task archive
+
+Revision ID: e6d1f8a3b527
+Revises: c4b7e2a9d318
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6d1f8a3b527'
+down_revision: Union[str, Sequence[str], None] = 'c4b7e2a9d318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    # Done tasks get the time of their last logged change, or their creation when the log has none
+    op.execute(
+        "UPDATE tasks SET completed_at = COALESCE("
+        "(SELECT MAX(board_changes.created_at) FROM board_changes"
+        " WHERE board_changes.entity = 'task' AND board_changes.entity_id = tasks.id), tasks.created_at)"
+        " WHERE tasks.status = 'done'"
+    )
+    op.create_index('ix_tasks_status_completed_at', 'tasks', ['status', 'completed_at'], unique=False)
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('list_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('assignee_id', sa.Integer(), nullable=True),
+    sa.Column('priority', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('position', sa.Double(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tasks_archive_list_id_position', 'tasks_archive', ['list_id', 'position'], unique=False)
+    op.create_table('task_labels_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('label', sa.String(length=100), nullable=False),
+    sa.Column('label_id', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_labels_archive_task_id'), 'task_labels_archive', ['task_id'], unique=False)
+    op.create_table('task_attachments_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('file_url', sa.String(length=512), nullable=False),
+    sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=True),
+    sa.Column('sha256', sa.String(length=64), nullable=True),
+    sa.Column('content_type', sa.String(length=255), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_attachments_archive_task_id'), 'task_attachments_archive', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_attachments_archive_task_id'), table_name='task_attachments_archive')
+    op.drop_table('task_attachments_archive')
+    op.drop_index(op.f('ix_task_labels_archive_task_id'), table_name='task_labels_archive')
+    op.drop_table('task_labels_archive')
+    op.drop_index('ix_tasks_archive_list_id_position', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
+    op.drop_index('ix_tasks_status_completed_at', table_name='tasks')
+    op.drop_column('tasks', 'completed_at')
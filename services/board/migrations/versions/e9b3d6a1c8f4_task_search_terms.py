@@ -0,0 +1,39 @@
+"""Task search terms
+
+Revision ID: e9b3d6a1c8f4
+Revises: c5e2a9d47f13
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b3d6a1c8f4'
+down_revision: Union[str, Sequence[str], None] = 'c5e2a9d47f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fill it afterwards with: python -m src.jobs reindex-search
+    op.create_table('task_search_terms',
+    sa.Column('term', sa.String(length=50).with_variant(mysql.VARCHAR(length=50, collation='utf8mb4_bin'), 'mysql', 'mariadb'), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('term', 'project_id', 'task_id')
+    )
+    op.create_index('ix_task_search_terms_task_id', 'task_search_terms', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_search_terms_task_id', table_name='task_search_terms')
+    op.drop_table('task_search_terms')
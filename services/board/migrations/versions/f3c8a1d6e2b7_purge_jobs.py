@@ -0,0 +1,46 @@
+"""Board and list tombstones, purge jobs
+
+Revision ID: f3c8a1d6e2b7
+Revises: d2f6a8b4c901
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a1d6e2b7'
+down_revision: Union[str, Sequence[str], None] = 'd2f6a8b4c901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('boards', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('lists', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_table('purge_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=10), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('rows_deleted', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_purge_jobs_id'), 'purge_jobs', ['id'], unique=False)
+    op.create_index('ix_purge_jobs_status', 'purge_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_purge_jobs_status', table_name='purge_jobs')
+    op.drop_index(op.f('ix_purge_jobs_id'), table_name='purge_jobs')
+    op.drop_table('purge_jobs')
+    op.drop_column('lists', 'deleted_at')
+    op.drop_column('boards', 'deleted_at')
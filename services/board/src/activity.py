@@ -0,0 +1,210 @@
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, select, insert, delete
+from sqlalchemy.orm import Session
+from .models import TaskActivity
+
+# Task activity (who created, moved, reassigned, edited or deleted a task) is written
+# behind the request: crud functions queue entries on the session with queue_activity(),
+# and once the transaction commits they go to an in-process ActivityRecorder whose
+# background thread inserts them in batches. A task write never waits for its history row.
+ACTIVITY_BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))  # Rows per INSERT
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "1"))  # Seconds a row may wait for its batch
+ACTIVITY_QUEUE_SIZE = int(os.getenv("ACTIVITY_QUEUE_SIZE", "10000"))  # Rows waiting to be written, per process
+ACTIVITY_ENQUEUE_TIMEOUT = float(os.getenv("ACTIVITY_ENQUEUE_TIMEOUT", "0.05"))  # Seconds a writer waits on a full queue before dropping
+ACTIVITY_RETENTION_DAYS = float(os.getenv("ACTIVITY_RETENTION_DAYS", "180"))
+
+# Task columns whose changes are recorded (descriptions are left out, they can be long)
+ACTIVITY_FIELDS = ("title", "list_id", "position", "status", "priority", "assignee_id", "due_date")
+
+def activity_snapshot(task):
+    if task is None:
+        return None
+    return {field: getattr(task, field) for field in ACTIVITY_FIELDS}
+
+# Name of a batch change from the fields it wrote
+def activity_action(fields: dict):
+    if {"list_id", "position"} & fields.keys():
+        return "moved"
+    if fields.keys() == {"assignee_id"}:
+        return "assigned"
+    return "updated"
+
+# Queue an activity entry; written after the commit, dropped on rollback.
+# Updates that change no recorded field leave no entry.
+def queue_activity(db: Session, task_id: int, board_id: int, action: str, before: dict, after: dict):
+    if before is not None and after is not None:
+        changes = {field: [before[field], after[field]] for field in ACTIVITY_FIELDS if before[field] != after[field]}
+        if not changes:
+            return
+    else:
+        changes = {field: value for field, value in (after or before).items() if value is not None}
+    db.info.setdefault("pending_activity", []).append(
+        {"task_id": task_id, "board_id": board_id, "action": action, "changes": jsonable_encoder(changes)}
+    )
+
+@event.listens_for(Session, "after_commit")
+def _record_pending(session):
+    rows = session.info.pop("pending_activity", None)
+    if rows:
+        actor_id, now = session.info.get("actor_id"), datetime.utcnow()
+        for row in rows:
+            row["actor_id"], row["created_at"] = actor_id, now
+        activity_recorder.submit(session.get_bind(), rows)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_pending(session, previous_transaction):
+    session.info.pop("pending_activity", None)
+
+class ActivityRecorder:
+    """Write-behind buffer for task activity rows.
+
+    Rows wait in a bounded queue and a daemon thread inserts them ACTIVITY_BATCH_SIZE
+    at a time, or whatever arrived within ACTIVITY_FLUSH_INTERVAL. When the database
+    falls behind and the queue fills up, submitters wait up to ACTIVITY_ENQUEUE_TIMEOUT
+    for room (counted as `blocked`) and then drop the row (counted as `dropped`): the
+    history is best effort, task writes are not. Rows still queued when the process is
+    killed are lost; stop() writes them out on a clean shutdown.
+    """
+
+    def __init__(self, batch_size: int = ACTIVITY_BATCH_SIZE, flush_interval: float = ACTIVITY_FLUSH_INTERVAL,
+                 max_queue: int = ACTIVITY_QUEUE_SIZE, enqueue_timeout: float = ACTIVITY_ENQUEUE_TIMEOUT):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.background = True  # False: nothing is written until drain() (tests)
+        self._queue = queue.Queue(maxsize=max_queue)  # (bind, row)
+        self._thread = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.blocked = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    def submit(self, bind, rows):
+        self._ensure_thread()
+        enqueued = blocked = dropped = 0
+        for row in rows:
+            try:
+                self._queue.put_nowait((bind, row))
+            except queue.Full:
+                blocked += 1
+                try:
+                    self._queue.put((bind, row), timeout=self.enqueue_timeout)
+                except queue.Full:
+                    dropped += 1
+                    continue
+            enqueued += 1
+        with self._lock:
+            self.enqueued += enqueued
+            self.blocked += blocked
+            self.dropped += dropped
+
+    def _ensure_thread(self):
+        if not self.background or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    # Block for the first row, then take more until the batch is full or the interval ends
+    def _collect(self):
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        by_bind = {}
+        for bind, row in batch:
+            by_bind.setdefault(bind, []).append(row)
+        for bind, rows in by_bind.items():
+            try:
+                with Session(bind=bind) as db:
+                    db.execute(insert(TaskActivity.__table__), rows)
+                    db.commit()
+            except Exception as exc:
+                with self._lock:
+                    self.failed += len(rows)
+                print(f"[WARN] - activity: {len(rows)} row(s) not written: {exc!r}", flush=True)
+                continue
+            with self._lock:
+                self.written += len(rows)
+                self.batches += 1
+
+    # Write everything queued so far on the calling thread
+    def drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    # Stop the writer thread and flush what is left
+    def stop(self, timeout: float = 5):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.drain()
+
+    def clear(self):
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "blocked": self.blocked,
+                "dropped": self.dropped,
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
+
+activity_recorder = ActivityRecorder()
+
+# Delete activity older than `before`, `chunk` rows per transaction; returns the number deleted
+def compact_task_activity(db: Session, before: datetime, chunk: int = 5000):
+    deleted = 0
+    while ids := db.scalars(select(TaskActivity.id).where(TaskActivity.created_at < before).order_by(TaskActivity.id).limit(chunk)).all():
+        deleted += db.execute(delete(TaskActivity).where(TaskActivity.id.in_(ids))).rowcount
+        db.commit()
+    return deleted
@@ -0,0 +1,54 @@
+import os
+from datetime import datetime
+from sqlalchemy import select, insert, literal, and_
+from sqlalchemy.orm import Session
+from .models import List, Task, TaskLabel, TaskAttachment, TaskArchive, TaskLabelArchive, TaskAttachmentArchive
+from .stats import DONE_STATUSES, stat_snapshot, record_task_changes
+from .events import emit
+from .purge import delete_task_rows
+from .crud import list_board_ids
+
+# Tasks done for longer than TASK_ARCHIVE_AGE_DAYS move to tasks_archive (labels and
+# attachments to their own archive tables), ARCHIVE_BATCH_SIZE tasks per transaction, with
+# INSERT ... SELECT then DELETE so the rows never pass through Python. The hot tables, their
+# indexes, the board counters and the search index then only hold live work; read endpoints
+# add the archive back with include_archived. Boards see archived tasks leave as deletions.
+TASK_ARCHIVE_AGE_DAYS = float(os.getenv("TASK_ARCHIVE_AGE_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+
+def _copy_to_archive(db: Session, model, archive, condition, now: datetime):
+    columns = [column.name for column in model.__table__.c]
+    source = [model.__table__.c[name] for name in columns]
+    if archive is TaskArchive:
+        columns.append("archived_at")
+        source.append(literal(now, TaskArchive.archived_at.type))
+    db.execute(insert(archive).from_select(columns, select(*source).where(condition)))
+
+# Archive one batch of the tasks completed before `completed_before`; returns how many moved
+def archive_task_batch(db: Session, completed_before: datetime, batch_size: int = ARCHIVE_BATCH_SIZE):
+    rows = db.execute(
+        select(Task.id, Task.list_id, Task.status, Task.priority, Task.assignee_id)
+        .join(List, and_(List.id == Task.list_id, List.deleted_at.is_(None)))  # Deleted lists are purged instead
+        .where(Task.status.in_(DONE_STATUSES), Task.completed_at < completed_before)
+        .order_by(Task.completed_at, Task.id).limit(batch_size)
+    ).all()
+    if not rows:
+        return 0
+    task_ids = [row.id for row in rows]
+    now = datetime.utcnow()
+    _copy_to_archive(db, Task, TaskArchive, Task.id.in_(task_ids), now)
+    _copy_to_archive(db, TaskLabel, TaskLabelArchive, TaskLabel.task_id.in_(task_ids), now)
+    _copy_to_archive(db, TaskAttachment, TaskAttachmentArchive, TaskAttachment.task_id.in_(task_ids), now)
+    boards = list_board_ids(db, {row.list_id for row in rows})
+    record_task_changes(db, [(stat_snapshot(row), None) for row in rows], boards)
+    delete_task_rows(db, task_ids)
+    for row in rows:
+        emit(db, boards.get(row.list_id), "task.archived", {"id": row.id, "list_id": row.list_id})
+    db.commit()
+    return len(rows)
+
+def archive_done_tasks(db: Session, completed_before: datetime, batch_size: int = ARCHIVE_BATCH_SIZE):
+    archived = 0
+    while moved := archive_task_batch(db, completed_before, batch_size):
+        archived += moved
+    return archived
@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import os
+
+# Local stand-in for a message broker: every line a client sends is relayed to every
+# connected client. board_service workers each keep one connection, so an event
+# published by one worker reaches the subscribers of all of them.
+#   python -m src.broker --host 127.0.0.1 --port 7001
+BROKER_CLIENT_BUFFER = int(os.getenv("BROKER_CLIENT_BUFFER", "10000"))  # Lines queued per client before it is dropped
+BROKER_MAX_LINE = 16 * 1024 * 1024  # One event per line; task descriptions can be long
+
+class Broker:
+    def __init__(self, buffer: int = BROKER_CLIENT_BUFFER):
+        self.buffer = buffer
+        self.clients = {}  # queue -> writer
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        queue = asyncio.Queue(maxsize=self.buffer)
+        self.clients[queue] = writer
+        sender = asyncio.create_task(self._send(queue, writer))
+        try:
+            while line := await reader.readline():
+                for client, client_writer in list(self.clients.items()):
+                    try:
+                        client.put_nowait(line)
+                    except asyncio.QueueFull:
+                        # A stuck worker must not stall the others; dropping it makes it reconnect
+                        self.clients.pop(client, None)
+                        client_writer.close()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.clients.pop(queue, None)
+            sender.cancel()
+            writer.close()
+
+    async def _send(self, queue: asyncio.Queue, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+        except ConnectionError:
+            writer.close()
+
+async def serve(host: str, port: int):
+    broker = Broker()
+    server = await asyncio.start_server(broker.handle, host, port, limit=BROKER_MAX_LINE)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.broker")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7001)
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import update, insert, delete, func
+from sqlalchemy.orm import Session, aliased
+from .models import Board, List, Task, TaskLabel, TaskAttachment, BoardChange
+
+# Every committed batch of board events bumps the board's version once and appends one
+# board_changes row per changed entity. Clients holding version N ask for the entities
+# changed after N (crud.get_board_changes); deleted entities come back as tombstones. compact_board_changes keeps
+# only the latest row per entity and drops rows older than the retention window, moving
+# the board's changes_horizon up; clients behind the horizon get a full snapshot.
+CHANGE_ENTITIES = {"list": List, "task": Task, "label": TaskLabel, "attachment": TaskAttachment}
+
+# (entity, op) written for each event type
+EVENT_CHANGES = {
+    "list.created": ("list", "upsert"),
+    "list.updated": ("list", "upsert"),
+    "list.deleted": ("list", "delete"),
+    "task.created": ("task", "upsert"),
+    "task.updated": ("task", "upsert"),
+    "task.moved": ("task", "upsert"),
+    "task.deleted": ("task", "delete"),
+    "task.archived": ("task", "delete"),
+    "label.added": ("label", "upsert"),
+    "attachment.added": ("attachment", "upsert"),
+}
+
+# Notifications (e.g. task.due_soon) change no entity: they are published but not versioned
+def _event_changes(event):
+    if event["type"] == "tasks.repositioned":
+        return [("task", int(task_id), "upsert") for task_id in event["data"]["positions"]]
+    if event["type"] not in EVENT_CHANGES:
+        return []
+    entity, op = EVENT_CHANGES[event["type"]]
+    return [(entity, event["data"]["id"], op)]
+
+# Called before commit with the session's pending events; stamps each with its board version
+def record_changes(db: Session, events):
+    by_board = defaultdict(list)
+    for event in events:
+        by_board[event["board_id"]].append(event)
+    now = datetime.utcnow()
+    rows = []
+    for board_id in sorted(by_board):
+        changes = [(event, _event_changes(event)) for event in by_board[board_id]]
+        if not any(entity_changes for _, entity_changes in changes):
+            continue
+        db.execute(update(Board).where(Board.id == board_id).values(version=Board.version + 1))
+        version = db.query(Board.version).filter(Board.id == board_id).scalar()
+        if version is None:
+            continue  # Board is gone
+        latest = {}
+        for event, entity_changes in changes:
+            if entity_changes:
+                event["version"] = version
+            for entity, entity_id, op in entity_changes:
+                latest[(entity, entity_id)] = op
+        rows += [
+            {"board_id": board_id, "version": version, "entity": entity, "entity_id": entity_id, "op": op, "created_at": now}
+            for (entity, entity_id), op in latest.items()
+        ]
+    if rows:
+        db.execute(insert(BoardChange), rows)
+
+# Compact one board's log: keep only the newest row per entity, then drop rows written
+# before `cutoff` and move the horizon past them. Returns the number of rows deleted.
+def compact_board_changes(db: Session, board_id: int, cutoff: datetime, chunk: int = 1000):
+    newer = aliased(BoardChange)
+    superseded = [
+        change_id for (change_id,) in
+        db.query(BoardChange.id)
+        .join(newer, (newer.board_id == BoardChange.board_id) & (newer.entity == BoardChange.entity)
+              & (newer.entity_id == BoardChange.entity_id) & (newer.version > BoardChange.version))
+        .filter(BoardChange.board_id == board_id)
+        .distinct()
+    ]
+    deleted = 0
+    for start in range(0, len(superseded), chunk):
+        deleted += db.execute(delete(BoardChange).where(BoardChange.id.in_(superseded[start:start + chunk]))).rowcount
+    horizon = (
+        db.query(func.max(BoardChange.version))
+        .filter(BoardChange.board_id == board_id, BoardChange.created_at < cutoff)
+        .scalar()
+    )
+    if horizon is not None:
+        deleted += db.execute(delete(BoardChange).where(BoardChange.board_id == board_id, BoardChange.version <= horizon)).rowcount
+        db.execute(update(Board).where(Board.id == board_id, Board.changes_horizon < horizon).values(changes_horizon=horizon))
+    db.commit()
+    return deleted
+
+def compact_all_board_changes(db: Session, cutoff: datetime):
+    board_ids = [board_id for (board_id,) in db.query(BoardChange.board_id).distinct().order_by(BoardChange.board_id)]
+    return sum(compact_board_changes(db, board_id, cutoff) for board_id in board_ids)
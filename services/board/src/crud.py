@@ -1,112 +1,856 @@
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import func, update, insert, or_, and_
 from sqlalchemy.orm import Session
-from .models import Board, List, Task, TaskLabel, TaskAttachment
-from .schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate, TaskAttachmentCreate, TaskMove
+from .models import (Board, List, Task, TaskLabel, TaskAttachment, BoardChange, BoardLabel, PurgeJob, TaskActivity,
+                     TaskArchive, TaskLabelArchive, TaskAttachmentArchive)
+from .schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate, TaskAttachmentCreate, TaskMove, TaskUpdate
+from .ordering import POSITION_STEP, position_between, is_exhausted, needs_rebalance, request_rebalance
+from .stats import DONE_STATUSES, stat_snapshot, record_task_changes, apply_stat_deltas, count_list_tasks
+from .purge import delete_task_rows
+from .search import reindex_tasks
+from .events import emit
+from .activity import ACTIVITY_FIELDS, activity_snapshot, activity_action, queue_activity
+from .changes import CHANGE_ENTITIES
+
+# Task fields that update_task (and batch updates) may change
+TASK_UPDATE_FIELDS = {"title", "description", "assignee_id", "priority", "status", "due_date", "list_id"}
+# Task fields whose change means the task has to be reindexed for search
+SEARCH_FIELDS = {"title", "description", "list_id"}
+
+# completed_at for a task entering `status`: set when it becomes done, cleared when reopened
+def _completed_at(status):
+    return datetime.utcnow() if status in DONE_STATUSES else None
 
 def create_board(db: Session, board: BoardCreate):
-    db_board = Board(project_id=board.project_id, name=board.name)
+    db_board = Board(project_id=board.project_id, name=board.name, is_template=board.is_template)
     db.add(db_board)
     db.commit()
     db.refresh(db_board)
     return db_board
 
 def get_board(db: Session, board_id: int):
-    return db.query(Board).filter(Board.id == board_id).first()
+    return db.query(Board).filter(Board.id == board_id, Board.deleted_at.is_(None)).first()
+
+def get_board_templates(db: Session, project_id: int):
+    return (
+        db.query(Board)
+        .filter(Board.project_id == project_id, Board.is_template.is_(True), Board.deleted_at.is_(None))
+        .order_by(Board.name, Board.id)
+        .all()
+    )
+
+# Join conditions that treat deleted lists and boards (tombstones awaiting purge) as missing
+def _live_list(list_id):
+    return and_(List.id == list_id, List.deleted_at.is_(None))
+
+def _live_board(board_id):
+    return and_(Board.id == board_id, Board.deleted_at.is_(None))
+
+# {list_id: board_id}. Lists never change board, so lookups are cached on the session.
+def list_board_ids(db: Session, list_ids):
+    cache = db.info.setdefault("list_boards", {})
+    missing = {list_id for list_id in list_ids if list_id not in cache}
+    if missing:
+        cache.update(db.query(List.id, List.board_id).filter(List.id.in_(missing)))
+    return {list_id: cache[list_id] for list_id in list_ids if list_id in cache}
+
+def _remember_list_board(db: Session, list_id: int, board_id: int):
+    if list_id is not None and board_id is not None:
+        db.info.setdefault("list_boards", {})[list_id] = board_id
+
+# Resolve task -> list -> board in one statement: (task, list_id, board_id, project_id) or None.
+# list_id/board_id/project_id are None when the parent row is missing. include_archived:
+# fall back to tasks_archive (as a TaskArchive row).
+def get_task_ancestry(db: Session, task_id: int, include_archived: bool = False):
+    for task in (Task, TaskArchive) if include_archived else (Task,):
+        row = (
+            db.query(task, List.id, Board.id, Board.project_id)
+            .outerjoin(List, _live_list(task.list_id))
+            .outerjoin(Board, _live_board(List.board_id))
+            .filter(task.id == task_id)
+            .first()
+        )
+        if row:
+            _remember_list_board(db, row[1], row[2])
+            return row
+    return None
+
+# Resolve list -> board in one statement: (list, board_id, project_id) or None
+def get_list_ancestry(db: Session, list_id: int):
+    row = (
+        db.query(List, Board.id, Board.project_id)
+        .outerjoin(Board, _live_board(List.board_id))
+        .filter(List.id == list_id, List.deleted_at.is_(None))
+        .first()
+    )
+    if row:
+        _remember_list_board(db, list_id, row[1])
+    return row
 
 def create_list(db: Session, list_: ListCreate):
     db_list = List(board_id=list_.board_id, name=list_.name, position=list_.position)
     db.add(db_list)
+    db.flush()
+    emit(db, db_list.board_id, "list.created", _row_dict(db_list))
     db.commit()
     db.refresh(db_list)
     return db_list
 
 def create_task(db: Session, task: TaskCreate):
     db_task = Task(**task.model_dump())
+    db_task.position = position_between(_last_position(db, task.list_id), None)
     db.add(db_task)
+    db.flush()
+    boards = list_board_ids(db, [db_task.list_id])
+    record_task_changes(db, [(None, stat_snapshot(db_task))], boards)
+    reindex_tasks(db, [db_task.id])
+    _emit_task(db, boards, None, db_task, "task.created")
+    queue_activity(db, db_task.id, boards.get(db_task.list_id), "created", None, activity_snapshot(db_task))
     db.commit()
     db.refresh(db_task)
     return db_task
 
-def move_task(db: Session, task_id: int, move: TaskMove):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+# Highest position in a list (None if empty), served by ix_tasks_list_id_position
+def _last_position(db: Session, list_id: int, exclude_task_id: int = None):
+    query = db.query(func.max(Task.position)).filter(Task.list_id == list_id)
+    if exclude_task_id is not None:
+        query = query.filter(Task.id != exclude_task_id)
+    return query.scalar()
+
+# Positions of the tasks that would sit right before and after `index` in a list
+def _neighbour_positions(db: Session, list_id: int, index: int, exclude_task_id: int):
+    query = (
+        db.query(Task.position)
+        .filter(Task.list_id == list_id, Task.id != exclude_task_id)
+        .order_by(Task.position, Task.id)
+    )
+    if index == 0:
+        first = query.limit(1).first()
+        return None, first[0] if first else None
+    rows = query.offset(index - 1).limit(2).all()
+    if not rows:
+        return _last_position(db, list_id, exclude_task_id), None
+    return rows[0][0], rows[1][0] if len(rows) > 1 else None
+
+# Position for a task placed at `index` in a list (None = end); only the moved task is written
+def _position_at(db: Session, list_id: int, index, task_id: int):
+    if index is None:
+        before, after = _last_position(db, list_id, task_id), None
+    else:
+        before, after = _neighbour_positions(db, list_id, index, task_id)
+    position = position_between(before, after)
+    if is_exhausted(before, after, position):
+        # Neighbours collide: renumber now, it's the only way to fit the task in
+        rebalance_task_positions(db, list_id)
+        return _position_at(db, list_id, index, task_id)
+    if needs_rebalance(before, after, position):
+        request_rebalance(list_id)
+    return position
+
+def move_task(db: Session, task_id: int, move: TaskMove, task: Task = None):
+    db_task = task if task is not None else db.query(Task).filter(Task.id == task_id).first()
     if db_task:
+        before, activity_before = stat_snapshot(db_task), activity_snapshot(db_task)
+        if move.new_position is not None or move.new_list_id != db_task.list_id:
+            db_task.position = _position_at(db, move.new_list_id, move.new_position, db_task.id)
         db_task.list_id = move.new_list_id
-        # Logic sắp xếp position nếu cần
+        boards = list_board_ids(db, [before["list_id"], db_task.list_id])
+        record_task_changes(db, [(before, stat_snapshot(db_task))], boards)
+        if before["list_id"] != db_task.list_id:
+            db.flush()
+            reindex_tasks(db, [db_task.id])  # The new list may belong to another project
+            if boards.get(before["list_id"]) != boards.get(db_task.list_id):
+                _relabel_tasks(db, [db_task.id], boards.get(db_task.list_id))
+        _emit_task(db, boards, before, db_task, "task.moved")
+        queue_activity(db, db_task.id, boards.get(db_task.list_id), "moved", activity_before, activity_snapshot(db_task))
         db.commit()
         db.refresh(db_task)
     return db_task
 
+# Queue the change event for a task write. A task moved to another board is
+# announced as deleted on the old board and created on the new one.
+def _emit_task(db: Session, boards: dict, before: dict, task: Task, event_type: str):
+    board_id = boards.get(task.list_id)
+    if before is not None and boards.get(before["list_id"]) != board_id:
+        emit(db, boards.get(before["list_id"]), "task.deleted", {"id": task.id, "list_id": before["list_id"]})
+        event_type = "task.created"
+    emit(db, board_id, event_type, _row_dict(task))
+
+# Queue the change event for a new label or attachment of a task
+def _emit_task_child(db: Session, task_id: int, event_type: str, row):
+    list_id = db.query(Task.list_id).filter(Task.id == task_id).scalar()
+    emit(db, list_board_ids(db, [list_id]).get(list_id), event_type, _row_dict(row))
+
+# Renumber a list's tasks POSITION_STEP apart, keeping their current order
+def rebalance_task_positions(db: Session, list_id: int):
+    task_ids = [task_id for (task_id,) in db.query(Task.id).filter(Task.list_id == list_id).order_by(Task.position, Task.id)]
+    if task_ids:
+        positions = {task_id: (i + 1) * POSITION_STEP for i, task_id in enumerate(task_ids)}
+        db.execute(update(Task), [{"id": task_id, "position": position} for task_id, position in positions.items()])
+        db.flush()
+        emit(db, list_board_ids(db, [list_id]).get(list_id), "tasks.repositioned", {"list_id": list_id, "positions": positions})
+    return len(task_ids)
+
+# Label names are trimmed and whitespace-collapsed; the board dictionary keeps the first spelling
+def label_name(name: str):
+    return " ".join(name.split())[:100]
+
+# {name: label_id} for the existing labels of a board, matched case-insensitively
+def _find_board_labels(db: Session, board_id: int, names):
+    keys = {name.casefold(): name for name in names}
+    rows = db.query(BoardLabel.name, BoardLabel.id).filter(BoardLabel.board_id == board_id, func.lower(BoardLabel.name).in_(list(keys)))
+    found = {}
+    for name, label_id in rows:
+        if name.casefold() in keys:
+            found[keys[name.casefold()]] = label_id
+    return found
+
+# {name: label_id} for a board, adding missing names to its label dictionary
+def board_label_ids(db: Session, board_id: int, names):
+    found = _find_board_labels(db, board_id, names)
+    for name in set(names) - found.keys():
+        try:
+            with db.begin_nested():
+                db_label = BoardLabel(board_id=board_id, name=name)
+                db.add(db_label)
+            found[name] = db_label.id
+        except IntegrityError:
+            # Added concurrently, or a spelling the collation treats as equal
+            found[name] = db.query(BoardLabel.id).filter(BoardLabel.board_id == board_id, BoardLabel.name == name).scalar()
+    return found
+
+# Point the labels of tasks that moved to another board at that board's dictionary
+def _relabel_tasks(db: Session, task_ids, board_id: int):
+    if board_id is None:
+        return
+    rows = db.query(TaskLabel).filter(TaskLabel.task_id.in_(list(task_ids))).all()
+    if rows:
+        label_ids = board_label_ids(db, board_id, {row.label for row in rows})
+        for row in rows:
+            row.label_id = label_ids[row.label]
+        db.flush()
+
+# Add a label to a task; adding one it already has returns the existing row
 def add_label(db: Session, task_id: int, label: TaskLabelCreate):
-    db_label = TaskLabel(task_id=task_id, label=label.label)
+    name = label_name(label.label)
+    list_id = db.query(Task.list_id).filter(Task.id == task_id).scalar()
+    board_id = list_board_ids(db, [list_id]).get(list_id)
+    label_id = board_label_ids(db, board_id, [name])[name] if board_id is not None else None
+    if label_id is not None:
+        existing = db.query(TaskLabel).filter(TaskLabel.task_id == task_id, TaskLabel.label_id == label_id).first()
+        if existing is not None:
+            return existing
+    db_label = TaskLabel(task_id=task_id, label=name, label_id=label_id)
     db.add(db_label)
+    db.flush()
+    emit(db, board_id, "label.added", _row_dict(db_label))
     db.commit()
     db.refresh(db_label)
     return db_label
 
+# A board's labels with how many tasks carry each
+def get_board_labels(db: Session, board_id: int):
+    rows = (
+        db.query(BoardLabel, func.count(List.id))
+        .outerjoin(TaskLabel, TaskLabel.label_id == BoardLabel.id)
+        .outerjoin(Task, Task.id == TaskLabel.task_id)
+        .outerjoin(List, _live_list(Task.list_id))
+        .filter(BoardLabel.board_id == board_id)
+        .group_by(BoardLabel.id)
+        .order_by(BoardLabel.name)
+    )
+    return [dict(_row_dict(label), task_count=count) for label, count in rows]
+
+# Tasks of a board carrying all (or any) of the given labels, by id after `after_id`.
+# The label sets are intersected or merged on ix_task_labels_label_id_task_id.
+# Returns (tasks, last task id of the page or None on the last page).
+def get_board_tasks_by_labels(db: Session, board_id: int, names, match: str = "all", limit: int = 100, after_id: int = None):
+    names = {label_name(name) for name in names} - {""}
+    label_ids = set(_find_board_labels(db, board_id, names).values())
+    if not label_ids or (match == "all" and len(label_ids) < len(names)):
+        return [], None
+    query = db.query(TaskLabel.task_id).filter(TaskLabel.label_id.in_(label_ids))
+    if after_id is not None:
+        query = query.filter(TaskLabel.task_id > after_id)
+    query = query.group_by(TaskLabel.task_id)
+    if match == "all":
+        query = query.having(func.count(func.distinct(TaskLabel.label_id)) == len(label_ids))
+    task_ids = [task_id for (task_id,) in query.order_by(TaskLabel.task_id).limit(limit + 1)]
+    next_after = task_ids[limit - 1] if len(task_ids) > limit else None
+    task_ids = task_ids[:limit]
+    if not task_ids:
+        return [], None
+    tasks = (
+        db.query(Task)
+        .join(List, _live_list(Task.list_id))
+        .filter(List.board_id == board_id, Task.id.in_(task_ids))
+        .order_by(Task.id)
+        .all()
+    )
+    return tasks, next_after
+
 def add_attachment(db: Session, task_id: int, attachment: TaskAttachmentCreate):
     db_attachment = TaskAttachment(task_id=task_id, file_url=attachment.file_url)
     db.add(db_attachment)
+    db.flush()
+    _emit_task_child(db, task_id, "attachment.added", db_attachment)
     db.commit()
     db.refresh(db_attachment)
     return db_attachment
 
+# Record a file already written to the content store; it is served from url_prefix/attachments/{id}/content
+def add_stored_attachment(db: Session, task_id: int, filename: str, size: int, sha256: str, content_type: str, url_prefix: str = ""):
+    db_attachment = TaskAttachment(task_id=task_id, file_url="", filename=filename, size=size, sha256=sha256, content_type=content_type)
+    db.add(db_attachment)
+    db.flush()
+    db_attachment.file_url = f"{url_prefix}/attachments/{db_attachment.id}/content"
+    db.flush()
+    _emit_task_child(db, task_id, "attachment.added", db_attachment)
+    db.commit()
+    db.refresh(db_attachment)
+    return db_attachment
+
+# Resolve attachment -> task -> list -> board in one statement: (attachment, project_id) or None
+# Attachments of archived tasks are found in the archive
+def get_attachment_ancestry(db: Session, attachment_id: int):
+    for attachment, task in ((TaskAttachment, Task), (TaskAttachmentArchive, TaskArchive)):
+        row = (
+            db.query(attachment, Board.project_id)
+            .outerjoin(task, task.id == attachment.task_id)
+            .outerjoin(List, _live_list(task.list_id))
+            .outerjoin(Board, _live_board(List.board_id))
+            .filter(attachment.id == attachment_id)
+            .first()
+        )
+        if row:
+            return row
+    return None
+
+# {sha256: {project_id, ...}} of the live projects whose attachments (archived ones too) use these files
+def get_digest_project_ids(db: Session, digests):
+    projects = {}
+    for attachment, task in ((TaskAttachment, Task), (TaskAttachmentArchive, TaskArchive)):
+        rows = (
+            db.query(attachment.sha256, Board.project_id).distinct()
+            .join(task, task.id == attachment.task_id)
+            .join(List, _live_list(task.list_id))
+            .join(Board, _live_board(List.board_id))
+            .filter(attachment.sha256.in_(digests))
+        )
+        for digest, project_id in rows:
+            projects.setdefault(digest, set()).add(project_id)
+    return projects
+
 # Get lists by board
 def get_lists_by_board(db: Session, board_id: int):
-    return db.query(List).filter(List.board_id == board_id).order_by(List.position).all()
+    return db.query(List).filter(List.board_id == board_id, List.deleted_at.is_(None)).order_by(List.position).all()
+
+# Columns of a row as a plain dict
+def _row_dict(row):
+    return {column.name: getattr(row, column.name) for column in row.__table__.columns}
+
+# Whole board as a nested dict: lists -> tasks -> labels/attachments.
+# Always 4 statements (lists, tasks, labels, attachments) whatever the board size, 3 more
+# for the archive with include_archived.
+def get_board_full(db: Session, board: Board, include_archived: bool = False):
+    lists = get_lists_by_board(db, board.id)
+    tasks, labels, attachments = _board_task_rows(db, board.id, Task, TaskLabel, TaskAttachment)
+    if include_archived:
+        archived = _board_task_rows(db, board.id, TaskArchive, TaskLabelArchive, TaskAttachmentArchive)
+        tasks = sorted(tasks + archived[0], key=lambda task: (task.list_id, task.position, task.id))
+        labels, attachments = labels + archived[1], attachments + archived[2]
+    tasks_by_id = {}
+    tasks_by_list = {list_.id: [] for list_ in lists}
+    for task in tasks:
+        task_data = _row_dict(task)
+        task_data["labels"] = []
+        task_data["attachments"] = []
+        tasks_by_id[task.id] = task_data
+        tasks_by_list[task.list_id].append(task_data)
+    for label in labels:
+        tasks_by_id[label.task_id]["labels"].append(_row_dict(label))
+    for attachment in attachments:
+        tasks_by_id[attachment.task_id]["attachments"].append(_row_dict(attachment))
+    board_data = _row_dict(board)
+    board_data["lists"] = [dict(_row_dict(list_), tasks=tasks_by_list[list_.id]) for list_ in lists]
+    return board_data
+
+# A board's tasks, labels and attachments from the hot tables or the archive
+def _board_task_rows(db: Session, board_id: int, task, label, attachment):
+    tasks = (
+        db.query(task)
+        .join(List, _live_list(task.list_id))
+        .filter(List.board_id == board_id)
+        .order_by(task.list_id, task.position, task.id)
+        .all()
+    )
+    labels = (
+        db.query(label)
+        .join(task, task.id == label.task_id)
+        .join(List, _live_list(task.list_id))
+        .filter(List.board_id == board_id)
+        .order_by(label.id)
+        .all()
+    )
+    attachments = (
+        db.query(attachment)
+        .join(task, task.id == attachment.task_id)
+        .join(List, _live_list(task.list_id))
+        .filter(List.board_id == board_id)
+        .order_by(attachment.id)
+        .all()
+    )
+    return tasks, labels, attachments
+
+# Entities of a board changed after version `since`, as current rows plus tombstones.
+# One statement for the log and one per entity type.
+def get_board_changes(db: Session, board: Board, since: int):
+    version = board.version
+    result = {"board_id": board.id, "version": version, "full": False,
+              "lists": [], "tasks": [], "labels": [], "attachments": [],
+              "deleted": {"lists": [], "tasks": [], "labels": [], "attachments": []}}
+    rows = (
+        db.query(BoardChange.entity, BoardChange.entity_id, BoardChange.op)
+        .filter(BoardChange.board_id == board.id, BoardChange.version > since, BoardChange.version <= version)
+        .order_by(BoardChange.version, BoardChange.id)
+    )
+    latest = {}
+    for entity, entity_id, op in rows:
+        latest[(entity, entity_id)] = op
+    for entity, model in CHANGE_ENTITIES.items():
+        key = entity + "s"
+        upserted = sorted(entity_id for (kind, entity_id), op in latest.items() if kind == entity and op == "upsert")
+        found = set()
+        if upserted:
+            for row in db.query(model).filter(model.id.in_(upserted)).order_by(model.id):
+                result[key].append(_row_dict(row))
+                found.add(row.id)
+        deleted = {entity_id for (kind, entity_id), op in latest.items() if kind == entity and op == "delete"}
+        # An entity changed and later removed without a logged delete is a tombstone too
+        result["deleted"][key] = sorted(deleted | (set(upserted) - found))
+    return result
 
 # Get tasks by list
-def get_tasks_by_list(db: Session, list_id: int):
-    return db.query(Task).filter(Task.list_id == list_id).all()
+# Tasks of a list in board order. `after` is the (position, id) of the last task already
+# seen; with `limit` this is a keyset page served straight from the composite indexes.
+def get_tasks_by_list(db: Session, list_id: int, limit: int = None, after: tuple = None,
+                      status: str = None, priority: str = None, assignee_id: int = None,
+                      due_after: datetime = None, due_before: datetime = None, include_archived: bool = False):
+    filters = (list_id, limit, after, status, priority, assignee_id, due_after, due_before)
+    tasks = _list_tasks(db, Task, *filters)
+    if include_archived:
+        # Both pages follow the same (position, id) keyset, so merging them gives the combined page
+        tasks = sorted(tasks + _list_tasks(db, TaskArchive, *filters), key=lambda task: (task.position, task.id))[:limit]
+    return tasks
+
+# One page of a list's tasks from the hot table or the archive, which share their column names
+def _list_tasks(db: Session, model, list_id: int, limit: int, after: tuple, status: str, priority: str,
+                assignee_id: int, due_after: datetime, due_before: datetime):
+    query = db.query(model).filter(model.list_id == list_id)
+    if status is not None:
+        query = query.filter(model.status == status)
+    if priority is not None:
+        query = query.filter(model.priority == priority)
+    if assignee_id is not None:
+        query = query.filter(model.assignee_id == assignee_id)
+    if due_after is not None:
+        query = query.filter(model.due_date >= due_after)
+    if due_before is not None:
+        query = query.filter(model.due_date < due_before)
+    if after is not None:
+        position, task_id = after
+        # Expanded rather than a row comparison so MariaDB can range-scan the index
+        query = query.filter(or_(model.position > position, and_(model.position == position, model.id > task_id)))
+    query = query.order_by(model.position, model.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+# Projects where a user has tasks (only tasks with a due date if due_only), from the assignee indexes
+def get_assignee_project_ids(db: Session, user_id: int, due_only: bool = False):
+    query = (
+        db.query(Board.project_id)
+        .select_from(Task)
+        .join(List, _live_list(Task.list_id))
+        .join(Board, _live_board(List.board_id))
+        .filter(Task.assignee_id == user_id)
+    )
+    if due_only:
+        query = query.filter(Task.due_date.is_not(None))
+    return [project_id for (project_id,) in query.distinct()]
+
+# Tasks assigned to a user in the given projects as (task, board_id, project_id), from
+# ix_tasks_assignee_id_status_due_date: dated tasks by deadline, then undated ones by id.
+# `after` is the (due_date or None, id) of the last task seen.
+def get_assignee_tasks(db: Session, user_id: int, project_ids, statuses=None, due_after: datetime = None,
+                       due_before: datetime = None, limit: int = None, after: tuple = None):
+    if not project_ids:
+        return []
+    query = (
+        db.query(Task, Board.id, Board.project_id)
+        .join(List, _live_list(Task.list_id))
+        .join(Board, _live_board(List.board_id))
+        .filter(Task.assignee_id == user_id, Board.project_id.in_(project_ids))
+    )
+    if statuses:
+        query = query.filter(Task.status.in_(statuses))
+    if due_after is not None:
+        query = query.filter(Task.due_date >= due_after)
+    if due_before is not None:
+        query = query.filter(Task.due_date < due_before)
+    if after is not None:
+        due_date, task_id = after
+        if due_date is None:
+            query = query.filter(Task.due_date.is_(None), Task.id > task_id)
+        else:
+            query = query.filter(or_(Task.due_date > due_date, and_(Task.due_date == due_date, Task.id > task_id), Task.due_date.is_(None)))
+    query = query.order_by(Task.due_date.is_(None), Task.due_date, Task.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+# Open tasks assigned to a user in the given projects, soonest deadline first. Tasks already
+# overdue are left out unless include_overdue. `after` is the (due_date, id) of the last task seen.
+def get_due_tasks(db: Session, user_id: int, project_ids, now: datetime, include_overdue: bool = False,
+                  before: datetime = None, limit: int = None, after: tuple = None):
+    if not project_ids:
+        return []
+    query = (
+        db.query(Task)
+        .join(List, _live_list(Task.list_id))
+        .join(Board, _live_board(List.board_id))
+        .filter(Task.assignee_id == user_id, Board.project_id.in_(project_ids))
+        .filter(or_(Task.status.is_(None), Task.status.notin_(DONE_STATUSES)))
+    )
+    query = query.filter(Task.due_date.is_not(None) if include_overdue else Task.due_date >= now)
+    if before is not None:
+        query = query.filter(Task.due_date < before)
+    if after is not None:
+        due_date, task_id = after
+        query = query.filter(or_(Task.due_date > due_date, and_(Task.due_date == due_date, Task.id > task_id)))
+    query = query.order_by(Task.due_date, Task.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
 
 # Assign task to user
-def assign_task(db: Session, task_id: int, user_id: int):
-    task = db.query(Task).filter(Task.id == task_id).first()
+def assign_task(db: Session, task_id: int, user_id: int, task: Task = None):
+    if task is None:
+        task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         return None
+    before, activity_before = stat_snapshot(task), activity_snapshot(task)
     task.assignee_id = user_id
+    boards = list_board_ids(db, [task.list_id])
+    record_task_changes(db, [(before, stat_snapshot(task))], boards)
+    _emit_task(db, boards, before, task, "task.updated")
+    queue_activity(db, task.id, boards.get(task.list_id), "assigned", activity_before, activity_snapshot(task))
     db.commit()
     db.refresh(task)
     return task
 
 # Update list
-def update_list(db: Session, list_id: int, update_data: dict):
-    list_ = db.query(List).filter(List.id == list_id).first()
+def update_list(db: Session, list_id: int, update_data: dict, list_: List = None):
+    if list_ is None:
+        list_ = db.query(List).filter(List.id == list_id).first()
     if not list_:
         return None
     allowed = {"name", "position"}
     for key, value in update_data.items():
         if key in allowed:
             setattr(list_, key, value)
+    emit(db, list_.board_id, "list.updated", _row_dict(list_))
     db.commit()
     db.refresh(list_)
     return list_
 
-# Delete list
-def delete_list(db: Session, list_id: int):
-    list_ = db.query(List).filter(List.id == list_id).first()
+# Delete list: it disappears at once, its tasks leave the board counters, and the rows
+# are removed by the returned PurgeJob (see purge.py)
+def delete_list(db: Session, list_id: int, list_: List = None, project_id: int = None):
+    if list_ is None:
+        list_ = db.query(List).filter(List.id == list_id, List.deleted_at.is_(None)).first()
     if not list_:
         return None
-    db.delete(list_)
+    if project_id is None:
+        project_id = db.query(Board.project_id).filter(Board.id == list_.board_id).scalar()
+    list_.deleted_at = datetime.utcnow()
+    counts = count_list_tasks(db, list_.board_id, list_.id)
+    apply_stat_deltas(db, Counter({key: -count for key, count in counts.items()}))
+    emit(db, list_.board_id, "list.deleted", {"id": list_.id})
+    job = PurgeJob(entity="list", entity_id=list_.id, project_id=project_id)
+    db.add(job)
     db.commit()
-    return True
+    db.refresh(job)
+    return job
+
+# Delete board: hidden from every read at once, its rows removed by the returned PurgeJob
+def delete_board(db: Session, board: Board):
+    board.deleted_at = datetime.utcnow()
+    emit(db, board.id, "board.deleted", {"id": board.id})
+    job = PurgeJob(entity="board", entity_id=board.id, project_id=board.project_id)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+# Tombstone the live boards of a deleted project and queue their purge jobs in one
+# transaction; returns (every board purge job of the project, the ids of the new ones)
+def delete_project_boards(db: Session, project_id: int):
+    new_jobs = []
+    for board in db.query(Board).filter(Board.project_id == project_id, Board.deleted_at.is_(None)):
+        board.deleted_at = datetime.utcnow()
+        emit(db, board.id, "board.deleted", {"id": board.id})
+        new_jobs.append(PurgeJob(entity="board", entity_id=board.id, project_id=project_id))
+    db.add_all(new_jobs)
+    db.commit()
+    jobs = db.query(PurgeJob).filter(PurgeJob.project_id == project_id, PurgeJob.entity == "board").all()
+    return jobs, [job.id for job in new_jobs]
+
+# Ids of all the project's tasks, hot and archived, deleted boards and lists included, after `after`
+def get_project_task_ids(db: Session, project_id: int, after: int, limit: int):
+    task_ids = []
+    for model in (Task, TaskArchive):
+        rows = (
+            db.query(model.id).join(List, List.id == model.list_id).join(Board, Board.id == List.board_id)
+            .filter(Board.project_id == project_id, model.id > after).order_by(model.id).limit(limit)
+        )
+        task_ids += [task_id for task_id, in rows]
+    return sorted(task_ids)[:limit]
 
 # Update task
-def update_task(db: Session, task_id: int, update_data: dict):
-    task = db.query(Task).filter(Task.id == task_id).first()
+def update_task(db: Session, task_id: int, update_data: dict, task: Task = None):
+    if task is None:
+        task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         return None
-    allowed = {"title", "description", "assignee_id", "priority", "status", "due_date", "list_id"}
+    before, activity_before = stat_snapshot(task), activity_snapshot(task)
+    allowed = TASK_UPDATE_FIELDS
+    if "list_id" in update_data and update_data["list_id"] != task.list_id:
+        # Changing list through PATCH appends the task to the end of the new list
+        task.position = _position_at(db, update_data["list_id"], None, task.id)
     for key, value in update_data.items():
         if key in allowed:
             setattr(task, key, value)
+    if task.status != before["status"]:
+        task.completed_at = _completed_at(task.status)
+    boards = list_board_ids(db, [before["list_id"], task.list_id])
+    record_task_changes(db, [(before, stat_snapshot(task))], boards)
+    if SEARCH_FIELDS & update_data.keys():
+        db.flush()
+        reindex_tasks(db, [task.id])
+    if boards.get(before["list_id"]) != boards.get(task.list_id):
+        _relabel_tasks(db, [task.id], boards.get(task.list_id))
+    _emit_task(db, boards, before, task, "task.updated")
+    queue_activity(db, task.id, boards.get(task.list_id), "updated", activity_before, activity_snapshot(task))
     db.commit()
     db.refresh(task)
     return task
 
+# A task's activity, newest first; `before_id` is the id of the last entry already seen
+def get_task_history(db: Session, task_id: int, limit: int = None, before_id: int = None):
+    query = db.query(TaskActivity).filter(TaskActivity.task_id == task_id)
+    if before_id is not None:
+        query = query.filter(TaskActivity.id < before_id)
+    query = query.order_by(TaskActivity.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
 # Delete task
-def delete_task(db: Session, task_id: int):
-    task = db.query(Task).filter(Task.id == task_id).first()
+def delete_task(db: Session, task_id: int, task: Task = None):
+    if task is None:
+        task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         return None
-    db.delete(task)
+    boards = list_board_ids(db, [task.list_id])
+    record_task_changes(db, [(stat_snapshot(task), None)], boards)
+    emit(db, boards.get(task.list_id), "task.deleted", {"id": task.id, "list_id": task.list_id})
+    queue_activity(db, task.id, boards.get(task.list_id), "deleted", activity_snapshot(task), None)
+    delete_task_rows(db, [task.id])
+    db.expunge(task)
+    db.commit()
+    return True
+
+# Load everything a task batch touches in two statements:
+# tasks -> {task_id: (task, project_id)} and target lists -> {list_id: project_id}
+def resolve_task_batch(db: Session, operations):
+    task_ids = {op.task_id for op in operations if op.task_id is not None}
+    list_ids = {op.new_list_id for op in operations if op.op == "move" and op.new_list_id is not None}
+    for op in operations:
+        if op.op in ("create", "update") and isinstance((op.data or {}).get("list_id"), int):
+            list_ids.add(op.data["list_id"])
+    tasks = {}
+    if task_ids:
+        rows = (
+            db.query(Task, Board.project_id)
+            .outerjoin(List, _live_list(Task.list_id))
+            .outerjoin(Board, _live_board(List.board_id))
+            .filter(Task.id.in_(task_ids))
+            .all()
+        )
+        tasks = {task.id: (task, project_id) for task, project_id in rows}
+    list_projects = {}
+    if list_ids:
+        rows = (
+            db.query(List.id, Board.project_id)
+            .join(Board, _live_board(List.board_id))
+            .filter(List.id.in_(list_ids), List.deleted_at.is_(None))
+            .all()
+        )
+        list_projects = dict(rows)
+    return tasks, list_projects
+
+# stat_snapshot() of a task about to be bulk inserted from `row`
+def created_snapshot(row: dict):
+    snapshot = {key: row.get(key) for key in ("list_id", "priority", "assignee_id")}
+    snapshot["status"] = row.get("status", Task.__table__.c.status.default.arg)
+    return snapshot
+
+# Change events for a batch; created and changed tasks are read back in one statement
+def _emit_batch(db: Session, boards: dict, created_ids, changes: dict, deleted: set, befores: dict):
+    task_ids = list(created_ids) + [task_id for task_id, fields in changes.items() if fields]
+    written = db.query(Task).filter(Task.id.in_(task_ids)).order_by(Task.id).all() if task_ids else []
+    for task in written:
+        fields = changes.get(task.id)
+        if fields is None:
+            event_type = "task.created"
+        else:
+            event_type = "task.moved" if {"list_id", "position"} & fields.keys() else "task.updated"
+        _emit_task(db, boards, befores.get(task.id), task, event_type)
+    for task_id in sorted(deleted):
+        list_id = befores[task_id]["list_id"]
+        emit(db, boards.get(list_id), "task.deleted", {"id": task_id, "list_id": list_id})
+
+class _BatchError(Exception):
+    def __init__(self, status: int, detail: str):
+        self.status = status
+        self.detail = detail
+
+# Apply a validated batch in one transaction with bulk INSERT/UPDATE/DELETE statements.
+# Failed operations are reported per item and don't stop the others.
+# Moves to an explicit index are placed against the positions stored before the batch.
+def apply_task_batch(db: Session, operations, tasks: dict, list_projects: dict, allowed_projects: set):
+    results = []
+    creates = []  # (result, row)
+    changes = {}  # task_id -> {column: value}
+    deleted = set()
+    last_positions = {}  # list_id -> last position handed out in this batch
+
+    def append_position(list_id):
+        if list_id not in last_positions:
+            last_positions[list_id] = _last_position(db, list_id)
+        last_positions[list_id] = position_between(last_positions[list_id], None)
+        return last_positions[list_id]
+
+    def check_list(list_id):
+        if list_id not in list_projects:
+            raise _BatchError(404, "List not found")
+        if list_projects[list_id] not in allowed_projects:
+            raise _BatchError(403, "Not authorized for this project")
+
+    def load_task(task_id):
+        if task_id is None:
+            raise _BatchError(422, "task_id is required")
+        if task_id not in tasks or task_id in deleted:
+            raise _BatchError(404, "Task not found")
+        task, project_id = tasks[task_id]
+        if project_id is None:
+            raise _BatchError(404, "List not found")
+        if project_id not in allowed_projects:
+            raise _BatchError(403, "Not authorized for this project")
+        return task
+
+    for index, op in enumerate(operations):
+        result = {"index": index, "op": op.op, "task_id": op.task_id, "status": 200, "detail": None}
+        results.append(result)
+        try:
+            if op.op == "create":
+                try:
+                    new_task = TaskCreate(**(op.data or {}))
+                except ValidationError as exc:
+                    raise _BatchError(422, str(exc.errors()[0]["msg"]))
+                check_list(new_task.list_id)
+                row = new_task.model_dump()
+                row["position"] = append_position(new_task.list_id)
+                creates.append((result, row))
+                result["status"] = 201
+                continue
+            task = load_task(op.task_id)
+            fields = changes.setdefault(task.id, {})
+            list_id = fields.get("list_id", task.list_id)
+            if op.op == "update":
+                try:
+                    update_data = TaskUpdate.model_validate(op.data or {}).model_dump(exclude_unset=True)
+                except ValidationError as exc:
+                    raise _BatchError(422, str(exc.errors()[0]["msg"]))
+                update_data = {key: value for key, value in update_data.items() if key in TASK_UPDATE_FIELDS}
+                if update_data.get("list_id") not in (None, list_id):
+                    check_list(update_data["list_id"])
+                    update_data["position"] = append_position(update_data["list_id"])
+                elif "list_id" in update_data and update_data["list_id"] is None:
+                    raise _BatchError(422, "list_id cannot be null")
+                if "status" in update_data and update_data["status"] != fields.get("status", task.status):
+                    update_data["completed_at"] = _completed_at(update_data["status"])
+                fields.update(update_data)
+            elif op.op == "move":
+                if op.new_list_id is None:
+                    raise _BatchError(422, "new_list_id is required")
+                if op.new_list_id != list_id:
+                    check_list(op.new_list_id)
+                if op.new_position is not None:
+                    fields["position"] = _position_at(db, op.new_list_id, op.new_position, task.id)
+                elif op.new_list_id != list_id:
+                    fields["position"] = append_position(op.new_list_id)
+                fields["list_id"] = op.new_list_id
+            elif op.op == "assign":
+                fields["assignee_id"] = op.assignee_id
+            elif op.op == "delete":
+                deleted.add(task.id)
+                changes.pop(task.id, None)
+        except _BatchError as exc:
+            result["status"] = exc.status
+            result["detail"] = exc.detail
+
+    new_ids = []
+    if creates:
+        new_ids = db.scalars(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            [row for _, row in creates],
+        ).all()
+        for (result, _), task_id in zip(creates, new_ids):
+            result["task_id"] = task_id
+        reindex_tasks(db, new_ids)
+    # Snapshot before the bulk UPDATE, which also refreshes the loaded tasks in the session
+    befores = {task_id: stat_snapshot(tasks[task_id][0]) for task_id in changes.keys() | deleted}
+    activity_befores = {task_id: activity_snapshot(tasks[task_id][0]) for task_id in changes.keys() | deleted}
+    stat_changes = [(None, created_snapshot(row)) for _, row in creates]
+    for task_id, fields in changes.items():
+        stat_changes.append((befores[task_id], {key: fields.get(key, value) for key, value in befores[task_id].items()}))
+    stat_changes += [(befores[task_id], None) for task_id in deleted]
+    rows = [dict(fields, id=task_id) for task_id, fields in changes.items() if fields]
+    if rows:
+        db.execute(update(Task), rows)
+    boards = list_board_ids(db, {snapshot["list_id"] for pair in stat_changes for snapshot in pair if snapshot is not None})
+    record_task_changes(db, stat_changes, boards)
+    reindex_tasks(db, [task_id for task_id, fields in changes.items() if SEARCH_FIELDS & fields.keys()])
+    moved_boards = {}  # new board_id -> task ids that left another board
+    for task_id, fields in changes.items():
+        old_board, new_board = boards.get(befores[task_id]["list_id"]), boards.get(fields.get("list_id", befores[task_id]["list_id"]))
+        if old_board != new_board:
+            moved_boards.setdefault(new_board, []).append(task_id)
+    for board_id, task_ids in moved_boards.items():
+        _relabel_tasks(db, task_ids, board_id)
+    delete_task_rows(db, deleted)
+    _emit_batch(db, boards, new_ids, changes, deleted, befores)
+    for (_, row), task_id in zip(creates, new_ids):
+        queue_activity(db, task_id, boards.get(row["list_id"]), "created", None, {field: row.get(field) for field in ACTIVITY_FIELDS})
+    for task_id, fields in changes.items():
+        after = dict(activity_befores[task_id], **{key: value for key, value in fields.items() if key in ACTIVITY_FIELDS})
+        queue_activity(db, task_id, boards.get(after["list_id"]), activity_action(fields), activity_befores[task_id], after)
+    for task_id in sorted(deleted):
+        queue_activity(db, task_id, boards.get(befores[task_id]["list_id"]), "deleted", activity_befores[task_id], None)
     db.commit()
-    return True
\ No newline at end of file
+    return results
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import threading
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .broker import BROKER_MAX_LINE
+from .changes import record_changes
+
+# Board change feed. Crud functions queue events on the session with emit(); they are
+# published only once the transaction commits, and dropped on rollback. Each worker
+# process has one EventHub that fans events out to its local subscribers. With several
+# workers, hubs relay through the broker (src/broker.py) so every worker sees every event.
+EVENT_BROKER_URL = os.getenv("EVENT_BROKER_URL", "")  # e.g. tcp://127.0.0.1:7001, empty = this process only
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))  # Pending events per subscriber
+EVENT_BROKER_RETRY = float(os.getenv("EVENT_BROKER_RETRY", "1"))  # Seconds between broker reconnects
+
+# Sent to a subscriber whose queue overflowed, just before its stream ends
+RESYNC = {"type": "resync"}
+
+# Dispatched locally on each (re)connection to the broker: broadcasts sent while this
+# worker was disconnected never reach it
+BROKER_CONNECTED = "broker.connected"
+
+def emit(db: Session, board_id: int, event_type: str, data: dict):
+    if board_id is not None:
+        db.info.setdefault("pending_events", []).append({"board_id": board_id, "type": event_type, "data": jsonable_encoder(data)})
+
+# Inside the transaction: version the board and append to its change log (changes.py)
+@event.listens_for(Session, "before_commit")
+def _log_pending(session):
+    events = session.info.get("pending_events")
+    if events:
+        record_changes(session, events)
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session):
+    events = session.info.pop("pending_events", None)
+    if events:
+        hub.publish(events)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_pending(session, previous_transaction):
+    session.info.pop("pending_events", None)
+
+class Subscription:
+    def __init__(self, board_id: int, size: int):
+        self.board_id = board_id
+        self.queue = asyncio.Queue(maxsize=size)
+        self.overflowed = False
+
+    def offer(self, event: dict):
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.queue.maxsize - 1:
+            # Too slow to keep up: keep the last slot for the resync notice and stop feeding it
+            self.overflowed = True
+            self.queue.put_nowait(RESYNC)
+            return
+        self.queue.put_nowait(event)
+
+class EventHub:
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions = {}  # board_id -> set of Subscription
+        self._handlers = {}  # message type -> handler, for broadcast() messages
+        self._loop = None
+        self._writer = None  # Broker connection, None when publishing locally
+        self._task = None
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0  # Events skipped because no event loop was running
+
+    async def start(self, broker_url: str = EVENT_BROKER_URL):
+        self._loop = asyncio.get_running_loop()
+        if broker_url:
+            host, port = broker_url.removeprefix("tcp://").rsplit(":", 1)
+            self._task = asyncio.create_task(self._relay(host, int(port)))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+
+    def subscribe(self, board_id: int):
+        subscription = Subscription(board_id, self.queue_size)
+        self._subscriptions.setdefault(board_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscriptions.get(subscription.board_id)
+        if subscribers:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[subscription.board_id]
+
+    # Messages for every worker rather than a board's subscribers (e.g. permission cache
+    # invalidations): handler(data) runs on the event loop of each worker that receives one
+    def on(self, message_type: str, handler):
+        self._handlers[message_type] = handler
+
+    # Thread-safe. Reaches the other workers only while connected to the broker; the caller
+    # applies the message to its own worker itself.
+    def broadcast(self, message_type: str, data: dict):
+        self.publish([{"board_id": None, "type": message_type, "data": jsonable_encoder(data)}])
+
+    # True while relaying through the broker
+    @property
+    def connected(self):
+        return self._writer is not None
+
+    def subscriber_count(self):
+        return sum(len(subscribers) for subscribers in self._subscriptions.values())
+
+    # Thread-safe: called from the threadpool where crud runs
+    def publish(self, events):
+        with self._lock:
+            loop, writer = self._loop, self._writer
+        if loop is None or loop.is_closed():
+            self.dropped += len(events)
+            return
+        self.published += len(events)
+        if writer is not None:
+            # The broker echoes events back to this worker too, so don't dispatch them here
+            data = "".join(json.dumps(item, separators=(",", ":")) + "\n" for item in events).encode()
+            loop.call_soon_threadsafe(writer.write, data)
+        else:
+            loop.call_soon_threadsafe(self.dispatch, events)
+
+    # Runs on the event loop
+    def dispatch(self, events):
+        for item in events:
+            if item["board_id"] is None:
+                handler = self._handlers.get(item["type"])
+                if handler is not None:
+                    handler(item["data"])
+                continue
+            for subscription in list(self._subscriptions.get(item["board_id"], ())):
+                subscription.offer(item)
+
+    async def _relay(self, host: str, port: int):
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(host, port, limit=BROKER_MAX_LINE)
+            except OSError:
+                await asyncio.sleep(EVENT_BROKER_RETRY)
+                continue
+            with self._lock:
+                self._writer = writer
+            self.dispatch([{"board_id": None, "type": BROKER_CONNECTED, "data": {}}])
+            try:
+                while line := await reader.readline():
+                    self.dispatch([json.loads(line)])
+            except (OSError, ValueError):
+                pass
+            finally:
+                with self._lock:
+                    self._writer = None
+                writer.close()
+            await asyncio.sleep(EVENT_BROKER_RETRY)
+
+hub = EventHub()
@@ -0,0 +1,50 @@
+import asyncio
+import os
+import aiohttp
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "2"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "5"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))  # Max wait for a free connection
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))  # Max concurrent requests per upstream
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+
+class UpstreamUnavailable(Exception):
+    pass
+
+class UpstreamClients:
+    # One keep-alive connection pool per upstream, shared by every request for the app lifetime
+    def __init__(self, connect_timeout: float = HTTP_CONNECT_TIMEOUT, read_timeout: float = HTTP_READ_TIMEOUT,
+                 pool_timeout: float = HTTP_POOL_TIMEOUT, max_connections: int = HTTP_MAX_CONNECTIONS,
+                 keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT):
+        self.timeout = aiohttp.ClientTimeout(total=None, connect=pool_timeout + connect_timeout,
+                                             sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self._sessions = {}
+
+    def get(self, base_url: str) -> aiohttp.ClientSession:
+        session = self._sessions.get(base_url)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=self.keepalive_timeout)
+            session = aiohttp.ClientSession(base_url=base_url, connector=connector, timeout=self.timeout)
+            self._sessions[base_url] = session
+        return session
+
+    async def request(self, base_url: str, method: str, path: str, **kwargs):
+        # Returns (status, parsed JSON body or None)
+        try:
+            async with self.get(base_url).request(method, path, **kwargs) as response:
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = None
+                return response.status, data
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            raise UpstreamUnavailable(f"{base_url}: {exc!r}") from exc
+
+    async def aclose(self):
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            await session.close()
+
+upstreams = UpstreamClients()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from .database import SessionLocal
+from .models import Task
+from .stats import reconcile_board_stats, reconcile_all_board_stats
+from .search import reindex_tasks
+from .changes import compact_all_board_changes
+from .purge import run_unfinished_purge_jobs
+from .activity import compact_task_activity, ACTIVITY_RETENTION_DAYS
+from .archive import archive_done_tasks, TASK_ARCHIVE_AGE_DAYS, ARCHIVE_BATCH_SIZE
+
+CHANGE_LOG_RETENTION_DAYS = float(os.getenv("CHANGE_LOG_RETENTION_DAYS", "30"))
+
+# Maintenance jobs, run from cron or by hand:
+#   python -m src.jobs reconcile-stats [--board-id N]
+#   python -m src.jobs reindex-search [--batch-size N]
+#   python -m src.jobs compact-changes [--retention-days N]
+#   python -m src.jobs purge-deleted
+#   python -m src.jobs compact-activity [--retention-days N]
+#   python -m src.jobs archive-tasks [--age-days N] [--batch-size N]
+
+def reconcile_stats(args):
+    with SessionLocal() as db:
+        if args.board_id is not None:
+            drift = reconcile_board_stats(db, args.board_id)
+        else:
+            drift = reconcile_all_board_stats(db)
+    for entry in drift:
+        print(json.dumps(entry))
+    print(f"reconcile-stats: {len(drift)} drifted counter(s) fixed")
+
+# Rebuild the search index of every task, one committed batch at a time
+def reindex_search(args):
+    indexed, last_id = 0, 0
+    with SessionLocal() as db:
+        while True:
+            task_ids = [task_id for (task_id,) in db.query(Task.id).filter(Task.id > last_id).order_by(Task.id).limit(args.batch_size)]
+            if not task_ids:
+                break
+            reindex_tasks(db, task_ids)
+            db.commit()
+            indexed, last_id = indexed + len(task_ids), task_ids[-1]
+    print(f"reindex-search: {indexed} task(s) indexed")
+
+# Keep the board change log bounded; clients older than the retention get a snapshot
+def compact_changes(args):
+    with SessionLocal() as db:
+        deleted = compact_all_board_changes(db, datetime.utcnow() - timedelta(days=args.retention_days))
+    print(f"compact-changes: {deleted} change row(s) deleted")
+
+# Finish purging deleted boards and lists whose job was interrupted or failed
+def purge_deleted(args):
+    with SessionLocal() as db:
+        finished = run_unfinished_purge_jobs(db)
+    print(f"purge-deleted: {finished} purge job(s) run")
+
+# Drop task activity older than the retention window
+def compact_activity(args):
+    with SessionLocal() as db:
+        deleted = compact_task_activity(db, datetime.utcnow() - timedelta(days=args.retention_days))
+    print(f"compact-activity: {deleted} activity row(s) deleted")
+
+# Move tasks done for longer than the age out of the hot tables
+def archive_tasks(args):
+    with SessionLocal() as db:
+        archived = archive_done_tasks(db, datetime.utcnow() - timedelta(days=args.age_days), args.batch_size)
+    print(f"archive-tasks: {archived} task(s) archived")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("reconcile-stats", help="Recompute board task counters and fix drift")
+    command.add_argument("--board-id", type=int)
+    command.set_defaults(run=reconcile_stats)
+    command = commands.add_parser("reindex-search", help="Rebuild the task search index")
+    command.add_argument("--batch-size", type=int, default=1000)
+    command.set_defaults(run=reindex_search)
+    command = commands.add_parser("compact-changes", help="Compact the board change log")
+    command.add_argument("--retention-days", type=float, default=CHANGE_LOG_RETENTION_DAYS)
+    command.set_defaults(run=compact_changes)
+    command = commands.add_parser("purge-deleted", help="Resume unfinished purges of deleted boards and lists")
+    command.set_defaults(run=purge_deleted)
+    command = commands.add_parser("compact-activity", help="Delete task activity past its retention")
+    command.add_argument("--retention-days", type=float, default=ACTIVITY_RETENTION_DAYS)
+    command.set_defaults(run=compact_activity)
+    command = commands.add_parser("archive-tasks", help="Archive tasks that have been done for a while")
+    command.add_argument("--age-days", type=float, default=TASK_ARCHIVE_AGE_DAYS)
+    command.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    command.set_defaults(run=archive_tasks)
+    args = parser.parse_args(argv)
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
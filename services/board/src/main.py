@@ -1,11 +1,42 @@
-from fastapi import FastAPI, Depends, HTTPException
-import requests
+import asyncio
+import json
+import os
+from typing import Literal
+from contextlib import asynccontextmanager
+from datetime import datetime
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from .database import get_db
-from .schemas import BoardCreate, BoardResponse, ListCreate, ListResponse, TaskCreate, TaskResponse, TaskMove, TaskLabelCreate, TaskLabelResponse, TaskAttachmentCreate, TaskAttachmentResponse
-from .crud import create_board, get_board, create_list, create_task, move_task, add_label, add_attachment, get_lists_by_board, get_tasks_by_list, assign_task, update_list, delete_list, update_task, delete_task
-from .auth import get_current_user
-from .models import List, Task
+from .schemas import BoardCreate, BoardResponse, ListCreate, ListResponse, TaskCreate, TaskResponse, TaskMove, TaskLabelCreate, TaskLabelResponse, TaskAttachmentCreate, TaskAttachmentResponse, PermissionInvalidate, BoardFullResponse, TaskBatchRequest, TaskBatchResponse, BoardStatsResponse, TaskSearchResult, AssignedTaskResponse, BoardChangesResponse, BoardLabelResponse, BoardImportResponse, PurgeJobResponse, ProjectPurgeResponse, ProjectBoardSummary, TaskActivityResponse
+from .crud import create_board, get_board, get_board_templates, get_task_ancestry, get_list_ancestry, create_list, create_task, move_task, add_label, add_attachment, add_stored_attachment, get_attachment_ancestry, get_digest_project_ids, get_lists_by_board, get_board_full, get_board_changes, delete_project_boards, get_project_task_ids, get_board_labels, get_board_tasks_by_labels, get_tasks_by_list, get_assignee_project_ids, get_assignee_tasks, get_due_tasks, assign_task, update_list, delete_list, delete_board, update_task, get_task_history, delete_task, rebalance_task_positions, resolve_task_batch, apply_task_batch
+from .auth import get_current_user, get_service_caller
+from .permission_cache import permission_cache
+from .http_client import upstreams, UpstreamUnavailable
+from .ordering import pop_pending_rebalances
+from .stats import get_board_stats, get_project_board_stats
+from .search import query_terms, document_frequencies, projects_with_term, search_tasks
+from .events import hub, RESYNC, BROKER_CONNECTED
+from .activity import activity_recorder
+from .storage import attachment_store, blob_response, upload_content_type, valid_digest, UploadTooLarge
+from .transfer import export_board, ndjson_records, index_imported_board, clone_board, BoardImporter, ImportFailed, IMPORT_BATCH_SIZE
+from .purge import purge_size, run_purge_job, purge_in_background, PURGE_INLINE_TASKS
+from .models import PurgeJob
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor, split_page
+
+PROJECT_SERVICE_URL = os.getenv("PROJECT_SERVICE_URL", "http://project_service:8000")
+SEARCH_MAX_PROJECTS = int(os.getenv("SEARCH_MAX_PROJECTS", "100"))  # Projects checked per unscoped search
+EVENT_HEARTBEAT = float(os.getenv("EVENT_HEARTBEAT", "15"))  # Seconds between keep-alive comments on idle feeds
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await hub.start()
+    yield
+    await hub.stop()
+    await upstreams.aclose()
+    await run_in_threadpool(activity_recorder.stop)  # Write out the queued task activity
 
 app = FastAPI(
     root_path="/board_service",
@@ -14,175 +45,616 @@ app = FastAPI(
     openapi_url="/openapi.json",
     docs_url="/docs",
     redoc_url="/edoc",
+    lifespan=lifespan,
 )
 
-def check_project_permission(project_id: int, user_id: int, token: str):
-    # Call project_service to check role
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"http://project_service:8000/projects/{project_id}/members/{user_id}", headers=headers)
-    if response.status_code != 200 or response.json().get("role") not in ["owner", "member"]:
+PERMISSION_INVALIDATE = "permission.invalidate"
+hub.on(PERMISSION_INVALIDATE, lambda data: permission_cache.invalidate(data["project_id"], data["user_id"]))
+hub.on(BROKER_CONNECTED, lambda data: permission_cache.clear())  # It may have missed invalidations
+
+# `cache`: False when `token` is not user_id's own. project_service answers 403 when the
+# token's user isn't a member, which says nothing about user_id.
+async def has_project_permission(project_id: int, user_id: int, token: str, cache: bool = True):
+    allowed = permission_cache.get(project_id, user_id) if cache else None
+    if allowed is None:
+        # Cache miss: call project_service to check role
+        headers = {"Authorization": f"Bearer {token}"}
+        try:
+            status_code, data = await upstreams.request(PROJECT_SERVICE_URL, "GET", f"/projects/{project_id}/members/{user_id}", headers=headers)
+        except UpstreamUnavailable:
+            raise HTTPException(status_code=503, detail="Project service unavailable")
+        allowed = status_code == 200 and (data or {}).get("role") in ["owner", "member"]
+        # Only cache definite answers, never upstream errors
+        if cache and status_code in (200, 403, 404):
+            permission_cache.set(project_id, user_id, allowed)
+    return allowed
+
+async def check_project_permission(project_id: int, user_id: int, token: str, cache: bool = True):
+    if not await has_project_permission(project_id, user_id, token, cache):
         raise HTTPException(status_code=403, detail="Not authorized for this project")
 
-@app.post("/boards", response_model=BoardResponse)
-def create_new_board(board: BoardCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Check role from project_service (need token from request)
-    check_project_permission(board.project_id, current_user["id"], current_user.get("token"))
-    return create_board(db, board)
+# Check several projects at once, returns the set of allowed project ids. Cache misses
+# go to project_service in one POST /projects/members/check call.
+async def allowed_projects_for(project_ids, user_id: int, token: str):
+    project_ids = {project_id for project_id in project_ids if project_id is not None}
+    decisions = {project_id: permission_cache.get(project_id, user_id) for project_id in project_ids}
+    missing = [project_id for project_id, allowed in decisions.items() if allowed is None]
+    if missing:
+        headers = {"Authorization": f"Bearer {token}"}
+        try:
+            status_code, data = await upstreams.request(PROJECT_SERVICE_URL, "POST", "/projects/members/check",
+                                                        json={"user_id": user_id, "project_ids": missing}, headers=headers)
+        except UpstreamUnavailable:
+            raise HTTPException(status_code=503, detail="Project service unavailable")
+        if status_code in (404, 405):
+            # project_service without the batch endpoint: one check per project
+            checks = await asyncio.gather(*(has_project_permission(project_id, user_id, token) for project_id in missing))
+            decisions.update(zip(missing, checks))
+        else:
+            roles = (data or {}).get("roles", {}) if status_code == 200 else {}
+            for project_id in missing:
+                decisions[project_id] = roles.get(str(project_id), {}).get(str(user_id)) in ["owner", "member"]
+                # Only cache definite answers, never upstream errors
+                if status_code == 200:
+                    permission_cache.set(project_id, user_id, decisions[project_id])
+    return {project_id for project_id, allowed in decisions.items() if allowed}
 
-@app.get("/boards/{board_id}", response_model=BoardResponse)
-def get_board_detail(board_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+# Resolve list -> board -> project in one query, returns (list, project_id) (runs in the threadpool)
+def resolve_list(db: Session, list_id: int):
+    row = get_list_ancestry(db, list_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="List not found")
+    db_list, board_id, project_id = row
+    if board_id is None:
+        raise HTTPException(status_code=404, detail="Board not found")
+    return db_list, project_id
+
+# Resolve task -> list -> board -> project in one query, returns (task, project_id) (runs in the threadpool)
+def resolve_task(db: Session, task_id: int, include_archived: bool = False):
+    row = get_task_ancestry(db, task_id, include_archived)
+    if not row:
+        raise HTTPException(status_code=404, detail="Task not found")
+    db_task, list_id, board_id, project_id = row
+    if list_id is None:
+        raise HTTPException(status_code=404, detail="List not found")
+    if board_id is None:
+        raise HTTPException(status_code=404, detail="Board not found")
+    return db_task, project_id
+
+# A task moved to another list must also be allowed in that list's project
+async def check_target_list_permission(db: Session, list_id: int, project_id: int, current_user: dict):
+    _, target_project_id = await run_in_threadpool(resolve_list, db, list_id)
+    if target_project_id != project_id:
+        await check_project_permission(target_project_id, current_user["id"], current_user["token"])
+
+# Renumber lists whose task positions got too close together, after the response is sent
+def rebalance_pending_lists(bind):
+    for list_id in pop_pending_rebalances():
+        with Session(bind=bind) as db:
+            rebalance_task_positions(db, list_id)
+            db.commit()
+
+# Purge a deleted board or list: small ones before the response, big ones right after it
+def start_purge(db: Session, background_tasks: BackgroundTasks, job: PurgeJob):
+    if purge_size(db, job) <= PURGE_INLINE_TASKS:
+        return run_purge_job(db, job.id)
+    background_tasks.add_task(purge_in_background, db.get_bind(), job.id)
+    return job
+
+# The request's session with the caller recorded as the actor of the task activity it writes
+def get_actor_db(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db.info["actor_id"] = current_user["id"]
+    return db
+
+def get_existing_board(db: Session, board_id: int):
     db_board = get_board(db, board_id)
     if not db_board:
         raise HTTPException(status_code=404, detail="Board not found")
-    check_project_permission(db_board.project_id, current_user["id"], current_user.get("token"))
     return db_board
 
+# Called by project_service when a membership changes. The other workers drop their
+# copy when the invalidation reaches them through the event broker.
+@app.post("/permission-cache/invalidate", response_model=dict)
+def invalidate_permission_cache(data: PermissionInvalidate, caller: dict = Depends(get_service_caller)):
+    removed = permission_cache.invalidate(data.project_id, data.user_id)
+    hub.broadcast(PERMISSION_INVALIDATE, {"project_id": data.project_id, "user_id": data.user_id})
+    return {"invalidated": removed}
+
+@app.get("/permission-cache/stats", response_model=dict)
+def get_permission_cache_stats(current_user: dict = Depends(get_current_user)):
+    return permission_cache.stats()
+
+# Write-behind queue of the task activity log: depth, drops and waits under backpressure
+@app.get("/activity/stats", response_model=dict)
+def get_activity_stats(current_user: dict = Depends(get_current_user)):
+    return activity_recorder.stats()
+
+@app.post("/boards", response_model=BoardResponse)
+async def create_new_board(board: BoardCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    # Check role from project_service (need token from request)
+    await check_project_permission(board.project_id, current_user["id"], current_user.get("token"))
+    return await run_in_threadpool(create_board, db, board)
+
+@app.get("/boards/{board_id}", response_model=BoardResponse)
+async def get_board_detail(board_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user.get("token"))
+    return db_board
+
+# Every board of a project with its task counts by status (project overview)
+@app.get("/projects/{project_id}/boards", response_model=list[ProjectBoardSummary])
+async def get_project_boards(project_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    return await run_in_threadpool(get_project_board_stats, db, project_id)
+
+# Boards of a project marked is_template, to clone from
+@app.get("/board-templates", response_model=list[BoardResponse])
+async def get_templates(project_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    return await run_in_threadpool(get_board_templates, db, project_id)
+
+# Copy a board (usually a template) with its lists, tasks, labels and attachments into
+# target_project_id, or into its own project when omitted. One request, one transaction.
+@app.post("/boards/{board_id}/clone", response_model=BoardImportResponse)
+async def clone_board_route(board_id: int, request: Request, background_tasks: BackgroundTasks, target_project_id: int = None,
+                            name: str = Query(None, min_length=1, max_length=255),
+                            current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    if target_project_id is None:
+        target_project_id = db_board.project_id
+    projects = {db_board.project_id, target_project_id}
+    if await allowed_projects_for(projects, current_user["id"], current_user["token"]) != projects:
+        raise HTTPException(status_code=403, detail="Not authorized for this project")
+    result = await run_in_threadpool(clone_board, db, db_board, target_project_id, name, IMPORT_BATCH_SIZE, request.scope.get("root_path", ""))
+    background_tasks.add_task(index_imported_board, db.get_bind(), result["board"].id)
+    return result
+
+# Delete a board with everything on it; 202 with the purge job, done already for small boards
+@app.delete("/boards/{board_id}", response_model=PurgeJobResponse, status_code=202)
+async def delete_board_route(board_id: int, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user.get("token"))
+    job = await run_in_threadpool(delete_board, db, db_board)
+    return await run_in_threadpool(start_purge, db, background_tasks, job)
+
+# Called by project_service's outbox relay once a project is deleted: tombstones its boards
+# and purges them after the response. Called again until it reports done.
+@app.post("/projects/{project_id}/purge", response_model=ProjectPurgeResponse)
+async def purge_project_route(project_id: int, background_tasks: BackgroundTasks, caller: dict = Depends(get_service_caller), db: Session = Depends(get_db)):
+    jobs, new_job_ids = await run_in_threadpool(delete_project_boards, db, project_id)
+    for job in jobs:
+        if job.id in new_job_ids or job.status == "failed":
+            background_tasks.add_task(purge_in_background, db.get_bind(), job.id)
+    pending = sum(1 for job in jobs if job.status != "done")
+    return {"project_id": project_id, "boards": len(jobs), "pending": pending, "rows_deleted": sum(job.rows_deleted for job in jobs), "done": pending == 0}
+
+# A deleted project's task ids, a page at a time, so comment_service can drop their comments
+@app.get("/projects/{project_id}/task-ids", response_model=list[int])
+async def get_project_task_ids_route(project_id: int, after: int = 0, limit: int = Query(1000, ge=1, le=5000),
+                                     caller: dict = Depends(get_service_caller), db: Session = Depends(get_db)):
+    return await run_in_threadpool(get_project_task_ids, db, project_id, after, limit)
+
+@app.get("/purge-jobs/{job_id}", response_model=PurgeJobResponse)
+async def get_purge_job(job_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    job = await run_in_threadpool(db.get, PurgeJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Purge job not found")
+    await check_project_permission(job.project_id, current_user["id"], current_user.get("token"))
+    return job
+
 # Similar for lists, tasks
 @app.post("/lists", response_model=ListResponse)
-def create_new_list(list_: ListCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_board = get_board(db, list_.board_id)
-    if not db_board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    check_project_permission(db_board.project_id, current_user["id"], current_user.get("token"))
-    return create_list(db, list_)
+async def create_new_list(list_: ListCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, list_.board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user.get("token"))
+    return await run_in_threadpool(create_list, db, list_)
 
 @app.post("/tasks", response_model=TaskResponse)
-def create_new_task(task: TaskCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_new_task(task: TaskCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_actor_db)):
     # Check role from list -> board -> project
-    db_list = db.query(List).filter(List.id == task.list_id).first()
-    if not db_list:
-        raise HTTPException(status_code=404, detail="List not found")
-    db_board = get_board(db, db_list.board_id)
-    if not db_board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    check_project_permission(db_board.project_id, current_user["id"], current_user.get("token"))
-    return create_task(db, task)
+    _, project_id = await run_in_threadpool(resolve_list, db, task.list_id)
+    await check_project_permission(project_id, current_user["id"], current_user.get("token"))
+    return await run_in_threadpool(create_task, db, task)
 
 @app.put("/tasks/{task_id}/move", response_model=TaskResponse)
-def move_task_position(task_id: int, move: TaskMove, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    db_list = db.query(List).filter(List.id == db_task.list_id).first()
-    if not db_list:
-        raise HTTPException(status_code=404, detail="List not found")
-    db_board = get_board(db, db_list.board_id)
-    if not db_board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    check_project_permission(db_board.project_id, current_user["id"], current_user.get("token"))
-    return move_task(db, task_id, move)
+async def move_task_position(task_id: int, move: TaskMove, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user), db: Session = Depends(get_actor_db)):
+    db_task, project_id = await run_in_threadpool(resolve_task, db, task_id)
+    await check_project_permission(project_id, current_user["id"], current_user.get("token"))
+    if move.new_list_id != db_task.list_id:
+        await check_target_list_permission(db, move.new_list_id, project_id, current_user)
+    task = await run_in_threadpool(move_task, db, task_id, move, db_task)
+    background_tasks.add_task(rebalance_pending_lists, db.get_bind())
+    return task
 
 @app.post("/tasks/{task_id}/labels", response_model=TaskLabelResponse)
-def add_task_label(task_id: int, label: TaskLabelCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    db_list = db.query(List).filter(List.id == db_task.list_id).first()
-    if not db_list:
-        raise HTTPException(status_code=404, detail="List not found")
-    db_board = get_board(db, db_list.board_id)
-    if not db_board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    check_project_permission(db_board.project_id, current_user["id"], current_user.get("token"))
-    return add_label(db, task_id, label)
+async def add_task_label(task_id: int, label: TaskLabelCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    _, project_id = await run_in_threadpool(resolve_task, db, task_id)
+    await check_project_permission(project_id, current_user["id"], current_user.get("token"))
+    return await run_in_threadpool(add_label, db, task_id, label)
 
 @app.post("/tasks/{task_id}/attachments", response_model=TaskAttachmentResponse)
-def add_task_attachment(task_id: int, attachment: TaskAttachmentCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    db_list = db.query(List).filter(List.id == db_task.list_id).first()
-    if not db_list:
-        raise HTTPException(status_code=404, detail="List not found")
-    db_board = get_board(db, db_list.board_id)
-    if not db_board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    check_project_permission(db_board.project_id, current_user["id"], current_user.get("token"))
-    return add_attachment(db, task_id, attachment)
+async def add_task_attachment(task_id: int, attachment: TaskAttachmentCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    _, project_id = await run_in_threadpool(resolve_task, db, task_id)
+    await check_project_permission(project_id, current_user["id"], current_user.get("token"))
+    return await run_in_threadpool(add_attachment, db, task_id, attachment)
+
+# Upload a file as the raw request body, e.g. curl --data-binary @report.pdf ...?filename=report.pdf.
+# The body is streamed to the content store, never held in memory as a whole.
+@app.post("/tasks/{task_id}/attachments/upload", response_model=TaskAttachmentResponse)
+async def upload_task_attachment(task_id: int, request: Request, filename: str = Query(..., min_length=1, max_length=255),
+                                 current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    _, project_id = await run_in_threadpool(resolve_task, db, task_id)
+    await check_project_permission(project_id, current_user["id"], current_user.get("token"))
+    declared_size = request.headers.get("content-length", "")
+    if declared_size.isdigit() and int(declared_size) > attachment_store.max_bytes:
+        raise HTTPException(status_code=413, detail="Attachment too large")
+    await run_in_threadpool(db.close)  # Don't hold a pooled connection while the body arrives
+    try:
+        digest, size = await attachment_store.save(request.stream())
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="Attachment too large")
+    filename = filename.replace("\\", "/").rsplit("/", 1)[-1] or "attachment"
+    content_type = upload_content_type(request.headers.get("content-type"), filename)
+    await run_in_threadpool(resolve_task, db, task_id)  # The task may have been deleted meanwhile
+    return await run_in_threadpool(add_stored_attachment, db, task_id, filename, size, digest, content_type, request.scope.get("root_path", ""))
+
+# Download an uploaded attachment; supports Range and If-None-Match
+@app.get("/attachments/{attachment_id}/content")
+async def get_attachment_content(attachment_id: int, request: Request, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    row = await run_in_threadpool(get_attachment_ancestry, db, attachment_id)
+    if not row or row[1] is None:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    attachment, project_id = row
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    if attachment.sha256 is None:
+        raise HTTPException(status_code=404, detail="Attachment is a link, not an uploaded file")
+    if not valid_digest(attachment.sha256):
+        raise HTTPException(status_code=404, detail="Attachment file not found")
+    return blob_response(request, attachment_store, attachment.sha256, attachment.size, attachment.content_type, attachment.filename)
+
+# Add to importer.blob_digests the files that attachment records in `records` may keep:
+# stored here and attached in a project the caller can read. `checked` holds digests seen before.
+async def add_readable_blobs(db: Session, importer: BoardImporter, records, checked: set, current_user: dict):
+    digests = {record["data"].get("sha256") for _, record in records if record.get("type") == "attachment"}
+    digests = {digest for digest in digests if valid_digest(digest) and digest not in checked}
+    if not digests:
+        return
+    checked |= digests
+    projects = await run_in_threadpool(get_digest_project_ids, db, digests)
+    allowed = await allowed_projects_for(set().union(*projects.values()), current_user["id"], current_user["token"])
+    for digest, project_ids in projects.items():
+        if project_ids & allowed and await run_in_threadpool(attachment_store.exists, digest):
+            importer.blob_digests.add(digest)
+
+# Whole board as NDJSON (see transfer.py), streamed with constant memory
+@app.get("/boards/{board_id}/export")
+async def export_board_route(board_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
+    bind = db.get_bind()
+    await run_in_threadpool(db.close)  # The export reads in its own session
+    headers = {"Content-Disposition": f'attachment; filename="board-{board_id}.ndjson"'}
+    return StreamingResponse(export_board(bind, board_id), media_type="application/x-ndjson", headers=headers)
+
+# Create a board from an NDJSON export sent as the raw request body. The board goes to
+# project_id, or to the exported board's project when omitted. All or nothing.
+@app.post("/boards/import", response_model=BoardImportResponse)
+async def import_board_route(request: Request, background_tasks: BackgroundTasks, project_id: int = None, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    records = ndjson_records(request.stream())
+    try:
+        try:
+            line_number, header = await anext(records)
+        except StopAsyncIteration:
+            raise ImportFailed("Empty import")
+        if project_id is None:
+            project_id = header["data"].get("project_id")
+            if not isinstance(project_id, int):
+                raise ImportFailed("Line 1: project_id is required")
+        await check_project_permission(project_id, current_user["id"], current_user["token"])
+        importer = BoardImporter(db, project_id, IMPORT_BATCH_SIZE, request.scope.get("root_path", ""))
+        importer.blob_digests, checked = set(), set()
+        await run_in_threadpool(importer.start, line_number, header)
+        batch = []
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await add_readable_blobs(db, importer, batch, checked, current_user)
+                await run_in_threadpool(importer.add, batch)
+                batch = []
+        await add_readable_blobs(db, importer, batch, checked, current_user)
+        result = await run_in_threadpool(importer.finish, batch)
+        background_tasks.add_task(index_imported_board, db.get_bind(), result["board"].id)
+        return result
+    except (ImportFailed, IntegrityError) as exc:
+        await run_in_threadpool(db.rollback)
+        detail = str(exc) if isinstance(exc, ImportFailed) else "Import conflicts with existing rows"
+        raise HTTPException(status_code=422, detail=detail)
 
 # Get lists by board
 @app.get("/boards/{board_id}/lists", response_model=list[ListResponse])
-def get_lists(board_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_board = get_board(db, board_id)
-    if not db_board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
-    return get_lists_by_board(db, board_id)
+async def get_lists(board_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
+    return await run_in_threadpool(get_lists_by_board, db, board_id)
+
+# Whole board in one call: lists, tasks, labels and attachments, one permission check
+@app.get("/boards/{board_id}/full", response_model=BoardFullResponse)
+async def get_board_full_detail(board_id: int, include_archived: bool = False, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
+    return await run_in_threadpool(get_board_full, db, db_board, include_archived)
+
+# Task counts by status, priority and assignee, plus overdue tasks
+@app.get("/boards/{board_id}/stats", response_model=BoardStatsResponse)
+async def get_stats(board_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
+    return await run_in_threadpool(get_board_stats, db, board_id)
 
-# Get tasks by list
+# Ranked task search over every project the caller can access (or just `project_id`)
+@app.get("/search/tasks", response_model=list[TaskSearchResult])
+async def search(q: str, response: Response, project_id: int = None,
+                 limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE), cursor: str = None,
+                 current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    terms = query_terms(q)
+    if not terms:
+        raise HTTPException(status_code=422, detail="Query has no searchable terms")
+    after = None
+    if cursor:
+        score, task_id = decode_cursor(cursor, 2)
+        if not isinstance(score, (int, float)) or not isinstance(task_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = (score, task_id)
+
+    def plan(db):
+        frequencies = document_frequencies(db, terms)
+        rarest = min(terms, key=frequencies.get)
+        return frequencies, ([] if frequencies[rarest] == 0 else projects_with_term(db, rarest))
+
+    frequencies, project_ids = await run_in_threadpool(plan, db)
+    if project_id is not None:
+        project_ids = [project_id] if project_id in project_ids else []
+    if len(project_ids) > SEARCH_MAX_PROJECTS:
+        raise HTTPException(status_code=422, detail="Query matches too many projects, narrow it with project_id")
+    allowed = await allowed_projects_for(project_ids, current_user["id"], current_user["token"])
+    results = await run_in_threadpool(search_tasks, db, terms, frequencies, sorted(allowed), limit + 1, after)
+    results, has_more = split_page(results, limit)
+    if has_more:
+        last_task, last_score = results[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last_score, last_task.id)
+    return [dict(TaskResponse.model_validate(task).model_dump(), score=score) for task, score in results]
+
+# Everything that changed on a board after version `since`; a full snapshot when `since`
+# is older than the compacted part of the log
+@app.get("/boards/{board_id}/changes", response_model=BoardChangesResponse)
+async def get_changes(board_id: int, since: int = Query(..., ge=0), current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
+    if since < db_board.changes_horizon or since > db_board.version:
+        snapshot = await run_in_threadpool(get_board_full, db, db_board)
+        return {"board_id": board_id, "version": db_board.version, "full": True, "snapshot": snapshot}
+    return await run_in_threadpool(get_board_changes, db, db_board, since)
+
+# The board's label dictionary with task counts
+@app.get("/boards/{board_id}/labels", response_model=list[BoardLabelResponse])
+async def get_labels(board_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
+    return await run_in_threadpool(get_board_labels, db, board_id)
+
+# Tasks of a board carrying all (match=all) or any (match=any) of comma-separated labels, by task id
+@app.get("/boards/{board_id}/tasks", response_model=list[TaskResponse])
+async def get_tasks_by_labels(board_id: int, labels: str, response: Response, match: Literal["all", "any"] = "all",
+                              limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str = None,
+                              current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    names = [name for name in labels.split(",") if name.strip()]
+    if not names:
+        raise HTTPException(status_code=422, detail="No labels given")
+    after_id = None
+    if cursor:
+        (after_id,) = decode_cursor(cursor, 1)
+        if not isinstance(after_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
+    tasks, next_after = await run_in_threadpool(get_board_tasks_by_labels, db, board_id, names, match, limit, after_id)
+    if next_after is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_after)
+    return tasks
+
+# Server-sent events for one subscription; ends after a resync notice
+async def board_event_stream(request: Request, subscription):
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), EVENT_HEARTBEAT)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+            event_id = f"id: {event['version']}\n" if "version" in event else ""
+            yield f"{event_id}event: {event['type']}\ndata: {json.dumps(event.get('data'), separators=(',', ':'))}\n\n"
+            if event is RESYNC:
+                break
+    finally:
+        hub.unsubscribe(subscription)
+
+# Live feed of committed changes on a board. Permission is checked once, when the feed opens.
+# After a resync event the client should reload the board and reconnect.
+@app.get("/boards/{board_id}/events")
+async def board_events(board_id: int, request: Request, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_board = await run_in_threadpool(get_existing_board, db, board_id)
+    await check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
+    await run_in_threadpool(db.close)  # Don't hold a pooled connection for the life of the stream
+    subscription = hub.subscribe(board_id)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(board_event_stream(request, subscription), media_type="text/event-stream", headers=headers)
+
+# Get tasks by list, one page at a time. The cursor for the next page is returned in
+# the X-Next-Cursor header; it is absent on the last page.
 @app.get("/lists/{list_id}/tasks", response_model=list[TaskResponse])
-def get_tasks(list_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_list = db.query(List).filter(List.id == list_id).first()
-    if not db_list:
-        raise HTTPException(status_code=404, detail="List not found")
-    db_board = get_board(db, db_list.board_id)
-    check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
-    return get_tasks_by_list(db, list_id)
+async def get_tasks(list_id: int, response: Response,
+                    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str = None,
+                    status: str = None, priority: str = None, assignee_id: int = None,
+                    due_after: datetime = None, due_before: datetime = None, include_archived: bool = False,
+                    current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    after = None
+    if cursor:
+        position, task_id = decode_cursor(cursor, 2)
+        if not isinstance(position, (int, float)) or not isinstance(task_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = (position, task_id)
+    _, project_id = await run_in_threadpool(resolve_list, db, list_id)
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    tasks = await run_in_threadpool(get_tasks_by_list, db, list_id, limit + 1, after, status, priority,
+                                    assignee_id, due_after, due_before, include_archived)
+    tasks, has_more = split_page(tasks, limit)
+    if has_more:
+        response.headers["X-Next-Cursor"] = encode_cursor(tasks[-1].position, tasks[-1].id)
+    return tasks
+
+# A user's open tasks with a deadline, across every board they can still access,
+# soonest first; the X-Next-Cursor header carries the next page
+@app.get("/users/{user_id}/due", response_model=list[TaskResponse])
+async def get_user_due_tasks(user_id: int, response: Response, include_overdue: bool = False, before: datetime = None,
+                             limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str = None,
+                             current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    if user_id != current_user["id"]:
+        raise HTTPException(status_code=403, detail="Not authorized for this user")
+    after = None
+    if cursor:
+        due_date, task_id = decode_cursor(cursor, 2)
+        try:
+            after = (datetime.fromisoformat(due_date), task_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if not isinstance(task_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    project_ids = await run_in_threadpool(get_assignee_project_ids, db, user_id, True)
+    allowed = await allowed_projects_for(project_ids, current_user["id"], current_user["token"])
+    tasks = await run_in_threadpool(get_due_tasks, db, user_id, sorted(allowed), datetime.utcnow(), include_overdue, before, limit + 1, after)
+    tasks, has_more = split_page(tasks, limit)
+    if has_more:
+        response.headers["X-Next-Cursor"] = encode_cursor(tasks[-1].due_date.isoformat(), tasks[-1].id)
+    return tasks
+
+# The caller's tasks across every board they can still access: dated ones by deadline, then
+# undated ones; the X-Next-Cursor header carries the next page
+@app.get("/me/tasks", response_model=list[AssignedTaskResponse])
+async def get_my_tasks(response: Response, status: list[str] = Query(None), due_after: datetime = None, due_before: datetime = None,
+                       limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str = None,
+                       current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    after = None
+    if cursor:
+        due_date, task_id = decode_cursor(cursor, 2)
+        if not isinstance(task_id, int) or not isinstance(due_date, (str, type(None))):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        try:
+            after = (None if due_date is None else datetime.fromisoformat(due_date), task_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    user_id = current_user["id"]
+    # One permission lookup per project the caller has tasks in, not per board
+    project_ids = await run_in_threadpool(get_assignee_project_ids, db, user_id)
+    allowed = await allowed_projects_for(project_ids, user_id, current_user["token"])
+    rows = await run_in_threadpool(get_assignee_tasks, db, user_id, sorted(allowed), status, due_after, due_before, limit + 1, after)
+    rows, has_more = split_page(rows, limit)
+    if has_more:
+        last_task = rows[-1][0]
+        response.headers["X-Next-Cursor"] = encode_cursor(last_task.due_date and last_task.due_date.isoformat(), last_task.id)
+    return [dict(TaskResponse.model_validate(task).model_dump(), board_id=board_id, project_id=project_id)
+            for task, board_id, project_id in rows]
+
+# Apply many task operations at once: one permission check per project, one transaction
+@app.post("/tasks/batch", response_model=TaskBatchResponse)
+async def batch_tasks(batch: TaskBatchRequest, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user), db: Session = Depends(get_actor_db)):
+    tasks, list_projects = await run_in_threadpool(resolve_task_batch, db, batch.operations)
+    project_ids = [project_id for _, project_id in tasks.values()] + list(list_projects.values())
+    allowed = await allowed_projects_for(project_ids, current_user["id"], current_user["token"])
+    results = await run_in_threadpool(apply_task_batch, db, batch.operations, tasks, list_projects, allowed)
+    background_tasks.add_task(rebalance_pending_lists, db.get_bind())
+    return {"results": results}
 
 # Assign task to user
 @app.put("/tasks/{task_id}/assign/{user_id}", response_model=TaskResponse)
-def assign_task_to_user(task_id: int, user_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    db_list = db.query(List).filter(List.id == db_task.list_id).first()
-    db_board = get_board(db, db_list.board_id)
-    check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
-    task = assign_task(db, task_id, user_id)
+async def assign_task_to_user(task_id: int, user_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_actor_db)):
+    db_task, project_id = await run_in_threadpool(resolve_task, db, task_id)
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    task = await run_in_threadpool(assign_task, db, task_id, user_id, db_task)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found or assign failed")
     return task
 
 # Update list
 @app.patch("/lists/{list_id}", response_model=ListResponse)
-def update_list_route(list_id: int, update_data: dict, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_list = db.query(List).filter(List.id == list_id).first()
-    if not db_list:
-        raise HTTPException(status_code=404, detail="List not found")
-    db_board = get_board(db, db_list.board_id)
-    check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
-    list_ = update_list(db, list_id, update_data)
+async def update_list_route(list_id: int, update_data: dict, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_list, project_id = await run_in_threadpool(resolve_list, db, list_id)
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    list_ = await run_in_threadpool(update_list, db, list_id, update_data, db_list)
     if not list_:
         raise HTTPException(status_code=404, detail="List not found or update failed")
     return list_
 
 # Delete list
 @app.delete("/lists/{list_id}", response_model=dict)
-def delete_list_route(list_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_list = db.query(List).filter(List.id == list_id).first()
-    if not db_list:
-        raise HTTPException(status_code=404, detail="List not found")
-    db_board = get_board(db, db_list.board_id)
-    check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
-    result = delete_list(db, list_id)
-    if not result:
+async def delete_list_route(list_id: int, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_list, project_id = await run_in_threadpool(resolve_list, db, list_id)
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    job = await run_in_threadpool(delete_list, db, list_id, db_list, project_id)
+    if not job:
         raise HTTPException(status_code=404, detail="List not found or delete failed")
-    return {"detail": "List deleted"}
+    job = await run_in_threadpool(start_purge, db, background_tasks, job)
+    return {"detail": "List deleted", "job_id": job.id, "status": job.status}
 
 # Update task
 @app.patch("/tasks/{task_id}", response_model=TaskResponse)
-def update_task_route(task_id: int, update_data: dict, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    db_list = db.query(List).filter(List.id == db_task.list_id).first()
-    db_board = get_board(db, db_list.board_id)
-    check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
-    task = update_task(db, task_id, update_data)
+async def update_task_route(task_id: int, update_data: dict, current_user: dict = Depends(get_current_user), db: Session = Depends(get_actor_db)):
+    db_task, project_id = await run_in_threadpool(resolve_task, db, task_id)
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    if update_data.get("list_id") not in (None, db_task.list_id):
+        await check_target_list_permission(db, update_data["list_id"], project_id, current_user)
+    task = await run_in_threadpool(update_task, db, task_id, update_data, db_task)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found or update failed")
     return task
 
 # Delete task
 @app.delete("/tasks/{task_id}", response_model=dict)
-def delete_task_route(task_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    db_list = db.query(List).filter(List.id == db_task.list_id).first()
-    db_board = get_board(db, db_list.board_id)
-    check_project_permission(db_board.project_id, current_user["id"], current_user["token"])
-    result = delete_task(db, task_id)
+async def delete_task_route(task_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_actor_db)):
+    db_task, project_id = await run_in_threadpool(resolve_task, db, task_id)
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    result = await run_in_threadpool(delete_task, db, task_id, db_task)
     if not result:
         raise HTTPException(status_code=404, detail="Task not found or delete failed")
-    return {"detail": "Task deleted"}
\ No newline at end of file
+    return {"detail": "Task deleted"}
+
+# Who changed a task and how, newest first; the X-Next-Cursor header carries the next page.
+# Entries are written behind the request, so the latest change can take a moment to appear.
+@app.get("/tasks/{task_id}/history", response_model=list[TaskActivityResponse])
+async def get_task_history_route(task_id: int, response: Response, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                                 cursor: str = None, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    before_id = None
+    if cursor:
+        (before_id,) = decode_cursor(cursor, 1)
+        if not isinstance(before_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    _, project_id = await run_in_threadpool(resolve_task, db, task_id)
+    await check_project_permission(project_id, current_user["id"], current_user["token"])
+    entries = await run_in_threadpool(get_task_history, db, task_id, limit + 1, before_id)
+    entries, has_more = split_page(entries, limit)
+    if has_more:
+        response.headers["X-Next-Cursor"] = encode_cursor(entries[-1].id)
+    return entries
+
+# Used by comment_service to check access to a task, with the user's own token (or a service token)
+@app.get("/tasks/{task_id}/permission/{user_id}", response_model=dict)
+async def get_task_permission(task_id: int, user_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    own = user_id == current_user["id"]
+    if not own and not current_user["service"]:
+        raise HTTPException(status_code=403, detail="Can only check your own permission")
+    # Archived tasks too, their comments stay readable
+    _, project_id = await run_in_threadpool(resolve_task, db, task_id, True)
+    await check_project_permission(project_id, user_id, current_user["token"], cache=own)
+    return {"task_id": task_id, "project_id": project_id, "allowed": True}
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, Boolean, String, Text, DateTime, ForeignKey, Double, Index, UniqueConstraint, JSON
+from sqlalchemy.dialects import mysql
 from .database import Base
 from datetime import datetime
 
@@ -8,6 +9,14 @@ class Board(Base):
     project_id = Column(Integer, nullable=False)  # Từ project_db, không ForeignKey
     name = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped once per committed change, see changes.py
+    changes_horizon = Column(Integer, nullable=False, default=0, server_default="0")  # Changes up to this version were compacted away
+    deleted_at = Column(DateTime, nullable=True)  # Tombstone: hidden from reads until purged, see purge.py
+    is_template = Column(Boolean, nullable=False, default=False, server_default="0")  # Starting point for POST /boards/{id}/clone
+
+    __table_args__ = (
+        Index("ix_boards_project_id_is_template", "project_id", "is_template"),  # GET /board-templates
+    )
 
 class List(Base):
     __tablename__ = "lists"
@@ -15,6 +24,7 @@ class List(Base):
     board_id = Column(Integer, ForeignKey("boards.id"), nullable=False)
     name = Column(String(255), nullable=False)
     position = Column(Integer, default=0)  # To sort
+    deleted_at = Column(DateTime, nullable=True)  # Set on delete; the list and its tasks are purged later
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -27,16 +37,172 @@ class Task(Base):
     status = Column(String(50), default='todo')
     due_date = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
+    position = Column(Double, nullable=False, default=0, server_default="0")  # Fractional, see ordering.py
+    completed_at = Column(DateTime, nullable=True)  # When the task last became done; old done tasks are archived
+
+    __table_args__ = (
+        Index("ix_tasks_list_id_position", "list_id", "position"),
+        # Filtered list pages: equality filter first, then the (position, id) keyset
+        Index("ix_tasks_list_id_status_position", "list_id", "status", "position"),
+        Index("ix_tasks_list_id_priority_position", "list_id", "priority", "position"),
+        Index("ix_tasks_list_id_assignee_id_position", "list_id", "assignee_id", "position"),
+        Index("ix_tasks_list_id_due_date_status", "list_id", "due_date", "status"),  # Covers overdue counts
+        Index("ix_tasks_due_date", "due_date"),  # Reminder scheduler window scans
+        Index("ix_tasks_assignee_id_due_date", "assignee_id", "due_date"),  # A user's upcoming tasks
+        Index("ix_tasks_assignee_id_status_due_date", "assignee_id", "status", "due_date"),  # GET /me/tasks
+        Index("ix_tasks_status_completed_at", "status", "completed_at"),  # Archive job scans
+    )
+
+# Per-board label dictionary; task_labels point at it by id
+class BoardLabel(Base):
+    __tablename__ = "board_labels"
+    id = Column(Integer, primary_key=True, index=True)
+    board_id = Column(Integer, ForeignKey("boards.id"), nullable=False)
+    name = Column(String(100), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("board_id", "name", name="uq_board_labels_board_id_name"),
+    )
 
 class TaskLabel(Base):
     __tablename__ = "task_labels"
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
-    label = Column(String(100), nullable=False)
+    label = Column(String(100), nullable=False)  # Copy of board_labels.name
+    label_id = Column(Integer, ForeignKey("board_labels.id"))
+
+    __table_args__ = (
+        UniqueConstraint("task_id", "label_id", name="uq_task_labels_task_id_label_id"),
+        Index("ix_task_labels_label_id_task_id", "label_id", "task_id"),
+    )
 
 class TaskAttachment(Base):
     __tablename__ = "task_attachments"
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
     file_url = Column(String(512), nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    # Set for files uploaded to this service (see storage.py), NULL for plain links
+    filename = Column(String(255), nullable=True)
+    size = Column(BigInteger, nullable=True)
+    sha256 = Column(String(64), nullable=True, index=True)
+    content_type = Column(String(255), nullable=True)
+
+# Per-board task counts kept in step with task writes, see stats.py.
+# dimension is 'status', 'priority' or 'assignee_id'; NULL values are stored as ''.
+class BoardTaskStat(Base):
+    __tablename__ = "board_task_stats"
+    board_id = Column(Integer, ForeignKey("boards.id"), primary_key=True)
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(50), primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+
+# Inverted index for task search, see search.py. Terms are already case- and
+# accent-folded, so they are compared as binary strings on MariaDB.
+class TaskSearchTerm(Base):
+    __tablename__ = "task_search_terms"
+    term = Column(String(50).with_variant(mysql.VARCHAR(50, collation="utf8mb4_bin"), "mysql", "mariadb"), primary_key=True)
+    project_id = Column(Integer, primary_key=True)  # Search checks permissions per project
+    task_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
+    weight = Column(Integer, nullable=False)  # Term frequency, title occurrences count TITLE_WEIGHT times
+
+    __table_args__ = (
+        Index("ix_task_search_terms_task_id", "task_id"),
+    )
+
+# Append-only log of board changes, one row per changed entity and version
+class BoardChange(Base):
+    __tablename__ = "board_changes"
+    id = Column(Integer, primary_key=True)
+    board_id = Column(Integer, ForeignKey("boards.id"), nullable=False)
+    version = Column(Integer, nullable=False)
+    entity = Column(String(20), nullable=False)  # 'list', 'task', 'label' or 'attachment'
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)  # 'upsert' or 'delete'
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_board_changes_board_id_version", "board_id", "version"),
+        Index("ix_board_changes_board_id_entity", "board_id", "entity", "entity_id", "version"),
+    )
+
+# Reminders already sent, one row per (task, kind, deadline). Inserting the row is the claim
+# that makes a reminder fire once, even with several schedulers (see reminders.py).
+class TaskReminder(Base):
+    __tablename__ = "task_reminders"
+    task_id = Column(Integer, primary_key=True)  # No ForeignKey; deleted along with the task (purge.delete_task_rows)
+    kind = Column(String(20), primary_key=True)  # 'due_soon' or 'overdue'
+    due_date = Column(DateTime, primary_key=True)  # The deadline it was sent for; a new due date gets new reminders
+    sent_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+# A deleted board or list whose rows are being removed in the background (see purge.py)
+class PurgeJob(Base):
+    __tablename__ = "purge_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String(10), nullable=False)  # 'board' or 'list'
+    entity_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, nullable=False)  # For permission checks once the board is gone
+    status = Column(String(10), nullable=False, default="pending")  # 'pending', 'running', 'done' or 'failed'
+    rows_deleted = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_purge_jobs_status", "status"),
+    )
+
+# Append-only history of task writes, filled behind the request (see activity.py)
+class TaskActivity(Base):
+    __tablename__ = "task_activity"
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)  # No ForeignKey: the history of a deleted task stays until retention
+    board_id = Column(Integer, nullable=True)
+    actor_id = Column(Integer, nullable=True)  # User who made the change, None for background jobs
+    action = Column(String(20), nullable=False)  # 'created', 'updated', 'moved', 'assigned' or 'deleted'
+    changes = Column(JSON, nullable=False)  # {field: [old, new]}; the task's fields on create and delete
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_task_activity_task_id_id", "task_id", "id"),  # History pages, newest first
+        Index("ix_task_activity_created_at", "created_at"),  # Retention
+    )
+
+# Cold copies of tasks done for longer than TASK_ARCHIVE_AGE_DAYS, with their labels and
+# attachments (see archive.py). Rows keep their ids; reads include them only on request.
+# No ForeignKeys: the rows are purged along with their list (purge.py).
+class TaskArchive(Base):
+    __tablename__ = "tasks_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    list_id = Column(Integer, nullable=False)
+    title = Column(String(255), nullable=False)
+    description = Column(Text)
+    assignee_id = Column(Integer)
+    priority = Column(String(50))
+    status = Column(String(50))
+    due_date = Column(DateTime)
+    created_at = Column(DateTime)
+    position = Column(Double, nullable=False)
+    completed_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_tasks_archive_list_id_position", "list_id", "position"),
+    )
+
+class TaskLabelArchive(Base):
+    __tablename__ = "task_labels_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    task_id = Column(Integer, nullable=False, index=True)
+    label = Column(String(100), nullable=False)
+    label_id = Column(Integer)
+
+class TaskAttachmentArchive(Base):
+    __tablename__ = "task_attachments_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    task_id = Column(Integer, nullable=False, index=True)
+    file_url = Column(String(512), nullable=False)
+    uploaded_at = Column(DateTime)
+    filename = Column(String(255), nullable=True)
+    size = Column(BigInteger, nullable=True)
+    sha256 = Column(String(64), nullable=True)
+    content_type = Column(String(255), nullable=True)
@@ -0,0 +1,42 @@
+import threading
+
+# Tasks are ordered inside a list by a fractional position (a DOUBLE). Moving a task
+# only rewrites that task: it takes the midpoint of its new neighbours. When two
+# neighbours get too close for doubles to split, or positions drift too far from
+# zero, the list is renumbered in the background.
+POSITION_STEP = 1024.0
+MIN_POSITION_GAP = 1e-6
+MAX_POSITION = 1e12
+
+_pending_lists = set()
+_pending_lock = threading.Lock()
+
+# Position between two neighbours; None means there is no neighbour on that side
+def position_between(before, after):
+    if before is None and after is None:
+        return POSITION_STEP
+    if before is None:
+        return after - POSITION_STEP
+    if after is None:
+        return before + POSITION_STEP
+    return (before + after) / 2
+
+# True when the midpoint can't be told apart from its neighbours (or they collide)
+def is_exhausted(before, after, position):
+    return (before is not None and position <= before) or (after is not None and position >= after)
+
+# True when the list should be renumbered soon, though this position is still usable
+def needs_rebalance(before, after, position):
+    if abs(position) > MAX_POSITION:
+        return True
+    return before is not None and after is not None and after - before < MIN_POSITION_GAP
+
+def request_rebalance(list_id: int):
+    with _pending_lock:
+        _pending_lists.add(list_id)
+
+def pop_pending_rebalances():
+    with _pending_lock:
+        pending = list(_pending_lists)
+        _pending_lists.clear()
+    return pending
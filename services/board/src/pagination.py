@@ -0,0 +1,27 @@
+import base64
+import binascii
+import json
+from fastapi import HTTPException
+
+# Keyset cursors are the sort key of the last row on a page, serialized as opaque
+# URL-safe base64 JSON. The next page starts strictly after that key.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+# Trim the extra row fetched to detect a following page; returns (rows, has_more)
+def split_page(rows: list, limit: int):
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+PERMISSION_CACHE_TTL = float(os.getenv("PERMISSION_CACHE_TTL", "30"))
+PERMISSION_CACHE_NEGATIVE_TTL = float(os.getenv("PERMISSION_CACHE_NEGATIVE_TTL", "5"))
+PERMISSION_CACHE_MAX_ENTRIES = int(os.getenv("PERMISSION_CACHE_MAX_ENTRIES", "10000"))
+
+class PermissionCache:
+    """LRU + TTL cache of project permission decisions keyed by (project_id, user_id).
+
+    Grants and denials are both cached; denials get a shorter TTL so a freshly
+    invited member is not locked out for long. The cache is per process: an
+    invalidation received by one uvicorn worker reaches the others through the
+    event broker (see /permission-cache/invalidate). A worker clears its cache when
+    it reconnects to the broker; while the broker is down, the TTL bounds how stale
+    the other workers can be.
+    """
+
+    def __init__(self, ttl: float = PERMISSION_CACHE_TTL, negative_ttl: float = PERMISSION_CACHE_NEGATIVE_TTL,
+                 max_entries: int = PERMISSION_CACHE_MAX_ENTRIES, clock=time.monotonic):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # (project_id, user_id) -> (allowed, expires_at)
+        self._by_project = {}  # project_id -> set of user_ids, for project-wide invalidation
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, project_id: int, user_id: int):
+        """Return the cached decision (True/False) or None on a miss."""
+        key = (project_id, user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            allowed, expires_at = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return allowed
+
+    def set(self, project_id: int, user_id: int, allowed: bool):
+        key = (project_id, user_id)
+        ttl = self.ttl if allowed else self.negative_ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (allowed, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            self._by_project.setdefault(project_id, set()).add(user_id)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, project_id: int, user_id=None):
+        """Drop one member's decision, or every decision for the project when user_id is None."""
+        with self._lock:
+            if user_id is None:
+                keys = [(project_id, uid) for uid in self._by_project.get(project_id, ())]
+            else:
+                keys = [(project_id, user_id)]
+            removed = 0
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+            return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_project.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key):
+        del self._entries[key]
+        project_id, user_id = key
+        users = self._by_project.get(project_id)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del self._by_project[project_id]
+
+permission_cache = PermissionCache()
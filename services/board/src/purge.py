@@ -0,0 +1,102 @@
+import os
+from datetime import datetime
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import Session
+from .models import (Board, List, Task, TaskLabel, TaskAttachment, TaskSearchTerm, TaskReminder, BoardLabel, BoardTaskStat, BoardChange, PurgeJob,
+                     TaskArchive, TaskLabelArchive, TaskAttachmentArchive)
+
+# Deleting a board or list only sets its deleted_at and queues a PurgeJob: reads skip
+# tombstoned rows at once, and the rows underneath go in set-based DELETEs, PURGE_CHUNK_SIZE
+# tasks (with their labels, attachments and search postings) per transaction. Small deletes
+# are purged before the response; bigger ones after it, and `python -m src.jobs purge-deleted`
+# finishes any job a restart interrupted.
+PURGE_CHUNK_SIZE = int(os.getenv("PURGE_CHUNK_SIZE", "1000"))
+PURGE_INLINE_TASKS = int(os.getenv("PURGE_INLINE_TASKS", "1000"))  # Purge within the request up to this many tasks
+
+# Rows hanging off tasks, deleted before the tasks themselves
+TASK_CHILDREN = (TaskSearchTerm, TaskLabel, TaskAttachment, TaskReminder)
+ARCHIVED_TASK_CHILDREN = (TaskLabelArchive, TaskAttachmentArchive)
+
+# Delete tasks and everything that points at them; returns the number of rows deleted
+def delete_task_rows(db: Session, task_ids):
+    task_ids = list(task_ids)
+    if not task_ids:
+        return 0
+    deleted = sum(db.execute(delete(model).where(model.task_id.in_(task_ids))).rowcount for model in TASK_CHILDREN)
+    return deleted + db.execute(delete(Task).where(Task.id.in_(task_ids))).rowcount
+
+# Same for archived tasks (see archive.py)
+def delete_archived_task_rows(db: Session, task_ids):
+    task_ids = list(task_ids)
+    if not task_ids:
+        return 0
+    deleted = sum(db.execute(delete(model).where(model.task_id.in_(task_ids))).rowcount for model in ARCHIVED_TASK_CHILDREN)
+    return deleted + db.execute(delete(TaskArchive).where(TaskArchive.id.in_(task_ids))).rowcount
+
+def _job_list_ids(db: Session, job: PurgeJob):
+    if job.entity == "list":
+        return [job.entity_id]
+    return db.scalars(select(List.id).where(List.board_id == job.entity_id)).all()
+
+# Tasks (hot and archived) a job still has to delete
+def purge_size(db: Session, job: PurgeJob):
+    list_ids = _job_list_ids(db, job)
+    if not list_ids:
+        return 0
+    return sum(db.scalar(select(func.count()).select_from(model).where(model.list_id.in_(list_ids))) for model in (Task, TaskArchive))
+
+def _delete_chunked(db: Session, model, condition, chunk: int):
+    deleted = 0
+    while ids := db.scalars(select(model.id).where(condition).limit(chunk)).all():
+        deleted += db.execute(delete(model).where(model.id.in_(ids))).rowcount
+        db.commit()
+    return deleted
+
+# Run (or resume) a purge job, one committed chunk at a time
+def run_purge_job(db: Session, job_id: int, chunk: int = None):
+    chunk = chunk or PURGE_CHUNK_SIZE
+    job = db.get(PurgeJob, job_id)
+    if job is None or job.status == "done":
+        return job
+    job.status = "running"
+    db.commit()
+    try:
+        list_ids = _job_list_ids(db, job)
+        for model, delete_rows in ((Task, delete_task_rows), (TaskArchive, delete_archived_task_rows)):
+            while list_ids:
+                task_ids = db.scalars(select(model.id).where(model.list_id.in_(list_ids)).limit(chunk)).all()
+                if not task_ids:
+                    break
+                job.rows_deleted += delete_rows(db, task_ids)
+                db.commit()
+        if job.entity == "board":
+            job.rows_deleted += _delete_chunked(db, BoardChange, BoardChange.board_id == job.entity_id, chunk)
+            for model in (BoardLabel, BoardTaskStat, List):
+                job.rows_deleted += db.execute(delete(model).where(model.board_id == job.entity_id)).rowcount
+            job.rows_deleted += db.execute(delete(Board).where(Board.id == job.entity_id)).rowcount
+        else:
+            job.rows_deleted += db.execute(delete(List).where(List.id == job.entity_id)).rowcount
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    except Exception:
+        db.rollback()
+        job.status = "failed"
+        db.commit()
+        raise
+    return job
+
+# Purge after the response, in a session of its own
+def purge_in_background(bind, job_id: int):
+    with Session(bind=bind) as db:
+        try:
+            run_purge_job(db, job_id)
+        except Exception as exc:
+            print(f"[WARN] - purge job {job_id} failed: {exc!r}", flush=True)
+
+# Jobs not done yet (a restart or an error stopped them); returns how many were finished
+def run_unfinished_purge_jobs(db: Session):
+    job_ids = db.scalars(select(PurgeJob.id).where(PurgeJob.status != "done").order_by(PurgeJob.id)).all()
+    for job_id in job_ids:
+        run_purge_job(db, job_id)
+    return len(job_ids)
@@ -0,0 +1,200 @@
+import asyncio
+import heapq
+import os
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, func, or_, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .models import Board, List, Task, TaskReminder, BoardChange
+from .stats import DONE_STATUSES
+from .events import hub, emit, EVENT_BROKER_URL
+from .crud import list_board_ids
+
+# Due-date reminders, run as their own process:
+#   python -m src.reminders
+# The scheduler keeps a min-heap of the reminders firing in the next REMINDER_LOOKAHEAD,
+# filled by range scans of ix_tasks_due_date as the window slides forward, so memory and
+# reads follow the tasks due soon, not the size of the table. Task edits are picked up by
+# tailing the board change log. A popped reminder is checked against the task's current row
+# (a changed due date or a done task makes it stale) and claimed in task_reminders before
+# its event is published to the board, so each reminder fires once per deadline.
+REMINDER_DUE_SOON = timedelta(hours=float(os.getenv("REMINDER_DUE_SOON_HOURS", "24")))  # "due soon" this long before the deadline
+REMINDER_LOOKAHEAD = timedelta(minutes=float(os.getenv("REMINDER_LOOKAHEAD_MINUTES", "60")))  # How far ahead the heap is filled
+REMINDER_CATCHUP = timedelta(hours=float(os.getenv("REMINDER_CATCHUP_HOURS", "24")))  # Missed reminders older than this are skipped
+REMINDER_RESYNC = float(os.getenv("REMINDER_RESYNC_SECONDS", "3600"))  # Seconds between full reloads of the window
+REMINDER_TICK = float(os.getenv("REMINDER_TICK_SECONDS", "1"))
+REMINDER_BATCH = 500  # Reminders verified and claimed per transaction
+LOAD_BATCH = 5000  # Rows per window scan or change log page
+
+DUE_SOON = "due_soon"
+OVERDUE = "overdue"
+
+def _open_task():
+    return or_(Task.status.is_(None), Task.status.notin_(DONE_STATUSES))
+
+class ReminderScheduler:
+    def __init__(self, bind, due_soon: timedelta = REMINDER_DUE_SOON, lookahead: timedelta = REMINDER_LOOKAHEAD,
+                 catchup: timedelta = REMINDER_CATCHUP):
+        self.bind = bind
+        self.due_soon = due_soon
+        self.lookahead = lookahead
+        self.catchup = catchup
+        self.heap = []  # (fire_at, task_id, kind, due_date)
+        self.scheduled = set()  # (task_id, kind, due_date) in the heap
+        self.horizon = None  # Every reminder firing before this is in the heap
+        self.last_change_id = 0
+        self.fired = 0
+
+    # Rebuild the heap from scratch: reminders from `now - catchup` to `now + lookahead`
+    def reset(self, now: datetime):
+        self.heap, self.scheduled = [], set()
+        with Session(bind=self.bind) as db:
+            # Read before the scan: changes committed during it are tailed afterwards
+            self.last_change_id = db.scalar(select(func.max(BoardChange.id))) or 0
+        self.horizon = now - self.catchup
+        self.extend(now + self.lookahead)
+
+    def _push(self, task_id: int, due_date: datetime, low: datetime, high: datetime):
+        for kind, fire_at in ((DUE_SOON, due_date - self.due_soon), (OVERDUE, due_date)):
+            key = (task_id, kind, due_date)
+            if low <= fire_at < high and key not in self.scheduled:
+                heapq.heappush(self.heap, (fire_at, task_id, kind, due_date))
+                self.scheduled.add(key)
+
+    # Slide the window to `until`: tasks with a reminder firing in [horizon, until),
+    # i.e. due in [horizon, until + due_soon), read in (due_date, id) keyset pages
+    def extend(self, until: datetime):
+        start, end = self.horizon, until + self.due_soon
+        with Session(bind=self.bind) as db:
+            after = None
+            while True:
+                query = select(Task.id, Task.due_date).where(Task.due_date >= start, Task.due_date < end, _open_task())
+                if after is not None:
+                    query = query.where(or_(Task.due_date > after[0], and_(Task.due_date == after[0], Task.id > after[1])))
+                rows = db.execute(query.order_by(Task.due_date, Task.id).limit(LOAD_BATCH)).all()
+                for task_id, due_date in rows:
+                    self._push(task_id, due_date, self.horizon, until)
+                if len(rows) < LOAD_BATCH:
+                    break
+                after = rows[-1]
+        self.horizon = until
+
+    # Schedule the current deadlines of tasks written since the last call
+    def track_changes(self, now: datetime):
+        with Session(bind=self.bind) as db:
+            while True:
+                rows = db.execute(
+                    select(BoardChange.id, BoardChange.entity_id)
+                    .where(BoardChange.id > self.last_change_id, BoardChange.entity == "task", BoardChange.op == "upsert")
+                    .order_by(BoardChange.id).limit(LOAD_BATCH)
+                ).all()
+                if not rows:
+                    return
+                self.last_change_id = rows[-1][0]
+                task_ids = {task_id for _, task_id in rows}
+                tasks = db.execute(select(Task.id, Task.due_date).where(Task.id.in_(task_ids), Task.due_date.is_not(None), _open_task()))
+                for task_id, due_date in tasks:
+                    self._push(task_id, due_date, now - self.catchup, self.horizon)
+                if len(rows) < LOAD_BATCH:
+                    return
+
+    # Fire up to REMINDER_BATCH reminders due by `now`; returns how many were popped
+    def fire_due(self, now: datetime):
+        entries = []
+        while self.heap and self.heap[0][0] <= now and len(entries) < REMINDER_BATCH:
+            fire_at, task_id, kind, due_date = heapq.heappop(self.heap)
+            self.scheduled.discard((task_id, kind, due_date))
+            entries.append((task_id, kind, due_date))
+        if not entries:
+            return 0
+        task_ids = {task_id for task_id, _, _ in entries}
+        with Session(bind=self.bind) as db:
+            tasks = {
+                row.id: row for row in
+                db.execute(
+                    select(Task.id, Task.list_id, Task.title, Task.assignee_id, Task.status, Task.due_date)
+                    .join(List, and_(List.id == Task.list_id, List.deleted_at.is_(None)))
+                    .join(Board, and_(Board.id == List.board_id, Board.deleted_at.is_(None)))
+                    .where(Task.id.in_(task_ids))
+                )
+            }
+            sent = set(db.execute(select(TaskReminder.task_id, TaskReminder.kind, TaskReminder.due_date).where(TaskReminder.task_id.in_(task_ids))).all())
+            fresh = []
+            for task_id, kind, due_date in entries:
+                task = tasks.get(task_id)
+                if task is None or task.due_date != due_date or task.status in DONE_STATUSES or (task_id, kind, due_date) in sent:
+                    continue  # Stale: deleted, rescheduled, done or already sent
+                if kind == DUE_SOON and now >= due_date:
+                    continue  # Already overdue, that reminder supersedes this one
+                fresh.append((task_id, kind, due_date))
+            claimed = self._claim(db, fresh, now)
+            boards = list_board_ids(db, {tasks[task_id].list_id for task_id, _, _ in claimed})
+            for task_id, kind, due_date in claimed:
+                task = tasks[task_id]
+                emit(db, boards.get(task.list_id), f"task.{kind}",
+                     {"id": task_id, "list_id": task.list_id, "title": task.title, "assignee_id": task.assignee_id, "due_date": due_date})
+            db.commit()
+        self.fired += len(claimed)
+        return len(entries)
+
+    # Insert the claims; another scheduler may have taken some, then claim one by one
+    def _claim(self, db: Session, keys, now: datetime):
+        rows = [{"task_id": task_id, "kind": kind, "due_date": due_date, "sent_at": now} for task_id, kind, due_date in keys]
+        if not rows:
+            return []
+        try:
+            with db.begin_nested():
+                db.execute(insert(TaskReminder), rows)
+            return keys
+        except IntegrityError:
+            claimed = []
+            for key, row in zip(keys, rows):
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(TaskReminder), [row])
+                    claimed.append(key)
+                except IntegrityError:
+                    pass
+            return claimed
+
+    # One pass: reload or slide the window, pick up edits, fire what is due
+    def tick(self, now: datetime, resync: bool = False):
+        if resync or self.horizon is None:
+            self.reset(now)
+        elif now + self.lookahead / 2 >= self.horizon:
+            self.extend(now + self.lookahead)
+        self.track_changes(now)
+        while self.fire_due(now) == REMINDER_BATCH:
+            pass
+
+async def run(bind, tick: float = REMINDER_TICK, resync: float = REMINDER_RESYNC):
+    await hub.start()
+    if EVENT_BROKER_URL:
+        # Reminder events reach the API workers through the broker only
+        for _ in range(50):
+            if hub.connected:
+                break
+            await asyncio.sleep(0.1)
+    scheduler = ReminderScheduler(bind)
+    next_resync = 0.0
+    try:
+        while True:
+            full = time.monotonic() >= next_resync
+            try:
+                await asyncio.to_thread(scheduler.tick, datetime.utcnow(), full)
+                if full:
+                    next_resync = time.monotonic() + resync
+            except Exception as exc:
+                # Database hiccup: keep the heap and retry on the next tick
+                print(f"[WARN] - reminders: {exc!r}", flush=True)
+            await asyncio.sleep(tick)
+    finally:
+        await hub.stop()
+
+def main():
+    from .database import engine
+    asyncio.run(run(engine))
+
+if __name__ == "__main__":
+    main()
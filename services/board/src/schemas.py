@@ -1,16 +1,19 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Literal
 
 class BoardCreate(BaseModel):
     project_id: int
     name: str
+    is_template: bool = False
 
 class BoardResponse(BaseModel):
     id: int
     project_id: int
     name: str
     created_at: datetime
+    version: int
+    is_template: bool = False
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -45,6 +48,9 @@ class TaskResponse(BaseModel):
     status: str
     due_date: Optional[datetime]
     created_at: datetime
+    position: float
+    completed_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None  # Set on archived tasks (include_archived)
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -55,6 +61,7 @@ class TaskLabelResponse(BaseModel):
     id: int
     task_id: int
     label: str
+    label_id: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -66,9 +73,180 @@ class TaskAttachmentResponse(BaseModel):
     task_id: int
     file_url: str
     uploaded_at: datetime
+    filename: Optional[str] = None
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    content_type: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 class TaskMove(BaseModel):
     new_list_id: int
-    new_position: Optional[int] = None
\ No newline at end of file
+    new_position: Optional[int] = Field(None, ge=0)  # Index in the target list, None = append at the end
+class PermissionInvalidate(BaseModel):
+    project_id: int
+    user_id: Optional[int] = None  # None drops every cached decision for the project
+
+class TaskFullResponse(TaskResponse):
+    labels: List[TaskLabelResponse] = []
+    attachments: List[TaskAttachmentResponse] = []
+
+class ListFullResponse(ListResponse):
+    tasks: List[TaskFullResponse] = []
+
+class BoardFullResponse(BoardResponse):
+    lists: List[ListFullResponse] = []
+
+# Fields a task update may change; extra keys are ignored
+class TaskUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    assignee_id: Optional[int] = None
+    priority: Optional[str] = None
+    status: Optional[str] = None
+    due_date: Optional[datetime] = None
+    list_id: Optional[int] = None
+
+class TaskBatchOperation(BaseModel):
+    op: Literal["create", "update", "move", "assign", "delete"]
+    task_id: Optional[int] = None  # Required for every op except create
+    data: Optional[dict] = None  # create: TaskCreate fields, update: TaskUpdate fields
+    new_list_id: Optional[int] = None  # move
+    new_position: Optional[int] = Field(None, ge=0)  # move
+    assignee_id: Optional[int] = None  # assign
+
+class TaskBatchRequest(BaseModel):
+    operations: List[TaskBatchOperation] = Field(..., min_length=1, max_length=500)
+
+class TaskBatchResult(BaseModel):
+    index: int
+    op: str
+    status: int  # HTTP status code of this operation on its own
+    task_id: Optional[int] = None
+    detail: Optional[str] = None
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchResult]
+
+# A board in GET /projects/{id}/boards
+class ProjectBoardSummary(BoardResponse):
+    by_status: dict[str, int]
+    total: int
+
+class BoardStatsResponse(BaseModel):
+    board_id: int
+    total: int
+    by_status: dict[str, int]  # Tasks without a value are counted under "none"
+    by_priority: dict[str, int]
+    by_assignee: dict[str, int]
+    overdue: int  # Past due_date and not done
+
+class TaskSearchResult(TaskResponse):
+    score: float
+
+class AssignedTaskResponse(TaskResponse):
+    board_id: int
+    project_id: int
+
+class BoardChangesDeleted(BaseModel):
+    lists: List[int] = []
+    tasks: List[int] = []
+    labels: List[int] = []
+    attachments: List[int] = []
+
+class BoardChangesResponse(BaseModel):
+    board_id: int
+    version: int  # Pass as `since` next time
+    full: bool  # True when `since` was too old: only `snapshot` is set
+    lists: List[ListResponse] = []
+    tasks: List[TaskResponse] = []
+    labels: List[TaskLabelResponse] = []
+    attachments: List[TaskAttachmentResponse] = []
+    deleted: BoardChangesDeleted = BoardChangesDeleted()
+    snapshot: Optional[BoardFullResponse] = None
+
+class BoardLabelResponse(BaseModel):
+    id: int
+    board_id: int
+    name: str
+    task_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Records of the NDJSON board export/import, see transfer.py. Ids are the exporting
+# database's; the import remaps them.
+class BoardImport(BaseModel):
+    project_id: Optional[int] = None
+    name: str = Field(..., min_length=1, max_length=255)
+    created_at: Optional[datetime] = None
+
+class ListImport(BaseModel):
+    id: int
+    name: str = Field(..., min_length=1, max_length=255)
+    position: int = 0
+
+class TaskImport(BaseModel):
+    id: int
+    list_id: int
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    assignee_id: Optional[int] = None
+    priority: Optional[str] = Field(None, max_length=50)
+    status: Optional[str] = Field("todo", max_length=50)
+    due_date: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    position: Optional[float] = None  # None = after the list's last imported task
+    completed_at: Optional[datetime] = None
+
+class BoardLabelImport(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+
+class TaskLabelImport(BaseModel):
+    task_id: int
+    label: str = Field(..., min_length=1, max_length=100)
+
+class TaskAttachmentImport(BaseModel):
+    task_id: int
+    file_url: str = Field(..., max_length=512)
+    uploaded_at: Optional[datetime] = None
+    filename: Optional[str] = Field(None, max_length=255)
+    size: Optional[int] = None
+    sha256: Optional[str] = Field(None, pattern=r"^[0-9a-f]{64}$")
+    content_type: Optional[str] = Field(None, max_length=255)
+
+class BoardImportResponse(BaseModel):
+    board: BoardResponse
+    lists: int
+    tasks: int
+    labels: int
+    attachments: int
+
+# Purge of a deleted project's boards, see POST /projects/{id}/purge
+class ProjectPurgeResponse(BaseModel):
+    project_id: int
+    boards: int
+    pending: int  # Purge jobs not done yet
+    rows_deleted: int
+    done: bool
+
+class PurgeJobResponse(BaseModel):
+    id: int
+    entity: str
+    entity_id: int
+    status: str
+    rows_deleted: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TaskActivityResponse(BaseModel):
+    id: int
+    task_id: int
+    board_id: Optional[int]
+    actor_id: Optional[int]
+    action: str
+    changes: dict
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
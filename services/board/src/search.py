@@ -0,0 +1,116 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from sqlalchemy import func, case, or_, and_, delete, insert
+from sqlalchemy.orm import Session
+from .models import Board, List, Task, TaskSearchTerm, BoardTaskStat
+
+# Task search runs on an inverted index (task_search_terms) kept in sync by the crud
+# functions in the same transaction as the task write. Queries match tasks containing
+# every term and rank them by TF-IDF. The same tables serve MariaDB and SQLite.
+TITLE_WEIGHT = 3
+MAX_TERM_LENGTH = 50
+MAX_QUERY_TERMS = 8
+_WORD = re.compile(r"\w+")
+
+# Case- and accent-fold so "Đặt lịch" and "dat LICH" give the same terms
+def normalize(text: str):
+    if text.isascii():
+        return text.casefold()
+    text = text.replace("đ", "d").replace("Đ", "D")
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in text if not unicodedata.combining(char)).casefold()
+
+def tokenize(text: str):
+    if not text:
+        return []
+    return [word[:MAX_TERM_LENGTH] for word in _WORD.findall(normalize(text)) if len(word) > 1]
+
+# Distinct query terms in order, at most MAX_QUERY_TERMS
+def query_terms(query: str):
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+def task_terms(title: str, description: str):
+    weights = Counter()
+    for term in tokenize(title):
+        weights[term] += TITLE_WEIGHT
+    for term in tokenize(description):
+        weights[term] += 1
+    return weights
+
+# Rebuild the postings of some tasks from their current rows
+def reindex_tasks(db: Session, task_ids):
+    task_ids = list(set(task_ids))
+    if not task_ids:
+        return
+    db.execute(delete(TaskSearchTerm).where(TaskSearchTerm.task_id.in_(task_ids)))
+    rows = (
+        db.query(Task.id, Task.title, Task.description, Board.project_id)
+        .join(List, and_(List.id == Task.list_id, List.deleted_at.is_(None)))
+        .join(Board, and_(Board.id == List.board_id, Board.deleted_at.is_(None)))
+        .filter(Task.id.in_(task_ids))
+    )
+    postings = [
+        {"term": term, "project_id": project_id, "task_id": task_id, "weight": weight}
+        for task_id, title, description, project_id in rows
+        for term, weight in task_terms(title, description).items()
+    ]
+    if postings:
+        db.execute(insert(TaskSearchTerm.__table__), postings)  # Core executemany, no ORM bookkeeping per row
+
+def unindex_tasks(db: Session, task_ids):
+    task_ids = list(set(task_ids))
+    if task_ids:
+        db.execute(delete(TaskSearchTerm).where(TaskSearchTerm.task_id.in_(task_ids)))
+
+# Number of tasks containing each term
+def document_frequencies(db: Session, terms):
+    rows = db.query(TaskSearchTerm.term, func.count()).filter(TaskSearchTerm.term.in_(terms)).group_by(TaskSearchTerm.term)
+    frequencies = dict.fromkeys(terms, 0)
+    frequencies.update(rows)
+    return frequencies
+
+# Projects with at least one task containing `term`; every match contains the rarest term,
+# so its projects are the only ones that need a permission check
+def projects_with_term(db: Session, term: str):
+    return [project_id for (project_id,) in db.query(TaskSearchTerm.project_id).filter(TaskSearchTerm.term == term).distinct()]
+
+def _total_tasks(db: Session):
+    total = db.query(func.sum(BoardTaskStat.task_count)).filter(BoardTaskStat.dimension == "status").scalar()
+    return total or 0
+
+# One page of (task, score) for tasks in `project_ids` containing every term, best first.
+# `after` is the (score, task_id) of the last result already seen.
+def search_tasks(db: Session, terms, frequencies: dict, project_ids, limit: int, after: tuple = None):
+    if not terms or not project_ids:
+        return []
+    total = max(_total_tasks(db), max(frequencies.values()))
+    idf = {term: round(math.log(1 + total / frequencies[term]), 6) for term in terms}
+    score = func.sum(TaskSearchTerm.weight * case(idf, value=TaskSearchTerm.term, else_=0)).label("score")
+    # Drive from the rarest term: the other terms are only looked up for its tasks
+    rarest = min(terms, key=frequencies.get)
+    candidates = (
+        db.query(TaskSearchTerm.task_id)
+        .filter(TaskSearchTerm.term == rarest, TaskSearchTerm.project_id.in_(project_ids))
+    )
+    query = (
+        db.query(TaskSearchTerm.task_id, score)
+        .filter(TaskSearchTerm.term.in_(terms), TaskSearchTerm.project_id.in_(project_ids))
+        .filter(TaskSearchTerm.task_id.in_(candidates.scalar_subquery()))
+        .group_by(TaskSearchTerm.task_id)
+        .having(func.count() == len(terms))
+    )
+    if after is not None:
+        last_score, last_id = after
+        query = query.having(or_(score < last_score, and_(score == last_score, TaskSearchTerm.task_id > last_id)))
+    ranked = query.order_by(score.desc(), TaskSearchTerm.task_id).limit(limit).all()
+    # Postings of deleted lists and boards linger until the purge removes them
+    tasks = {
+        task.id: task for task in
+        db.query(Task)
+        .join(List, and_(List.id == Task.list_id, List.deleted_at.is_(None)))
+        .join(Board, and_(Board.id == List.board_id, Board.deleted_at.is_(None)))
+        .filter(Task.id.in_([task_id for task_id, _ in ranked]))
+    }
+    return [(tasks[task_id], score) for task_id, score in ranked if task_id in tasks]
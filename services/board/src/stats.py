@@ -0,0 +1,141 @@
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import func, or_, and_, delete
+from sqlalchemy.orm import Session
+from .models import Board, List, Task, BoardTaskStat
+from .schemas import BoardResponse
+
+# Board statistics are counters in board_task_stats, adjusted by the crud functions in
+# the same transaction as the task write. Overdue counts change with the clock, so they
+# are counted at read time from ix_tasks_list_id_due_date_status instead.
+STAT_DIMENSIONS = ("status", "priority", "assignee_id")
+DONE_STATUSES = ("done",)
+NO_VALUE = ""
+
+# The columns statistics depend on; None for a task that doesn't exist (before create, after delete)
+def stat_snapshot(task):
+    if task is None:
+        return None
+    return {"list_id": task.list_id, "status": task.status, "priority": task.priority, "assignee_id": task.assignee_id}
+
+def _count(deltas: Counter, board_id: int, snapshot: dict, sign: int):
+    for dimension in STAT_DIMENSIONS:
+        value = snapshot[dimension]
+        deltas[(board_id, dimension, NO_VALUE if value is None else str(value))] += sign
+
+# Turn (before, after) snapshots into counter deltas and write them; `boards` maps list_id -> board_id
+def record_task_changes(db: Session, changes, boards: dict):
+    changes = [(before, after) for before, after in changes if before != after]
+    if not changes:
+        return
+    deltas = Counter()
+    for before, after in changes:
+        if before is not None and before["list_id"] in boards:
+            _count(deltas, boards[before["list_id"]], before, -1)
+        if after is not None and after["list_id"] in boards:
+            _count(deltas, boards[after["list_id"]], after, 1)
+    apply_stat_deltas(db, deltas)
+
+def _upsert(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        statement = sqlite_insert(BoardTaskStat)
+        return statement.on_conflict_do_update(
+            index_elements=["board_id", "dimension", "value"],
+            set_={"task_count": BoardTaskStat.task_count + statement.excluded.task_count},
+        )
+    from sqlalchemy.dialects.mysql import insert as mysql_insert
+    statement = mysql_insert(BoardTaskStat)
+    return statement.on_duplicate_key_update(task_count=BoardTaskStat.task_count + statement.inserted.task_count)
+
+# Add deltas to the counters: one upsert for all keys, in key order so concurrent writers lock rows consistently
+def apply_stat_deltas(db: Session, deltas: Counter):
+    rows = [
+        {"board_id": board_id, "dimension": dimension, "value": value, "task_count": delta}
+        for (board_id, dimension, value), delta in sorted(deltas.items()) if delta
+    ]
+    if rows:
+        db.execute(_upsert(db), rows)
+
+def count_overdue(db: Session, board_id: int, now: datetime = None):
+    now = now or datetime.utcnow()
+    return (
+        db.query(func.count())
+        .select_from(Task)
+        .join(List, List.id == Task.list_id)
+        .filter(List.board_id == board_id, List.deleted_at.is_(None), Task.due_date < now)
+        .filter(or_(Task.status.is_(None), Task.status.notin_(DONE_STATUSES)))
+        .scalar()
+    )
+
+def get_board_stats(db: Session, board_id: int, now: datetime = None):
+    stats = {"board_id": board_id, "by_status": {}, "by_priority": {}, "by_assignee": {}}
+    keys = {"status": "by_status", "priority": "by_priority", "assignee_id": "by_assignee"}
+    rows = db.query(BoardTaskStat).filter(BoardTaskStat.board_id == board_id, BoardTaskStat.task_count != 0)
+    for row in rows:
+        stats[keys[row.dimension]][row.value or "none"] = row.task_count
+    stats["total"] = sum(stats["by_status"].values())
+    stats["overdue"] = count_overdue(db, board_id, now)
+    return stats
+
+# Live boards of a project with their task counts by status, from the counters in one query
+def get_project_board_stats(db: Session, project_id: int):
+    rows = (
+        db.query(Board, BoardTaskStat.value, BoardTaskStat.task_count)
+        .outerjoin(BoardTaskStat, and_(BoardTaskStat.board_id == Board.id, BoardTaskStat.dimension == "status", BoardTaskStat.task_count != 0))
+        .filter(Board.project_id == project_id, Board.deleted_at.is_(None))
+        .order_by(Board.id)
+    )
+    boards = {}
+    for board, status, count in rows:
+        summary = boards.setdefault(board.id, {"board": board, "by_status": {}, "total": 0})
+        if count:
+            summary["by_status"][status or "none"] = count
+            summary["total"] += count
+    return [dict(BoardResponse.model_validate(summary.pop("board")).model_dump(), **summary) for summary in boards.values()]
+
+def _count_tasks(db: Session, board_id: int, *conditions):
+    counts = Counter()
+    for dimension in STAT_DIMENSIONS:
+        column = getattr(Task, dimension)
+        rows = (
+            db.query(column, func.count())
+            .join(List, List.id == Task.list_id)
+            .filter(List.board_id == board_id, *conditions)
+            .group_by(column)
+        )
+        for value, count in rows:
+            counts[(board_id, dimension, NO_VALUE if value is None else str(value))] = count
+    return counts
+
+# Counters recomputed from the tasks table: {(board_id, dimension, value): count}.
+# Tasks of deleted lists no longer count.
+def count_board_tasks(db: Session, board_id: int):
+    return _count_tasks(db, board_id, List.deleted_at.is_(None))
+
+# What one list's tasks add to its board's counters
+def count_list_tasks(db: Session, board_id: int, list_id: int):
+    return _count_tasks(db, board_id, List.id == list_id)
+
+# Recompute one board's counters from scratch and fix any drift; returns the drifted keys.
+# The counter rows are locked first so writers in flight wait and land on top of the fix.
+def reconcile_board_stats(db: Session, board_id: int):
+    rows = db.query(BoardTaskStat).filter(BoardTaskStat.board_id == board_id).with_for_update().all()
+    actual = {(row.board_id, row.dimension, row.value): row.task_count for row in rows}
+    expected = count_board_tasks(db, board_id)
+    drift = []
+    for key in sorted(actual.keys() | expected.keys()):
+        if actual.get(key, 0) != expected.get(key, 0):
+            drift.append({"board_id": key[0], "dimension": key[1], "value": key[2],
+                          "expected": expected.get(key, 0), "actual": actual.get(key, 0)})
+    if drift:
+        apply_stat_deltas(db, Counter({(d["board_id"], d["dimension"], d["value"]): d["expected"] - d["actual"] for d in drift}))
+    db.execute(delete(BoardTaskStat).where(BoardTaskStat.board_id == board_id, BoardTaskStat.task_count == 0))
+    db.commit()
+    return drift
+
+def reconcile_all_board_stats(db: Session):
+    drift = []
+    for (board_id,) in db.query(Board.id).filter(Board.deleted_at.is_(None)).order_by(Board.id).all():
+        drift += reconcile_board_stats(db, board_id)
+    return drift
@@ -0,0 +1,188 @@
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from urllib.parse import quote
+from fastapi.concurrency import run_in_threadpool
+from starlette.responses import Response
+
+# Attachment files are stored by content: the sha256 of the bytes is the file name, so
+# uploading the same file twice stores it once. Uploads stream to a temp file while being
+# hashed and are then moved into place atomically. Blobs are never rewritten, which makes
+# the digest a strong ETag.
+ATTACHMENT_STORAGE_DIR = os.getenv("ATTACHMENT_STORAGE_DIR", "storage/attachments")
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(100 * 1024 * 1024)))  # Largest accepted upload
+# When set (e.g. /protected-attachments/), downloads are handed to nginx with X-Accel-Redirect,
+# which serves the blob with sendfile and handles Range itself. Empty = served by this app.
+ATTACHMENT_ACCEL_REDIRECT_PREFIX = os.getenv("ATTACHMENT_ACCEL_REDIRECT_PREFIX", "")
+WRITE_BUFFER_SIZE = 1024 * 1024  # Bytes collected from the request before each disk write
+READ_CHUNK_SIZE = 256 * 1024  # Bytes per read when the server can't send files zero-copy
+
+# Content types a client sends when it doesn't know better; the file name is used instead
+GENERIC_CONTENT_TYPES = {"", "application/octet-stream", "application/x-www-form-urlencoded"}
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+def valid_digest(digest):
+    return isinstance(digest, str) and DIGEST_PATTERN.fullmatch(digest) is not None
+
+class UploadTooLarge(Exception):
+    pass
+
+class ContentStore:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    # Blobs are fanned out over two directory levels: ab/cd/abcd...
+    def relative_path(self, digest: str):
+        if not valid_digest(digest):
+            raise ValueError(f"Not a sha256 digest: {digest!r}")
+        return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+    def path_for(self, digest: str):
+        return os.path.join(self.root, self.relative_path(digest))
+
+    def exists(self, digest: str):
+        return valid_digest(digest) and os.path.isfile(self.path_for(digest))
+
+    # Stream an async iterable of byte chunks to disk, returns (sha256, size)
+    async def save(self, chunks):
+        temp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(temp_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=temp_dir)
+        hasher = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        try:
+            with os.fdopen(fd, "wb") as file:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadTooLarge()
+                    buffer += chunk
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        data, buffer = buffer, bytearray()
+                        await run_in_threadpool(_write, file, hasher, data)
+                await run_in_threadpool(_write, file, hasher, buffer, True)
+            digest = hasher.hexdigest()
+            await run_in_threadpool(self._store, temp_path, digest)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return digest, size
+
+    # Move a finished temp file to its content address, or drop it if that blob exists already
+    def _store(self, temp_path: str, digest: str):
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            os.remove(temp_path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp_path, path)
+
+def _write(file, hasher, data, final=False):
+    hasher.update(data)
+    file.write(data)
+    if final:
+        file.flush()
+        os.fsync(file.fileno())
+
+attachment_store = ContentStore(ATTACHMENT_STORAGE_DIR, UPLOAD_MAX_BYTES)
+
+# MIME type of an upload: the request's Content-Type unless it is generic, else guessed from the name
+def upload_content_type(header: str, filename: str):
+    content_type = (header or "").split(";")[0].strip().lower()
+    if content_type in GENERIC_CONTENT_TYPES or content_type.startswith("multipart/"):
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return content_type
+
+def content_disposition(filename: str):
+    fallback = filename.encode("ascii", "replace").decode().replace('"', "").replace("\\", "")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+# (start, end) inclusive for a single-range header, None to send the whole file,
+# or "unsatisfiable". Multiple ranges and malformed headers are answered with the whole file.
+def parse_range(header: str, size: int):
+    match = RANGE_PATTERN.fullmatch(header.replace(" ", ""))
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0 or size == 0:
+            return "unsatisfiable"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        return "unsatisfiable"
+    if end < start:
+        return None
+    return start, end
+
+# Sends bytes [start, end] of a file. Uses the ASGI zero-copy extension (sendfile) when the
+# server offers it, otherwise reads the file in chunks off the event loop.
+class FileRangeResponse(Response):
+    def __init__(self, path: str, start: int, end: int, status_code: int = 200, headers: dict = None, media_type: str = None):
+        self.path = path
+        self.start = start
+        self.length = end - start + 1
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers({**(headers or {}), "content-length": str(self.length)})
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        file = await run_in_threadpool(open, self.path, "rb")
+        try:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({"type": "http.response.zerocopysend", "file": file, "offset": self.start, "count": self.length})
+                return
+            await run_in_threadpool(file.seek, self.start)
+            remaining = self.length
+            while remaining:
+                chunk = await run_in_threadpool(file.read, min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining:
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            await run_in_threadpool(file.close)
+
+# Download response for a stored blob: ETag/If-None-Match, single Range requests, and
+# X-Accel-Redirect when nginx serves the files
+def blob_response(request, store: ContentStore, digest: str, size: int, content_type: str, filename: str):
+    etag = f'"{digest}"'
+    headers = {
+        "etag": etag,
+        "accept-ranges": "bytes",
+        "cache-control": "private, max-age=31536000, immutable",
+        "content-disposition": content_disposition(filename),
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    if ATTACHMENT_ACCEL_REDIRECT_PREFIX:
+        headers["x-accel-redirect"] = ATTACHMENT_ACCEL_REDIRECT_PREFIX + store.relative_path(digest)
+        return Response(headers=headers, media_type=content_type)
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range", etag) == etag:
+        byte_range = parse_range(range_header, size)
+    if byte_range == "unsatisfiable":
+        return Response(status_code=416, headers={**headers, "content-range": f"bytes */{size}"})
+    if byte_range is None:
+        return FileRangeResponse(store.path_for(digest), 0, size - 1, headers=headers, media_type=content_type)
+    start, end = byte_range
+    headers["content-range"] = f"bytes {start}-{end}/{size}"
+    return FileRangeResponse(store.path_for(digest), start, end, status_code=206, headers=headers, media_type=content_type)
@@ -0,0 +1,295 @@
+import json
+import os
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update, and_
+from sqlalchemy.orm import Session
+from .models import Board, List, Task, TaskLabel, TaskAttachment, BoardLabel
+from .schemas import BoardImport, ListImport, TaskImport, BoardLabelImport, TaskLabelImport, TaskAttachmentImport
+from .ordering import position_between
+from .stats import DONE_STATUSES, record_task_changes
+from .search import reindex_tasks
+from .crud import created_snapshot, label_name, board_label_ids
+
+# Boards move between databases as NDJSON, one {"type": ..., "data": {...}} record per line:
+# the board first, then its lists, tasks, label dictionary, task labels and attachment
+# metadata, each kind in one run. Export streams every section from a server-side cursor
+# inside one transaction, so the file is a consistent snapshot whatever the board size.
+# Import creates a new board and inserts each kind in bulk batches, remapping the ids;
+# the new tasks become searchable shortly after (index_imported_board). clone_board feeds
+# the same importer straight from another board's rows, without the NDJSON round trip.
+EXPORT_FORMAT = 1
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "2000"))  # Rows per server-side cursor fetch
+EXPORT_CHUNK_SIZE = 64 * 1024  # Bytes of NDJSON handed to the response at a time
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))  # Records per bulk INSERT
+IMPORT_MAX_LINE = 1024 * 1024  # Longest accepted NDJSON line
+
+BOARD_EXPORT_COLUMNS = ("id", "project_id", "name", "created_at")
+IMPORT_SCHEMAS = {
+    "list": ListImport,
+    "task": TaskImport,
+    "board_label": BoardLabelImport,
+    "label": TaskLabelImport,
+    "attachment": TaskAttachmentImport,
+}
+
+class ImportFailed(Exception):
+    pass
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _record(record_type: str, data, **extra):
+    return json.dumps({"type": record_type, **extra, "data": dict(data)}, default=_json_default, separators=(",", ":")) + "\n"
+
+# Export one board as NDJSON chunks. Runs in its own session: the response outlives the request's.
+def export_board(bind, board_id: int):
+    buffer = []
+    size = 0
+    for line in _export_records(bind, board_id):
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+def _export_records(bind, board_id: int):
+    with Session(bind=bind) as db:
+        board = db.execute(
+            select(*(Board.__table__.c[name] for name in BOARD_EXPORT_COLUMNS)).where(Board.id == board_id, Board.deleted_at.is_(None))
+        ).mappings().first()
+        if board is None:
+            return
+        yield _record("board", board, format=EXPORT_FORMAT)
+        live_lists = and_(List.board_id == board_id, List.deleted_at.is_(None))
+        board_tasks = select(Task.id).join(List, List.id == Task.list_id).where(live_lists)
+        sections = [
+            ("list", select(List.id, List.name, List.position).where(live_lists).order_by(List.position, List.id)),
+            ("task", select(*Task.__table__.c).join(List, List.id == Task.list_id).where(live_lists).order_by(Task.id)),
+            ("board_label", select(BoardLabel.name).where(BoardLabel.board_id == board_id).order_by(BoardLabel.id)),
+            ("label", select(TaskLabel.task_id, TaskLabel.label).where(TaskLabel.task_id.in_(board_tasks)).order_by(TaskLabel.task_id, TaskLabel.id)),
+            ("attachment", select(*(column for column in TaskAttachment.__table__.c if column.name != "id"))
+                .where(TaskAttachment.task_id.in_(board_tasks)).order_by(TaskAttachment.task_id, TaskAttachment.id)),
+        ]
+        for record_type, statement in sections:
+            for row in db.execute(statement.execution_options(yield_per=EXPORT_FETCH_SIZE)).mappings():
+                yield _record(record_type, row)
+
+# Parse an async stream of byte chunks into (line_number, record) pairs
+async def ndjson_records(chunks):
+    pending = b""
+    line_number = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        if len(pending) > IMPORT_MAX_LINE:
+            raise ImportFailed(f"Line {line_number + len(lines) + 1} is too long")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, _parse_line(line_number, line)
+    if pending.strip():
+        yield line_number + 1, _parse_line(line_number + 1, pending)
+
+def _parse_line(line_number: int, line: bytes):
+    try:
+        record = json.loads(line)
+    except ValueError:
+        raise ImportFailed(f"Line {line_number}: invalid JSON")
+    if not isinstance(record, dict) or not isinstance(record.get("data"), dict):
+        raise ImportFailed(f"Line {line_number}: expected an object with type and data")
+    return record
+
+# Search postings of an imported board. Built after the import commits, in committed batches,
+# so the import itself isn't slowed by them; `reindex-search` repairs an interrupted run.
+def index_imported_board(bind, board_id: int, batch_size: int = IMPORT_BATCH_SIZE):
+    last_id = 0
+    with Session(bind=bind) as db:
+        while True:
+            task_ids = db.scalars(
+                select(Task.id).join(List, List.id == Task.list_id)
+                .where(List.board_id == board_id, Task.id > last_id).order_by(Task.id).limit(batch_size)
+            ).all()
+            if not task_ids:
+                break
+            reindex_tasks(db, task_ids)
+            db.commit()
+            last_id = task_ids[-1]
+
+# Builds a new board from export records, in bulk INSERTs of up to batch_size rows.
+# Everything happens in the caller's transaction; finish() commits it.
+class BoardImporter:
+    def __init__(self, db: Session, project_id: int, batch_size: int = IMPORT_BATCH_SIZE, url_prefix: str = ""):
+        self.db = db
+        self.project_id = project_id
+        self.batch_size = batch_size
+        self.url_prefix = url_prefix
+        self.board = None
+        self.list_ids = {}  # exported id -> new id
+        self.task_ids = {}
+        self.label_ids = {}  # name -> board_labels.id
+        self.last_positions = {}  # new list id -> last task position seen
+        self.counts = {"lists": 0, "tasks": 0, "labels": 0, "attachments": 0}
+        # Stored files the attachments may point at; None: any (rows from this database, clone_board)
+        self.blob_digests = None
+        self.pending_type = None
+        self.pending = []
+
+    # The board record; the new board starts past version 0 so change feeds begin with a snapshot
+    def start(self, line_number: int, record: dict):
+        if record.get("type") != "board":
+            raise ImportFailed(f"Line {line_number}: the first record must be the board")
+        if record.get("format", EXPORT_FORMAT) != EXPORT_FORMAT:
+            raise ImportFailed(f"Line {line_number}: unsupported export format {record.get('format')}")
+        data = self._validate(BoardImport, line_number, record["data"])
+        self.board = Board(project_id=self.project_id, name=data.name, created_at=data.created_at or datetime.utcnow(), version=1, changes_horizon=1)
+        self.db.add(self.board)
+        self.db.flush()
+
+    def add(self, records):
+        for line_number, record in records:
+            record_type = record.get("type")
+            schema = IMPORT_SCHEMAS.get(record_type)
+            if schema is None:
+                raise ImportFailed(f"Line {line_number}: unknown record type {record_type!r}")
+            if self.pending and (record_type != self.pending_type or len(self.pending) >= self.batch_size):
+                self._flush()
+            self.pending_type = record_type
+            self.pending.append((line_number, self._validate(schema, line_number, record["data"])))
+
+    # Rows read from this database (clone_board): already valid, so no per-row validation
+    def add_rows(self, record_type: str, rows):
+        if self.pending:
+            self._flush()
+        self.pending_type = record_type
+        self.pending = [(None, IMPORT_SCHEMAS[record_type].model_construct(**row)) for row in rows]
+        if self.pending:
+            self._flush()
+
+    def finish(self, records=()):
+        self.add(records)
+        if self.pending:
+            self._flush()
+        self.db.commit()
+        self.db.refresh(self.board)
+        return {"board": self.board, **self.counts}
+
+    def _validate(self, schema, line_number: int, data: dict):
+        try:
+            return schema.model_validate(data)
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            raise ImportFailed(f"Line {line_number}: {field}: {error['msg']}")
+
+    def _remap(self, ids: dict, line_number: int, kind: str, old_id: int):
+        if old_id not in ids:
+            raise ImportFailed(f"Line {line_number}: unknown {kind} {old_id}")
+        return ids[old_id]
+
+    def _flush(self):
+        records, self.pending = self.pending, []
+        getattr(self, f"_insert_{self.pending_type}s")(records)
+
+    # Core INSERT ... RETURNING id, ids in row order; skips the ORM's per-row bulk bookkeeping
+    def _insert_returning(self, model, rows):
+        table = model.__table__
+        return self.db.scalars(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows).all()
+
+    def _insert_lists(self, records):
+        rows = [{"board_id": self.board.id, "name": data.name, "position": data.position} for _, data in records]
+        for (_, data), list_id in zip(records, self._insert_returning(List, rows)):
+            self.list_ids[data.id] = list_id
+        self.counts["lists"] += len(rows)
+
+    def _insert_tasks(self, records):
+        rows = []
+        for line_number, data in records:
+            if data.id in self.task_ids:
+                raise ImportFailed(f"Line {line_number}: duplicate task {data.id}")
+            row = data.model_dump(exclude={"id"})
+            row["list_id"] = self._remap(self.list_ids, line_number, "list", data.list_id)
+            row["created_at"] = row["created_at"] or datetime.utcnow()
+            if row["status"] in DONE_STATUSES:
+                row["completed_at"] = row["completed_at"] or datetime.utcnow()
+            else:
+                row["completed_at"] = None
+            if row["position"] is None:
+                row["position"] = position_between(self.last_positions.get(row["list_id"]), None)
+            self.last_positions[row["list_id"]] = max(row["position"], self.last_positions.get(row["list_id"], row["position"]))
+            rows.append(row)
+        new_ids = self._insert_returning(Task, rows)
+        for (_, data), row, task_id in zip(records, rows, new_ids):
+            self.task_ids[data.id] = task_id
+            row["id"] = task_id
+        boards = {list_id: self.board.id for list_id in self.list_ids.values()}
+        record_task_changes(self.db, [(None, created_snapshot(row)) for row in rows], boards)
+        self.counts["tasks"] += len(rows)
+
+    def _resolve_labels(self, names):
+        missing = {name for name in names if name not in self.label_ids}
+        if missing:
+            self.label_ids.update(board_label_ids(self.db, self.board.id, missing))
+
+    def _insert_board_labels(self, records):
+        self._resolve_labels({label_name(data.name) for _, data in records})
+
+    def _insert_labels(self, records):
+        names = [label_name(data.label) for _, data in records]
+        self._resolve_labels(set(names))
+        rows = {}
+        for (line_number, data), name in zip(records, names):
+            task_id = self._remap(self.task_ids, line_number, "task", data.task_id)
+            label_id = self.label_ids[name]
+            rows.setdefault((task_id, label_id), {"task_id": task_id, "label": name, "label_id": label_id})
+        self.db.execute(insert(TaskLabel.__table__), list(rows.values()))
+        self.counts["labels"] += len(rows)
+
+    # Uploaded files keep their content address; their download URL points at the new row.
+    # A file not in blob_digests (from another installation, or one the caller can't read)
+    # is imported as a plain link to its exported URL.
+    def _insert_attachments(self, records):
+        rows = []
+        for line_number, data in records:
+            row = data.model_dump()
+            if row["sha256"] is not None and self.blob_digests is not None and row["sha256"] not in self.blob_digests:
+                row.update(filename=None, size=None, sha256=None, content_type=None)
+            row["task_id"] = self._remap(self.task_ids, line_number, "task", data.task_id)
+            row["uploaded_at"] = row["uploaded_at"] or datetime.utcnow()
+            rows.append(row)
+        new_ids = self._insert_returning(TaskAttachment, rows)
+        urls = [{"id": attachment_id, "file_url": f"{self.url_prefix}/attachments/{attachment_id}/content"}
+                for row, attachment_id in zip(rows, new_ids) if row["sha256"] is not None]
+        if urls:
+            self.db.execute(update(TaskAttachment), urls)
+        self.counts["attachments"] += len(rows)
+
+# Copy a board's lists, tasks, labels and attachment references into a new board of
+# project_id, batch_size tasks at a time, in one transaction. Uploaded attachments share
+# the stored file. Archived tasks are not copied. Returns BoardImporter.finish()'s result.
+def clone_board(db: Session, board: Board, project_id: int, name: str = None, batch_size: int = IMPORT_BATCH_SIZE, url_prefix: str = ""):
+    importer = BoardImporter(db, project_id, batch_size, url_prefix)
+    importer.start(0, {"type": "board", "data": {"name": name or board.name}})
+    live_lists = and_(List.board_id == board.id, List.deleted_at.is_(None))
+    importer.add_rows("board_label", db.execute(select(BoardLabel.name).where(BoardLabel.board_id == board.id).order_by(BoardLabel.id)).mappings())
+    importer.add_rows("list", db.execute(select(List.id, List.name, List.position).where(live_lists).order_by(List.position, List.id)).mappings())
+    task_columns = [column for column in Task.__table__.c if column.name not in ("created_at", "completed_at")]
+    attachment_columns = [column for column in TaskAttachment.__table__.c if column.name not in ("id", "uploaded_at")]
+    last_id = 0
+    while tasks := db.execute(
+        select(*task_columns).join(List, List.id == Task.list_id).where(live_lists, Task.id > last_id).order_by(Task.id).limit(batch_size)
+    ).mappings().all():
+        task_ids = [task["id"] for task in tasks]
+        importer.add_rows("task", tasks)
+        importer.add_rows("label", db.execute(
+            select(TaskLabel.task_id, TaskLabel.label).where(TaskLabel.task_id.in_(task_ids)).order_by(TaskLabel.task_id, TaskLabel.id)
+        ).mappings())
+        importer.add_rows("attachment", db.execute(
+            select(*attachment_columns).where(TaskAttachment.task_id.in_(task_ids)).order_by(TaskAttachment.task_id, TaskAttachment.id)
+        ).mappings())
+        last_id = task_ids[-1]
+    return importer.finish()
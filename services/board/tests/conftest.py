@@ -1,10 +1,14 @@
 import pytest
+import jwt
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from src.database import Base, get_db
 from src.main import app
+from src.auth import JWT_SECRET, ALGORITHM
+from src import main
+from src.activity import activity_recorder
 
 # Test DB: In-memory SQLite
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -26,6 +30,14 @@ def db_session():
         db.close()
         Base.metadata.drop_all(bind=engine)  # Cleanup after each test
 
+# Task activity is written behind the request by a thread; tests write it with drain() instead
+@pytest.fixture(scope="function", autouse=True)
+def activity(monkeypatch):
+    monkeypatch.setattr(activity_recorder, "background", False)
+    activity_recorder.clear()
+    yield activity_recorder
+    activity_recorder.clear()
+
 # Fixture for TestClient with override dependency
 @pytest.fixture(scope="function")
 def client(db_session):
@@ -37,4 +49,43 @@ def client(db_session):
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
-    app.dependency_overrides.pop(get_db, None)  # Cleanup override
\ No newline at end of file
+    app.dependency_overrides.pop(get_db, None)  # Cleanup override
+
+# Fixture for a bearer token of user 1
+@pytest.fixture(scope="function")
+def auth_headers():
+    token = jwt.encode({"sub": "user@example.com", "user_id": 1, "role": "member"}, JWT_SECRET, algorithm=ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+# Calls made to the fake project_service; projects outside `allowed` (None: all) are refused
+class ProjectServiceCalls(list):
+    allowed = None
+
+    def role(self, project_id):
+        return "member" if self.allowed is None or project_id in self.allowed else None
+
+# Fixture standing in for project_service: every user is a member of every project,
+# unless the test sets project_service.allowed
+@pytest.fixture(scope="function")
+def project_service(monkeypatch):
+    calls = ProjectServiceCalls()
+    async def fake_request(base_url, method, path, json=None, **kwargs):
+        calls.append((method, path))
+        if path == "/projects/members/check":
+            return 200, {"roles": {str(project_id): {str(json["user_id"]): calls.role(project_id)} for project_id in json["project_ids"]}}
+        role = calls.role(int(path.split("/")[2]))
+        return (200, {"role": role}) if role else (403, {"detail": "Not authorized"})
+    monkeypatch.setattr(main.upstreams, "request", fake_request)
+    main.permission_cache.clear()
+    yield calls
+    main.permission_cache.clear()
+
+# Fixture recording every SQL statement sent to the test DB
+@pytest.fixture(scope="function")
+def query_log():
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,83 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from src.schemas import BoardCreate, ListCreate, TaskCreate
+from src.crud import create_board, create_list, create_task, update_task
+from src.models import TaskActivity
+from src.activity import ActivityRecorder, compact_task_activity
+
+@pytest.fixture(scope="function")
+def list_ids(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Audit"))
+    return [create_list(db_session, ListCreate(board_id=board.id, name=name, position=1)).id for name in ("Todo", "Done")]
+
+def test_task_history(client, db_session, list_ids, auth_headers, project_service, activity):
+    todo, done = list_ids
+    task_id = client.post("/tasks", json={"list_id": todo, "title": "Ship it"}, headers=auth_headers).json()["id"]
+    client.put(f"/tasks/{task_id}/move", json={"new_list_id": done, "new_position": 0}, headers=auth_headers)
+    client.put(f"/tasks/{task_id}/assign/7", headers=auth_headers)
+    client.patch(f"/tasks/{task_id}", json={"status": "done", "description": "Not recorded"}, headers=auth_headers)
+    client.patch(f"/tasks/{task_id}", json={"description": "Neither"}, headers=auth_headers)
+    assert client.get(f"/tasks/{task_id}/history", headers=auth_headers).json() == []  # Not written yet
+    activity.drain()
+
+    first = client.get(f"/tasks/{task_id}/history", params={"limit": 2}, headers=auth_headers)
+    assert [(entry["action"], entry["changes"]) for entry in first.json()] == [
+        ("updated", {"status": ["todo", "done"]}),
+        ("assigned", {"assignee_id": [None, 7]}),
+    ]
+    second = client.get(f"/tasks/{task_id}/history", params={"cursor": first.headers["X-Next-Cursor"]}, headers=auth_headers).json()
+    assert [entry["action"] for entry in second] == ["moved", "created"]
+    assert second[0]["changes"]["list_id"] == [todo, done]
+    assert second[1]["changes"]["title"] == "Ship it"
+    assert {entry["actor_id"] for entry in first.json() + second} == {1}
+
+def test_batch_writes_activity(client, db_session, list_ids, auth_headers, project_service, activity):
+    todo, done = list_ids
+    task_id = create_task(db_session, TaskCreate(list_id=todo, title="Old")).id
+    operations = [
+        {"op": "create", "data": {"list_id": todo, "title": "New"}},
+        {"op": "move", "task_id": task_id, "new_list_id": done},
+        {"op": "update", "task_id": task_id, "data": {"priority": "high"}},
+    ]
+    created_id = client.post("/tasks/batch", json={"operations": operations}, headers=auth_headers).json()["results"][0]["task_id"]
+    client.post("/tasks/batch", json={"operations": [{"op": "delete", "task_id": created_id}]}, headers=auth_headers)
+    activity.drain()
+    rows = db_session.query(TaskActivity).order_by(TaskActivity.id).all()
+    assert [(row.task_id, row.action, row.actor_id) for row in rows] == [
+        (task_id, "created", None), (created_id, "created", 1), (task_id, "moved", 1), (created_id, "deleted", 1),
+    ]
+    assert rows[2].changes["priority"] == [None, "high"]
+
+def test_recorder_backpressure_and_batches(db_session):
+    recorder = ActivityRecorder(batch_size=2, max_queue=3, enqueue_timeout=0)
+    recorder.background = False
+    now = datetime.utcnow()
+    rows = [{"task_id": index, "board_id": 1, "actor_id": 1, "action": "updated", "changes": {}, "created_at": now} for index in range(4)]
+    recorder.submit(db_session.get_bind(), rows)
+    assert recorder.stats()["queued"] == 3
+    recorder.drain()
+    assert recorder.stats() | {"max_queue": None} == {
+        "queued": 0, "max_queue": None, "enqueued": 3, "blocked": 1, "dropped": 1, "written": 3, "failed": 0, "batches": 2,
+    }
+    assert db_session.query(TaskActivity).count() == 3
+
+def test_recorder_flushes_in_background(db_session):
+    recorder = ActivityRecorder(flush_interval=0.01)
+    recorder.submit(db_session.get_bind(), [{"task_id": 1, "board_id": 1, "actor_id": 1, "action": "created", "changes": {}, "created_at": datetime.utcnow()}])
+    for _ in range(200):
+        if recorder.stats()["written"]:
+            break
+        time.sleep(0.01)
+    recorder.stop()
+    assert recorder.stats()["written"] == 1
+    assert db_session.query(TaskActivity).count() == 1
+
+def test_compact_task_activity(db_session, list_ids, activity):
+    task = create_task(db_session, TaskCreate(list_id=list_ids[0], title="Old news"))
+    update_task(db_session, task.id, {"status": "doing"})
+    activity.drain()
+    db_session.query(TaskActivity).filter(TaskActivity.action == "created").update({"created_at": datetime.utcnow() - timedelta(days=400)})
+    db_session.commit()
+    assert compact_task_activity(db_session, datetime.utcnow() - timedelta(days=180), chunk=1) == 1
+    assert [row.action for row in db_session.query(TaskActivity)] == ["updated"]
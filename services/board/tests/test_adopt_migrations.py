@@ -0,0 +1,63 @@
+import shutil
+from pathlib import Path
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from src.adopt_migrations import adopt
+
+MIGRATIONS = Path(__file__).resolve().parent.parent / "migrations"
+
+# What the old entrypoint's `alembic revision --autogenerate` left in migrations/versions
+AUTOGENERATED = '''"""Initial board schema
+
+Revision ID: 0a1b2c3d4e5f
+Revises: 
+Create Date: 2025-01-01 00:00:00.000000
+
+"""
+revision = '0a1b2c3d4e5f'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
+'''
+
+def setup_migrations(tmp_path, version_num):
+    shutil.copytree(MIGRATIONS, tmp_path / "migrations", ignore=shutil.ignore_patterns("__pycache__"))
+    stale = tmp_path / "migrations" / "versions" / "0a1b2c3d4e5f_initial_board_schema.py"
+    stale.write_text(AUTOGENERATED)
+    config = Config()
+    config.set_main_option("script_location", str(tmp_path / "migrations"))
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO alembic_version VALUES (:version_num)"), {"version_num": version_num})
+    return config, engine, stale
+
+def versions(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version_num FROM alembic_version")).scalars().all()
+
+def test_adopt_clears_an_autogenerated_revision(tmp_path):
+    config, engine, stale = setup_migrations(tmp_path, "0a1b2c3d4e5f")
+
+    adopt(config, engine)
+
+    assert not stale.exists()
+    assert (tmp_path / "migrations" / "versions" / "3a7c1e52d9b0_initial_board_schema.py").exists()
+    assert versions(engine) == []  # `alembic upgrade head` starts from the initial revision
+
+def test_adopt_keeps_a_committed_revision(tmp_path):
+    config, engine, stale = setup_migrations(tmp_path, "8d41f0b6c2a7")
+
+    adopt(config, engine)
+
+    assert not stale.exists()
+    assert versions(engine) == ["8d41f0b6c2a7"]
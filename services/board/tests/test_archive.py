@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime, timedelta
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate, TaskAttachmentCreate
+from src.crud import create_board, create_list, create_task, add_label, add_attachment, update_task, delete_list
+from src.models import Task, TaskLabel, TaskAttachment, TaskArchive, TaskLabelArchive, TaskAttachmentArchive, BoardChange
+from src.stats import get_board_stats
+from src.archive import archive_done_tasks
+from src.purge import run_purge_job
+
+# One list with tasks 0-4; 0 and 2 were done long ago, 3 was done today, the rest are open
+@pytest.fixture(scope="function")
+def list_(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Releases"))
+    list_ = create_list(db_session, ListCreate(board_id=board.id, name="Done", position=1))
+    for index in range(5):
+        task = create_task(db_session, TaskCreate(list_id=list_.id, title=f"task {index}"))
+        add_label(db_session, task.id, TaskLabelCreate(label="release"))
+        if index in (0, 2, 3):
+            update_task(db_session, task.id, {"status": "done"})
+        if index in (0, 2):
+            add_attachment(db_session, task.id, TaskAttachmentCreate(file_url=f"/files/{index}.txt"))
+            db_session.get(Task, task.id).completed_at = datetime.utcnow() - timedelta(days=120)
+    db_session.commit()
+    return list_
+
+def titles(response):
+    return [task["title"] for task in response.json()]
+
+def test_archive_moves_old_done_tasks(db_session, list_):
+    assert archive_done_tasks(db_session, datetime.utcnow() - timedelta(days=90), batch_size=1) == 2
+    assert sorted(task.title for task in db_session.query(TaskArchive)) == ["task 0", "task 2"]
+    assert sorted(task.title for task in db_session.query(Task)) == ["task 1", "task 3", "task 4"]
+    assert db_session.query(TaskLabelArchive).count() == 2
+    assert db_session.query(TaskAttachmentArchive).count() == 2
+    assert db_session.query(TaskLabel).count() == 3
+    assert db_session.query(TaskAttachment).count() == 0
+    assert db_session.query(TaskArchive.archived_at).filter(TaskArchive.archived_at.is_(None)).count() == 0
+    stats = get_board_stats(db_session, list_.board_id)
+    assert (stats["total"], stats["by_status"]) == (3, {"todo": 2, "done": 1})
+    assert db_session.query(BoardChange).filter(BoardChange.op == "delete").count() == 2
+    assert archive_done_tasks(db_session, datetime.utcnow() - timedelta(days=90)) == 0
+
+def test_list_tasks_include_archived(client, db_session, list_, auth_headers, project_service):
+    archive_done_tasks(db_session, datetime.utcnow() - timedelta(days=90))
+    path = f"/lists/{list_.id}/tasks"
+    assert titles(client.get(path, headers=auth_headers)) == ["task 1", "task 3", "task 4"]
+    first = client.get(path, params={"include_archived": True, "limit": 3}, headers=auth_headers)
+    assert titles(first) == ["task 0", "task 1", "task 2"]
+    assert [task["archived_at"] is not None for task in first.json()] == [True, False, True]
+    params = {"include_archived": True, "limit": 3, "cursor": first.headers["X-Next-Cursor"]}
+    assert titles(client.get(path, params=params, headers=auth_headers)) == ["task 3", "task 4"]
+
+def test_board_full_include_archived(client, db_session, list_, auth_headers, project_service):
+    archive_done_tasks(db_session, datetime.utcnow() - timedelta(days=90))
+    path = f"/boards/{list_.board_id}/full"
+    tasks = client.get(path, headers=auth_headers).json()["lists"][0]["tasks"]
+    assert [task["title"] for task in tasks] == ["task 1", "task 3", "task 4"]
+    tasks = client.get(path, params={"include_archived": True}, headers=auth_headers).json()["lists"][0]["tasks"]
+    assert [task["title"] for task in tasks] == [f"task {index}" for index in range(5)]
+    assert tasks[0]["labels"][0]["label"] == "release"
+    assert tasks[0]["attachments"][0]["file_url"] == "/files/0.txt"
+
+def test_completed_at_follows_status(db_session, list_):
+    task = db_session.query(Task).filter(Task.title == "task 1").one()
+    assert task.completed_at is None
+    update_task(db_session, task.id, {"status": "done"})
+    assert task.completed_at is not None
+    update_task(db_session, task.id, {"status": "todo"})
+    assert task.completed_at is None
+
+def test_purging_a_list_removes_archived_rows(db_session, list_):
+    archive_done_tasks(db_session, datetime.utcnow() - timedelta(days=90))
+    run_purge_job(db_session, delete_list(db_session, list_.id).id)
+    for model in (Task, TaskLabel, TaskArchive, TaskLabelArchive, TaskAttachmentArchive):
+        assert db_session.query(model).count() == 0, model.__name__
+
+def test_task_permission_finds_archived_tasks(client, db_session, list_, auth_headers, project_service):
+    archive_done_tasks(db_session, datetime.utcnow() - timedelta(days=90))
+    task_id = db_session.query(TaskArchive.id).order_by(TaskArchive.id).first()[0]
+    response = client.get(f"/tasks/{task_id}/permission/1", headers=auth_headers)
+    assert response.json() == {"task_id": task_id, "project_id": 1, "allowed": True}
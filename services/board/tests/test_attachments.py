@@ -0,0 +1,112 @@
+import os
+import json
+import pytest
+from src.schemas import BoardCreate, ListCreate, TaskCreate
+from src.crud import create_board, create_list, create_task
+from src.models import TaskAttachment
+from src import storage, main
+
+@pytest.fixture(scope="function")
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage.attachment_store, "root", str(tmp_path))
+    monkeypatch.setattr(storage, "ATTACHMENT_ACCEL_REDIRECT_PREFIX", "")
+    return tmp_path
+
+@pytest.fixture(scope="function")
+def task_id(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Files"))
+    list_ = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+    return create_task(db_session, TaskCreate(list_id=list_.id, title="Report")).id
+
+def upload(client, task_id, content, headers, filename="report.txt", **extra):
+    return client.post(f"/tasks/{task_id}/attachments/upload", params={"filename": filename}, content=content, headers={**headers, **extra})
+
+def blobs(root):
+    return [name for _, dirs, files in os.walk(root) for name in files]
+
+def test_upload_is_stored_once_by_content(client, task_id, store, auth_headers, project_service):
+    content = b"quarterly numbers\n" * 1000
+    first = upload(client, task_id, content, auth_headers)
+    assert first.status_code == 200
+    body = first.json()
+    assert body["size"] == len(content)
+    assert body["content_type"] == "text/plain"
+    assert body["file_url"] == f"/board_service/attachments/{body['id']}/content"
+    second = upload(client, task_id, content, auth_headers, filename="copy.bin", **{"Content-Type": "application/pdf"})
+    assert second.json()["sha256"] == body["sha256"]
+    assert second.json()["content_type"] == "application/pdf"
+    assert blobs(store) == [body["sha256"]]
+
+def test_download_full_and_ranges(client, task_id, store, auth_headers, project_service):
+    content = bytes(range(256)) * 40
+    attachment = upload(client, task_id, content, auth_headers, filename="données.bin").json()
+    url = f"/attachments/{attachment['id']}/content"
+    full = client.get(url, headers=auth_headers)
+    assert full.status_code == 200
+    assert full.content == content
+    assert full.headers["accept-ranges"] == "bytes"
+    assert "filename*=UTF-8''donn%C3%A9es.bin" in full.headers["content-disposition"]
+
+    part = client.get(url, headers={**auth_headers, "Range": "bytes=100-199"})
+    assert part.status_code == 206
+    assert part.content == content[100:200]
+    assert part.headers["content-range"] == f"bytes 100-199/{len(content)}"
+    suffix = client.get(url, headers={**auth_headers, "Range": "bytes=-10"})
+    assert suffix.content == content[-10:]
+    beyond = client.get(url, headers={**auth_headers, "Range": f"bytes={len(content)}-"})
+    assert beyond.status_code == 416
+    assert beyond.headers["content-range"] == f"bytes */{len(content)}"
+    cached = client.get(url, headers={**auth_headers, "If-None-Match": full.headers["etag"]})
+    assert cached.status_code == 304
+
+def test_download_handed_to_nginx(client, task_id, store, auth_headers, project_service, monkeypatch):
+    attachment = upload(client, task_id, b"hello", auth_headers).json()
+    monkeypatch.setattr(storage, "ATTACHMENT_ACCEL_REDIRECT_PREFIX", "/protected-attachments/")
+    response = client.get(f"/attachments/{attachment['id']}/content", headers=auth_headers)
+    digest = attachment["sha256"]
+    assert response.headers["x-accel-redirect"] == f"/protected-attachments/{digest[:2]}/{digest[2:4]}/{digest}"
+    assert response.content == b""
+
+def test_oversized_upload_is_rejected(client, task_id, store, auth_headers, project_service, monkeypatch):
+    monkeypatch.setattr(storage.attachment_store, "max_bytes", 1000)
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 500
+    response = client.post(f"/tasks/{task_id}/attachments/upload", params={"filename": "big.bin"}, content=chunks(), headers=auth_headers)
+    assert response.status_code == 413
+    assert blobs(store) == []
+
+def import_attachment(client, headers, **attachment):
+    lines = [
+        {"type": "board", "data": {"name": "Imported", "project_id": 2}},
+        {"type": "list", "data": {"id": 1, "name": "Todo"}},
+        {"type": "task", "data": {"id": 1, "list_id": 1, "title": "Copied"}},
+        {"type": "attachment", "data": {"task_id": 1, "file_url": "https://old.example.com/file", "filename": "f.txt", "size": 21, **attachment}},
+    ]
+    return client.post("/boards/import", content="\n".join(json.dumps(line) for line in lines), headers=headers)
+
+def test_import_rejects_digests_that_are_not_sha256(client, task_id, store, auth_headers, project_service, tmp_path_factory):
+    secret = tmp_path_factory.mktemp("outside") / "secret.txt"
+    secret.write_text("not for the importer\n")
+    response = import_attachment(client, auth_headers, sha256="../" * 8 + str(secret).lstrip("/"))
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Line 4: sha256")
+    with pytest.raises(ValueError):
+        storage.attachment_store.path_for("../../etc/passwd")
+
+def test_import_keeps_only_readable_stored_files(client, db_session, task_id, store, auth_headers, project_service):
+    digest = upload(client, task_id, b"shared file content\n", auth_headers).json()["sha256"]
+    assert import_attachment(client, auth_headers, sha256=digest).json()["attachments"] == 1
+    attachment = db_session.query(TaskAttachment).filter(TaskAttachment.task_id != task_id).one()
+    assert (attachment.sha256, attachment.file_url) == (digest, f"/board_service/attachments/{attachment.id}/content")
+    assert client.get(attachment.file_url.removeprefix("/board_service"), headers=auth_headers).content == b"shared file content\n"
+    db_session.delete(attachment)
+    db_session.commit()
+
+    project_service.allowed = {2}  # The file's project (1) isn't readable: imported as a plain link
+    main.permission_cache.clear()
+    assert import_attachment(client, auth_headers, sha256=digest).json()["attachments"] == 1
+    unknown = "0" * 64  # Well formed but not stored here
+    assert import_attachment(client, auth_headers, sha256=unknown).status_code == 200
+    rows = db_session.query(TaskAttachment).filter(TaskAttachment.task_id != task_id).all()
+    assert [(row.sha256, row.size, row.file_url) for row in rows] == [(None, None, "https://old.example.com/file")] * 2
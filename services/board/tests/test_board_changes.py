@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime, timedelta
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate, TaskMove
+from src.crud import create_board, create_list, create_task, update_task, move_task, delete_task, add_label
+from src.changes import compact_board_changes
+from src.models import Board, BoardChange
+
+@pytest.fixture(scope="function")
+def board(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Synced Board"))
+    todo = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+    return board.id, todo.id
+
+def changes(client, headers, board_id, since):
+    response = client.get(f"/boards/{board_id}/changes", params={"since": since}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+def test_changes_since_version(client, db_session, board, auth_headers, project_service):
+    board_id, todo = board
+    keep = create_task(db_session, TaskCreate(list_id=todo, title="Keep"))
+    gone = create_task(db_session, TaskCreate(list_id=todo, title="Gone"))
+    keep_id, gone_id = keep.id, gone.id
+    since = db_session.get(Board, board_id).version
+    assert since == 3  # List and two tasks, one version each
+
+    update_task(db_session, keep_id, {"title": "Kept"})
+    label = add_label(db_session, keep_id, TaskLabelCreate(label="bug"))
+    delete_task(db_session, gone_id)
+    data = changes(client, auth_headers, board_id, since)
+    assert data["version"] == since + 3
+    assert data["full"] is False
+    assert [task["title"] for task in data["tasks"]] == ["Kept"]
+    assert [row["id"] for row in data["labels"]] == [label.id]
+    assert data["lists"] == []
+    assert data["deleted"]["tasks"] == [gone_id]
+
+    nothing = changes(client, auth_headers, board_id, data["version"])
+    assert (nothing["tasks"], nothing["deleted"]["tasks"]) == ([], [])
+
+def test_task_moved_to_another_board_is_a_tombstone(client, db_session, board, auth_headers, project_service):
+    board_id, todo = board
+    other = create_board(db_session, BoardCreate(project_id=1, name="Other"))
+    elsewhere = create_list(db_session, ListCreate(board_id=other.id, name="Elsewhere", position=1))
+    task = create_task(db_session, TaskCreate(list_id=todo, title="Task"))
+    task_id, other_id, elsewhere_id = task.id, other.id, elsewhere.id
+    since = db_session.get(Board, board_id).version
+    move_task(db_session, task_id, TaskMove(new_list_id=elsewhere_id))
+    assert changes(client, auth_headers, board_id, since)["deleted"]["tasks"] == [task_id]
+    assert [row["id"] for row in changes(client, auth_headers, other_id, 0)["tasks"]] == [task_id]
+
+def test_compaction_falls_back_to_snapshot(client, db_session, board, auth_headers, project_service):
+    board_id, todo = board
+    task = create_task(db_session, TaskCreate(list_id=todo, title="A"))
+    for title in "BCD":
+        update_task(db_session, task.id, {"title": title})
+    # Only the newest row per entity survives compaction
+    assert compact_board_changes(db_session, board_id, cutoff=datetime.utcnow() - timedelta(days=1)) == 3
+    assert db_session.query(BoardChange).filter(BoardChange.board_id == board_id).count() == 2
+    assert [task["title"] for task in changes(client, auth_headers, board_id, 1)["tasks"]] == ["D"]
+
+    compact_board_changes(db_session, board_id, cutoff=datetime.utcnow() + timedelta(seconds=1))
+    assert db_session.query(BoardChange).count() == 0
+    data = changes(client, auth_headers, board_id, 1)
+    assert data["full"] is True
+    assert data["snapshot"]["lists"][0]["tasks"][0]["title"] == "D"
+    assert changes(client, auth_headers, board_id, data["version"])["full"] is False
@@ -0,0 +1,49 @@
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate, TaskAttachmentCreate
+from src.crud import create_board, create_list, create_task, add_label, add_attachment
+from src.models import Task, TaskLabel
+
+def make_board(db_session, lists, tasks_per_list):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Big Board"))
+    for position in range(lists):
+        list_ = create_list(db_session, ListCreate(board_id=board.id, name=f"List {position}", position=position))
+        db_session.add_all(Task(list_id=list_.id, title=f"Task {i}") for i in range(tasks_per_list))
+    db_session.commit()
+    task_ids = [task_id for (task_id,) in db_session.query(Task.id)]
+    db_session.add_all(TaskLabel(task_id=task_id, label="bug") for task_id in task_ids)
+    db_session.commit()
+    return board.id
+
+def test_get_board_full_nested_payload(client, db_session, auth_headers, project_service):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Board"))
+    second = create_list(db_session, ListCreate(board_id=board.id, name="Doing", position=2))
+    first = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+    task = create_task(db_session, TaskCreate(list_id=first.id, title="Task"))
+    add_label(db_session, task.id, TaskLabelCreate(label="bug"))
+    add_attachment(db_session, task.id, TaskAttachmentCreate(file_url="http://files/a.png"))
+    board_id, first_id, second_id = board.id, first.id, second.id
+
+    response = client.get(f"/boards/{board_id}/full", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [list_["id"] for list_ in data["lists"]] == [first_id, second_id]
+    assert data["lists"][1]["tasks"] == []
+    task_data = data["lists"][0]["tasks"][0]
+    assert task_data["title"] == "Task"
+    assert [label["label"] for label in task_data["labels"]] == ["bug"]
+    assert task_data["attachments"][0]["file_url"] == "http://files/a.png"
+    assert len(project_service) == 1
+
+def test_get_board_full_query_count_is_constant(client, db_session, auth_headers, project_service, query_log):
+    small_board = make_board(db_session, lists=2, tasks_per_list=5)
+    large_board = make_board(db_session, lists=5, tasks_per_list=1000)
+
+    query_log.clear()
+    response = client.get(f"/boards/{small_board}/full", headers=auth_headers)
+    assert response.status_code == 200
+    small_queries = len(query_log)
+
+    query_log.clear()
+    response = client.get(f"/boards/{large_board}/full", headers=auth_headers)
+    assert response.status_code == 200
+    assert sum(len(list_["tasks"]) for list_ in response.json()["lists"]) == 5000
+    assert len(query_log) == small_queries
@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime, timedelta
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskMove
+from src.crud import create_board, create_list, create_task, update_task, move_task, assign_task, delete_task
+from src.stats import get_board_stats, reconcile_board_stats
+from src.models import BoardTaskStat
+
+@pytest.fixture(scope="function")
+def board_lists(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Stats Board"))
+    todo = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+    done = create_list(db_session, ListCreate(board_id=board.id, name="Done", position=2))
+    other = create_board(db_session, BoardCreate(project_id=1, name="Other Board"))
+    elsewhere = create_list(db_session, ListCreate(board_id=other.id, name="Elsewhere", position=1))
+    return board.id, other.id, todo.id, done.id, elsewhere.id
+
+def test_counters_follow_task_writes(db_session, board_lists):
+    board_id, other_id, todo, done, elsewhere = board_lists
+    past = datetime.utcnow() - timedelta(days=1)
+    a = create_task(db_session, TaskCreate(list_id=todo, title="A", priority="high", assignee_id=1, due_date=past))
+    b = create_task(db_session, TaskCreate(list_id=todo, title="B", priority="low", due_date=past))
+    c = create_task(db_session, TaskCreate(list_id=todo, title="C", priority="low"))
+    update_task(db_session, b.id, {"status": "done"})
+    assign_task(db_session, c.id, 2)
+    move_task(db_session, c.id, TaskMove(new_list_id=elsewhere))
+    delete_task(db_session, a.id)
+    create_task(db_session, TaskCreate(list_id=done, title="D", assignee_id=2, due_date=past))
+
+    stats = get_board_stats(db_session, board_id)
+    assert stats["total"] == 2
+    assert stats["by_status"] == {"done": 1, "todo": 1}
+    assert stats["by_priority"] == {"low": 1, "none": 1}
+    assert stats["by_assignee"] == {"none": 1, "2": 1}
+    assert stats["overdue"] == 1  # B is past due but done
+    assert get_board_stats(db_session, other_id)["by_assignee"] == {"2": 1}
+    assert reconcile_board_stats(db_session, board_id) == []
+
+def test_reconcile_reports_and_fixes_drift(db_session, board_lists):
+    board_id, _, todo, _, _ = board_lists
+    create_task(db_session, TaskCreate(list_id=todo, title="A"))
+    db_session.query(BoardTaskStat).filter(BoardTaskStat.dimension == "status").update({"task_count": 5})
+    db_session.commit()
+    drift = reconcile_board_stats(db_session, board_id)
+    assert drift == [{"board_id": board_id, "dimension": "status", "value": "todo", "expected": 1, "actual": 5}]
+    assert get_board_stats(db_session, board_id)["by_status"] == {"todo": 1}
+    assert reconcile_board_stats(db_session, board_id) == []
+
+def test_batch_keeps_counters(client, db_session, board_lists, auth_headers, project_service):
+    board_id, _, todo, done, _ = board_lists
+    task = create_task(db_session, TaskCreate(list_id=todo, title="A"))
+    task_id = task.id
+    operations = [
+        {"op": "create", "data": {"list_id": todo, "title": "New", "priority": "high"}},
+        {"op": "update", "task_id": task_id, "data": {"status": "done"}},
+        {"op": "move", "task_id": task_id, "new_list_id": done},
+    ]
+    assert client.post("/tasks/batch", json={"operations": operations}, headers=auth_headers).status_code == 200
+    assert reconcile_board_stats(db_session, board_id) == []
+    response = client.get(f"/boards/{board_id}/stats", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["by_status"] == {"done": 1, "todo": 1}
+
+def test_project_boards_with_status_counts(client, db_session, board_lists, auth_headers, project_service):
+    board_id, other_id, todo, done, elsewhere = board_lists
+    create_task(db_session, TaskCreate(list_id=todo, title="A"))
+    b = create_task(db_session, TaskCreate(list_id=done, title="B"))
+    update_task(db_session, b.id, {"status": "done"})
+    create_board(db_session, BoardCreate(project_id=2, name="Elsewhere"))
+    boards = client.get("/projects/1/boards", headers=auth_headers).json()
+    assert [(board["id"], board["by_status"], board["total"]) for board in boards] == [
+        (board_id, {"todo": 1, "done": 1}, 2), (other_id, {}, 0),
+    ]
@@ -0,0 +1,54 @@
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate, TaskAttachmentCreate
+from src.crud import create_board, create_list, create_task, add_label, add_attachment, delete_list
+from src.models import Board, List, Task, TaskLabel, TaskAttachment, BoardLabel
+from src.stats import get_board_stats
+from src.transfer import clone_board
+
+def make_template(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Sprint", is_template=True))
+    for position, name in enumerate(["Todo", "Doing", "Gone"]):
+        list_ = create_list(db_session, ListCreate(board_id=board.id, name=name, position=position))
+        for index in range(2):
+            task = create_task(db_session, TaskCreate(list_id=list_.id, title=f"{name} {index}", priority="high"))
+            add_label(db_session, task.id, TaskLabelCreate(label="setup"))
+        add_attachment(db_session, task.id, TaskAttachmentCreate(file_url="https://example.com/guide"))
+    delete_list(db_session, list_.id)  # Deleted lists are not copied
+    return board
+
+def test_clone_board_copies_everything(db_session):
+    template = make_template(db_session)
+    result = clone_board(db_session, template, 2, "Sprint 1", batch_size=3)
+    board = result["board"]
+    assert (board.project_id, board.name, board.is_template) == (2, "Sprint 1", False)
+    assert (result["lists"], result["tasks"], result["labels"], result["attachments"]) == (2, 4, 4, 2)
+    lists = db_session.query(List).filter(List.board_id == board.id).order_by(List.position).all()
+    assert [list_.name for list_ in lists] == ["Todo", "Doing"]
+    tasks = db_session.query(Task).filter(Task.list_id.in_([list_.id for list_ in lists])).order_by(Task.id).all()
+    assert [(task.title, task.list_id) for task in tasks] == [
+        ("Todo 0", lists[0].id), ("Todo 1", lists[0].id), ("Doing 0", lists[1].id), ("Doing 1", lists[1].id),
+    ]
+    label_id = db_session.query(BoardLabel.id).filter(BoardLabel.board_id == board.id).scalar()
+    assert {(label.label, label.label_id) for label in db_session.query(TaskLabel).filter(TaskLabel.task_id.in_([task.id for task in tasks]))} == {("setup", label_id)}
+    assert [attachment.file_url for attachment in db_session.query(TaskAttachment).filter(TaskAttachment.task_id == tasks[-1].id)] == ["https://example.com/guide"]
+    assert get_board_stats(db_session, board.id)["total"] == 4
+
+def test_clone_route(client, db_session, auth_headers, project_service):
+    template = make_template(db_session)
+    templates = client.get("/board-templates", params={"project_id": 1}, headers=auth_headers).json()
+    assert [(board["id"], board["is_template"]) for board in templates] == [(template.id, True)]
+    response = client.post(f"/boards/{template.id}/clone", params={"target_project_id": 2}, headers=auth_headers)
+    assert response.status_code == 200
+    board_id = response.json()["board"]["id"]
+    assert response.json()["board"]["name"] == "Sprint"
+    assert project_service == [("GET", "/projects/1/members/1"), ("POST", "/projects/members/check")]  # 2 only, 1 is cached
+    full = client.get(f"/boards/{board_id}/full", headers=auth_headers).json()
+    assert [len(list_["tasks"]) for list_ in full["lists"]] == [2, 2]
+    hits = client.get("/search/tasks", params={"q": "doing", "project_id": 2}, headers=auth_headers).json()
+    assert sorted(task["title"] for task in hits) == ["Doing 0", "Doing 1"]
+
+def test_clone_needs_both_projects(client, db_session, auth_headers, project_service):
+    template = make_template(db_session)
+    project_service.allowed = {1}
+    response = client.post(f"/boards/{template.id}/clone", params={"target_project_id": 2}, headers=auth_headers)
+    assert response.status_code == 403
+    assert db_session.query(Board).count() == 1
@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskMove
+from src.crud import create_board, create_list, create_task, move_task, delete_task
+from src.events import EventHub, RESYNC, emit, hub
+from src.broker import Broker
+from src.main import board_event_stream
+
+@pytest.fixture(scope="function")
+def board(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Live Board"))
+    list_ = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+    return board.id, list_.id
+
+async def drain(subscription):
+    await asyncio.sleep(0)  # Let call_soon_threadsafe callbacks run
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+@pytest.mark.asyncio
+async def test_committed_writes_reach_board_subscribers(db_session, board):
+    board_id, list_id = board
+    await hub.start(broker_url="")
+    try:
+        subscription = hub.subscribe(board_id)
+        other = hub.subscribe(board_id + 1)
+        task = create_task(db_session, TaskCreate(list_id=list_id, title="A"))
+        move_task(db_session, task.id, TaskMove(new_list_id=list_id, new_position=0))
+        delete_task(db_session, task.id)
+        events = await drain(subscription)
+        assert [event["type"] for event in events] == ["task.created", "task.moved", "task.deleted"]
+        assert events[0]["data"]["title"] == "A"
+        assert await drain(other) == []
+        hub.unsubscribe(subscription)
+        hub.unsubscribe(other)
+        assert hub.subscriber_count() == 0
+    finally:
+        await hub.stop()
+
+@pytest.mark.asyncio
+async def test_rolled_back_writes_are_not_published(db_session, board):
+    board_id, _ = board
+    await hub.start(broker_url="")
+    try:
+        subscription = hub.subscribe(board_id)
+        emit(db_session, board_id, "list.updated", {"id": 1})
+        db_session.rollback()
+        db_session.commit()
+        assert await drain(subscription) == []
+        hub.unsubscribe(subscription)
+    finally:
+        await hub.stop()
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_resync():
+    local = EventHub(queue_size=3)
+    await local.start(broker_url="")
+    subscription = local.subscribe(1)
+    local.dispatch([{"board_id": 1, "type": "task.updated", "data": {"id": i}} for i in range(5)])
+    events = await drain(subscription)
+    assert [event["type"] for event in events] == ["task.updated", "task.updated", "resync"]
+    await local.stop()
+
+@pytest.mark.asyncio
+async def test_broker_relays_between_workers():
+    server = await asyncio.start_server(Broker().handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    workers = [EventHub(), EventHub()]
+    for worker in workers:
+        await worker.start(broker_url=f"tcp://127.0.0.1:{port}")
+    subscriptions = [worker.subscribe(7) for worker in workers]
+    for _ in range(100):
+        if all(worker._writer is not None for worker in workers):
+            break
+        await asyncio.sleep(0.01)
+    workers[0].publish([{"board_id": 7, "type": "list.created", "data": {"id": 3}}])
+    received = [await asyncio.wait_for(subscription.queue.get(), 2) for subscription in subscriptions]
+    assert [event["data"] for event in received] == [{"id": 3}, {"id": 3}]
+    for worker in workers:
+        await worker.stop()
+    await asyncio.sleep(0.05)  # Let the broker see both connections close
+    server.close()
+    await server.wait_closed()
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_every_worker():
+    server = await asyncio.start_server(Broker().handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    workers = [EventHub(), EventHub()]
+    received = [asyncio.Queue(), asyncio.Queue()]
+    for worker, queue in zip(workers, received):
+        worker.on("permission.invalidate", queue.put_nowait)
+        await worker.start(broker_url=f"tcp://127.0.0.1:{port}")
+    for _ in range(100):
+        if all(worker.connected for worker in workers):
+            break
+        await asyncio.sleep(0.01)
+    workers[0].broadcast("permission.invalidate", {"project_id": 1, "user_id": 2})
+    assert [await asyncio.wait_for(queue.get(), 2) for queue in received] == [{"project_id": 1, "user_id": 2}] * 2
+    for worker in workers:
+        await worker.stop()
+    await asyncio.sleep(0.05)
+    server.close()
+    await server.wait_closed()
+
+class FakeRequest:
+    async def is_disconnected(self):
+        return False
+
+@pytest.mark.asyncio
+async def test_event_stream_formats_and_ends_on_resync():
+    local = EventHub()
+    subscription = local.subscribe(1)
+    subscription.queue.put_nowait({"board_id": 1, "type": "task.created", "data": {"id": 5}})
+    subscription.queue.put_nowait(RESYNC)
+    chunks = [chunk async for chunk in board_event_stream(FakeRequest(), subscription)]
+    assert chunks == ["retry: 3000\n\n", 'event: task.created\ndata: {"id":5}\n\n', "event: resync\ndata: null\n\n"]
+
+def test_event_feed_checks_permission(client, db_session, board, auth_headers, monkeypatch):
+    from src import main
+    board_id, _ = board
+    async def deny(base_url, method, path, **kwargs):
+        return 404, None
+    monkeypatch.setattr(main.upstreams, "request", deny)
+    main.permission_cache.clear()
+    assert client.get(f"/boards/{board_id}/events", headers=auth_headers).status_code == 403
+    assert client.get("/boards/999/events", headers=auth_headers).status_code == 404
@@ -0,0 +1,51 @@
+import pytest
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate, TaskMove
+from src.crud import create_board, create_list, create_task, add_label, move_task, get_board_tasks_by_labels
+from src.models import BoardLabel, TaskLabel
+
+@pytest.fixture(scope="function")
+def board(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Labelled"))
+    list_ = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+    tasks = [create_task(db_session, TaskCreate(list_id=list_.id, title=f"Task {i}")) for i in range(4)]
+    for task, labels in zip(tasks, [["bug", "frontend"], ["bug"], ["frontend", "ux"], []]):
+        for label in labels:
+            add_label(db_session, task.id, TaskLabelCreate(label=label))
+    return board.id, [task.id for task in tasks]
+
+def test_labels_are_deduplicated_per_board(db_session, board):
+    board_id, task_ids = board
+    again = add_label(db_session, task_ids[0], TaskLabelCreate(label="  Bug "))
+    assert again.label == "bug"
+    assert db_session.query(TaskLabel).filter(TaskLabel.task_id == task_ids[0]).count() == 2
+    assert sorted(name for (name,) in db_session.query(BoardLabel.name)) == ["bug", "frontend", "ux"]
+
+def test_filter_by_all_or_any_label(client, db_session, board, auth_headers, project_service):
+    board_id, task_ids = board
+    def titles(**params):
+        response = client.get(f"/boards/{board_id}/tasks", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        return [task["title"] for task in response.json()]
+    assert titles(labels="bug,frontend") == ["Task 0"]
+    assert titles(labels="bug,frontend", match="any") == ["Task 0", "Task 1", "Task 2"]
+    assert titles(labels="bug,unknown") == []
+    assert titles(labels="unknown", match="any") == []
+
+    first = client.get(f"/boards/{board_id}/tasks", params={"labels": "bug,ux", "match": "any", "limit": 2}, headers=auth_headers)
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/boards/{board_id}/tasks", params={"labels": "bug,ux", "match": "any", "cursor": cursor}, headers=auth_headers)
+    assert [task["title"] for task in first.json() + second.json()] == ["Task 0", "Task 1", "Task 2"]
+    assert "X-Next-Cursor" not in second.headers
+
+    labels = client.get(f"/boards/{board_id}/labels", headers=auth_headers).json()
+    assert [(label["name"], label["task_count"]) for label in labels] == [("bug", 2), ("frontend", 2), ("ux", 1)]
+
+def test_labels_follow_task_to_another_board(db_session, board):
+    board_id, task_ids = board
+    other = create_board(db_session, BoardCreate(project_id=1, name="Other"))
+    elsewhere = create_list(db_session, ListCreate(board_id=other.id, name="Elsewhere", position=1))
+    move_task(db_session, task_ids[0], TaskMove(new_list_id=elsewhere.id))
+    tasks, _ = get_board_tasks_by_labels(db_session, other.id, ["bug", "frontend"])
+    assert [task.id for task in tasks] == [task_ids[0]]
+    tasks, _ = get_board_tasks_by_labels(db_session, board_id, ["bug"])
+    assert [task.id for task in tasks] == [task_ids[1]]
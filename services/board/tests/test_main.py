@@ -64,8 +64,8 @@ def test_delete_list(db_session):
     board = create_board(db_session, board_data)
     list_data = ListCreate(board_id=board.id, name="List to Delete", position=1)
     list_ = create_list(db_session, list_data)
-    result = delete_list(db_session, list_.id)
-    assert result is True
+    job = delete_list(db_session, list_.id)
+    assert (job.entity, job.entity_id, job.status) == ("list", list_.id, "pending")
     lists = get_lists_by_board(db_session, board.id)
     assert len(lists) == 0
 
@@ -0,0 +1,48 @@
+import pytest
+from datetime import datetime, timedelta
+from src.schemas import BoardCreate, ListCreate, TaskCreate
+from src.crud import create_board, create_list, create_task, update_task
+
+NOW = datetime(2026, 3, 2, 12, 0)
+
+# Two boards in project 1 and one in project 2, with tasks for users 1 and 2
+@pytest.fixture(scope="function")
+def tasks(db_session):
+    titles = {}
+    for project_id, board_name, rows in [
+        (1, "Web", [("b", 2, 1, "todo"), ("undated", None, 1, "todo"), ("other", 1, 2, "todo")]),
+        (1, "API", [("a", 1, 1, "doing"), ("shipped", 3, 1, "done")]),
+        (2, "Ops", [("c", 4, 1, "todo")]),
+    ]:
+        board = create_board(db_session, BoardCreate(project_id=project_id, name=board_name))
+        list_ = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+        for title, due_in, assignee_id, status in rows:
+            due_date = NOW + timedelta(days=due_in) if due_in is not None else None
+            task = create_task(db_session, TaskCreate(list_id=list_.id, title=title, assignee_id=assignee_id, due_date=due_date))
+            if status != "todo":
+                update_task(db_session, task.id, {"status": status})
+            titles[title] = (task.id, board.id)
+    return titles
+
+def titles_of(response):
+    return [task["title"] for task in response.json()]
+
+def test_my_tasks_across_boards(client, tasks, auth_headers, project_service):
+    first = client.get("/me/tasks", params={"limit": 3}, headers=auth_headers)
+    assert titles_of(first) == ["a", "b", "shipped"]
+    assert first.json()[0]["board_id"] == tasks["a"][1]
+    assert first.json()[0]["project_id"] == 1
+    second = client.get("/me/tasks", params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]}, headers=auth_headers)
+    assert titles_of(second) == ["c", "undated"]
+    assert "X-Next-Cursor" not in second.headers
+    assert project_service == [("POST", "/projects/members/check")]  # Then cached
+
+def test_my_tasks_filters(client, tasks, auth_headers, project_service):
+    params = {"status": ["todo", "doing"], "due_before": (NOW + timedelta(days=3)).isoformat()}
+    assert titles_of(client.get("/me/tasks", params=params, headers=auth_headers)) == ["a", "b"]
+    params = {"status": "todo", "due_after": (NOW + timedelta(days=2)).isoformat()}
+    assert titles_of(client.get("/me/tasks", params=params, headers=auth_headers)) == ["b", "c"]
+
+def test_my_tasks_skip_projects_without_access(client, tasks, auth_headers, project_service):
+    project_service.allowed = {1}
+    assert titles_of(client.get("/me/tasks", headers=auth_headers)) == ["a", "b", "shipped", "undated"]
@@ -0,0 +1,61 @@
+import pytest
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskMove
+from src.crud import create_board, create_list, create_task, move_task, get_tasks_by_list, rebalance_task_positions
+from src.ordering import pop_pending_rebalances
+
+@pytest.fixture(scope="function")
+def board_lists(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Board"))
+    todo = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+    done = create_list(db_session, ListCreate(board_id=board.id, name="Done", position=2))
+    return todo.id, done.id
+
+def titles(db_session, list_id):
+    return [task.title for task in get_tasks_by_list(db_session, list_id)]
+
+def test_create_task_appends(db_session, board_lists):
+    todo, _ = board_lists
+    for title in "ABC":
+        create_task(db_session, TaskCreate(list_id=todo, title=title))
+    assert titles(db_session, todo) == ["A", "B", "C"]
+
+def test_move_task_writes_one_row(db_session, board_lists, query_log):
+    todo, done = board_lists
+    tasks = {title: create_task(db_session, TaskCreate(list_id=todo, title=title)) for title in "ABCD"}
+    query_log.clear()
+    move_task(db_session, tasks["D"].id, TaskMove(new_list_id=todo, new_position=1))
+    assert len([s for s in query_log if s.lstrip().upper().startswith("UPDATE TASKS")]) == 1
+    assert titles(db_session, todo) == ["A", "D", "B", "C"]
+
+    move_task(db_session, tasks["C"].id, TaskMove(new_list_id=todo, new_position=0))
+    move_task(db_session, tasks["A"].id, TaskMove(new_list_id=done))
+    assert titles(db_session, todo) == ["C", "D", "B"]
+    assert titles(db_session, done) == ["A"]
+
+def test_crowded_positions_are_rebalanced(db_session, board_lists):
+    todo, _ = board_lists
+    pop_pending_rebalances()
+    first = create_task(db_session, TaskCreate(list_id=todo, title="first"))
+    last = create_task(db_session, TaskCreate(list_id=todo, title="last"))
+    # Keep inserting right after "first" until the gap is split down to nothing
+    for i in range(80):
+        task = create_task(db_session, TaskCreate(list_id=todo, title=f"t{i}"))
+        move_task(db_session, task.id, TaskMove(new_list_id=todo, new_position=1))
+    expected = ["first"] + [f"t{i}" for i in reversed(range(80))] + ["last"]
+    assert titles(db_session, todo) == expected
+    assert todo in pop_pending_rebalances()
+
+    rebalance_task_positions(db_session, todo)
+    db_session.commit()
+    tasks = get_tasks_by_list(db_session, todo)
+    assert [task.title for task in tasks] == expected
+    assert [task.position for task in tasks] == [1024.0 * (i + 1) for i in range(len(tasks))]
+    assert (tasks[0].id, tasks[-1].id) == (first.id, last.id)
+
+def test_move_route_places_task(client, db_session, board_lists, auth_headers, project_service):
+    todo, _ = board_lists
+    ids = [create_task(db_session, TaskCreate(list_id=todo, title=title)).id for title in "ABC"]
+    response = client.put(f"/tasks/{ids[2]}/move", json={"new_list_id": todo, "new_position": 0}, headers=auth_headers)
+    assert response.status_code == 200
+    response = client.get(f"/lists/{todo}/tasks", headers=auth_headers)
+    assert [task["title"] for task in response.json()] == ["C", "A", "B"]
@@ -0,0 +1,97 @@
+import asyncio
+import jwt
+from src.permission_cache import PermissionCache
+from src.crud import create_board
+from src.schemas import BoardCreate
+from src import main
+from src.auth import JWT_SECRET, ALGORITHM
+from src.events import BROKER_CONNECTED
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_cache_hit_and_miss():
+    cache = PermissionCache(ttl=30, negative_ttl=5, max_entries=10)
+    assert cache.get(1, 1) is None
+    cache.set(1, 1, True)
+    assert cache.get(1, 1) is True
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_cache_expires_denials_before_grants():
+    clock = FakeClock()
+    cache = PermissionCache(ttl=30, negative_ttl=5, max_entries=10, clock=clock)
+    cache.set(1, 1, True)
+    cache.set(1, 2, False)
+    clock.now = 10
+    assert cache.get(1, 1) is True
+    assert cache.get(1, 2) is None
+    clock.now = 31
+    assert cache.get(1, 1) is None
+
+def test_cache_evicts_least_recently_used():
+    cache = PermissionCache(ttl=30, negative_ttl=5, max_entries=2)
+    cache.set(1, 1, True)
+    cache.set(1, 2, True)
+    cache.get(1, 1)  # 1,1 is now most recently used
+    cache.set(1, 3, True)
+    assert cache.get(1, 2) is None
+    assert cache.get(1, 1) is True
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_invalidate_member_and_project():
+    cache = PermissionCache(ttl=30, negative_ttl=5, max_entries=10)
+    cache.set(1, 1, True)
+    cache.set(1, 2, False)
+    cache.set(2, 1, True)
+    assert cache.invalidate(1, 1) == 1
+    assert cache.get(1, 1) is None
+    assert cache.invalidate(1) == 1
+    assert cache.get(1, 2) is None
+    assert cache.get(2, 1) is True
+
+def test_board_route_uses_cached_decision(client, db_session, auth_headers, project_service):
+    board = create_board(db_session, BoardCreate(project_id=7, name="Cached Board"))
+    assert client.get(f"/boards/{board.id}", headers=auth_headers).status_code == 200
+    assert client.get(f"/boards/{board.id}/lists", headers=auth_headers).status_code == 200
+    assert project_service == [("GET", "/projects/7/members/1")]
+
+def test_allowed_projects_for_checks_misses_in_one_call(project_service):
+    project_service.allowed = {1, 3}
+    assert asyncio.run(main.allowed_projects_for([1, 2, 3, None], 5, "token")) == {1, 3}
+    assert asyncio.run(main.allowed_projects_for([1, 2, 4], 5, "token")) == {1}
+    assert project_service == [("POST", "/projects/members/check"), ("POST", "/projects/members/check")]
+    assert main.permission_cache.get(2, 5) is False
+
+def test_allowed_projects_for_without_batch_endpoint(project_service, monkeypatch):
+    async def old_project_service(base_url, method, path, **kwargs):
+        if path == "/projects/members/check":
+            return 404, {"detail": "Not Found"}
+        return (200, {"role": "member"}) if path == "/projects/1/members/5" else (403, {})
+    monkeypatch.setattr(main.upstreams, "request", old_project_service)
+    assert asyncio.run(main.allowed_projects_for([1, 2], 5, "token")) == {1}
+
+def test_invalidate_route_takes_service_tokens_only(client, auth_headers, project_service):
+    main.permission_cache.set(1, 2, True)
+    body = {"project_id": 1, "user_id": 2}
+    assert client.post("/permission-cache/invalidate", json=body, headers=auth_headers).status_code == 403
+    token = jwt.encode({"sub": "project_service", "user_id": 0, "service": "project_service"}, JWT_SECRET, algorithm=ALGORITHM)
+    response = client.post("/permission-cache/invalidate", json=body, headers={"Authorization": f"Bearer {token}"})
+    assert response.json() == {"invalidated": 1}
+    assert main.permission_cache.get(1, 2) is None
+
+def test_invalidation_from_another_worker(project_service):
+    main.permission_cache.set(1, 2, True)
+    main.permission_cache.set(1, 3, True)
+    # What a worker receives from the broker when another worker got the invalidation
+    main.hub.dispatch([{"board_id": None, "type": main.PERMISSION_INVALIDATE, "data": {"project_id": 1, "user_id": None}}])
+    assert main.permission_cache.get(1, 2) is None
+    assert main.permission_cache.get(1, 3) is None
+    main.permission_cache.set(1, 2, True)
+    main.hub.dispatch([{"board_id": None, "type": BROKER_CONNECTED, "data": {}}])
+    assert main.permission_cache.get(1, 2) is None
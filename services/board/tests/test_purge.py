@@ -0,0 +1,80 @@
+import pytest
+import jwt
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate
+from src.crud import create_board, create_list, create_task, add_label, delete_list, delete_task, get_board, get_lists_by_board
+from src.models import Board, List, Task, TaskLabel, TaskSearchTerm, BoardTaskStat, BoardChange, PurgeJob
+from src.stats import get_board_stats
+from src.purge import run_purge_job
+from src import main, purge
+from src.auth import JWT_SECRET, ALGORITHM
+
+@pytest.fixture(scope="function")
+def board_id(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Cleanup"))
+    for name in ("Todo", "Done"):
+        list_ = create_list(db_session, ListCreate(board_id=board.id, name=name, position=1))
+        for index in range(3):
+            task = create_task(db_session, TaskCreate(list_id=list_.id, title=f"{name} task {index}", priority="high"))
+            add_label(db_session, task.id, TaskLabelCreate(label="urgent"))
+    return board.id
+
+def test_deleted_list_is_hidden_then_purged(db_session, board_id):
+    todo_id, done_id = [list_.id for list_ in get_lists_by_board(db_session, board_id)]
+    job = delete_list(db_session, todo_id)
+    assert [list_.id for list_ in get_lists_by_board(db_session, board_id)] == [done_id]
+    assert get_board_stats(db_session, board_id)["total"] == 3
+    assert db_session.query(Task).filter(Task.list_id == todo_id).count() == 3  # Still there until purged
+
+    run_purge_job(db_session, job.id, chunk=2)
+    assert job.status == "done"
+    assert job.rows_deleted == 3 + 3 + 3 * 2 + 1  # Tasks, labels, search postings ("todo", "task"), the list
+    assert db_session.query(List).filter(List.id == todo_id).count() == 0
+    assert db_session.query(Task).count() == 3
+    assert db_session.query(TaskLabel).count() == 3
+    assert get_board_stats(db_session, board_id)["total"] == 3
+
+def test_delete_board_purges_in_background(client, db_session, board_id, auth_headers, project_service, monkeypatch):
+    monkeypatch.setattr(main, "PURGE_INLINE_TASKS", 0)
+    monkeypatch.setattr(purge, "PURGE_CHUNK_SIZE", 2)
+    response = client.delete(f"/boards/{board_id}", headers=auth_headers)
+    assert response.status_code == 202
+    job = response.json()
+    assert (job["entity"], job["entity_id"], job["status"]) == ("board", board_id, "pending")
+    status = client.get(f"/purge-jobs/{job['id']}", headers=auth_headers).json()
+    assert status["status"] == "done"
+    assert status["finished_at"] is not None
+    assert client.get(f"/boards/{board_id}", headers=auth_headers).status_code == 404
+    for model in (Board, List, Task, TaskLabel, TaskSearchTerm, BoardTaskStat, BoardChange):
+        assert db_session.query(model).count() == 0, model.__name__
+
+def test_tombstoned_board_is_gone_for_reads(client, db_session, board_id, auth_headers, project_service):
+    task_id = db_session.query(Task.id).order_by(Task.id).first()[0]
+    db_session.get(Board, board_id).deleted_at = db_session.query(Board.created_at).scalar()
+    db_session.commit()
+    assert get_board(db_session, board_id) is None
+    assert client.get(f"/tasks/{task_id}/permission/1", headers=auth_headers).json() == {"detail": "Board not found"}
+    assert client.get("/search/tasks", params={"q": "task", "project_id": 1}, headers=auth_headers).json() == []
+
+def test_delete_task_removes_its_rows(db_session, board_id):
+    task = db_session.query(Task).order_by(Task.id).first()
+    assert delete_task(db_session, task.id) is True
+    assert db_session.query(TaskLabel).filter(TaskLabel.task_id == task.id).count() == 0
+    assert db_session.query(TaskSearchTerm).filter(TaskSearchTerm.task_id == task.id).count() == 0
+    assert db_session.query(PurgeJob).count() == 0
+
+def test_project_purge_for_the_outbox_relay(client, db_session, board_id, auth_headers):
+    other_id = create_board(db_session, BoardCreate(project_id=2, name="Kept")).id
+    create_task(db_session, TaskCreate(list_id=create_list(db_session, ListCreate(board_id=other_id, name="Todo")).id, title="Kept task"))
+    token = jwt.encode({"sub": "project_service", "user_id": 0, "service": "project_service"}, JWT_SECRET, algorithm=ALGORITHM)
+    service_headers = {"Authorization": f"Bearer {token}"}
+    assert client.post("/projects/1/purge", headers=auth_headers).status_code == 403
+    task_ids = client.get("/projects/1/task-ids", params={"limit": 4}, headers=service_headers).json()
+    task_ids += client.get("/projects/1/task-ids", params={"after": task_ids[-1]}, headers=service_headers).json()
+    assert len(task_ids) == 6
+    result = client.post("/projects/1/purge", headers=service_headers).json()
+    assert (result["boards"], result["done"]) == (1, False)  # Purged after the response
+    result = client.post("/projects/1/purge", headers=service_headers).json()
+    assert (result["boards"], result["pending"], result["done"]) == (1, 0, True)
+    assert db_session.query(Board.id).all() == [(other_id,)]
+    assert db_session.query(Task).count() == 1
+    assert client.get("/projects/1/task-ids", headers=service_headers).json() == []
@@ -0,0 +1,87 @@
+import pytest
+from datetime import datetime, timedelta
+from src.schemas import BoardCreate, ListCreate, TaskCreate
+from src.crud import create_board, create_list, create_task, update_task
+from src.models import Board, TaskReminder
+from src.reminders import ReminderScheduler
+from src import events
+
+NOW = datetime(2026, 3, 2, 12, 0)
+
+@pytest.fixture(scope="function")
+def published(monkeypatch):
+    sent = []
+    monkeypatch.setattr(events.hub, "publish", sent.extend)
+    return sent
+
+@pytest.fixture(scope="function")
+def list_id(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Deadlines"))
+    return create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1)).id
+
+def add_task(db_session, list_id, title, due_in=None, assignee_id=1, status=None):
+    due_date = NOW + due_in if due_in is not None else None
+    task = create_task(db_session, TaskCreate(list_id=list_id, title=title, due_date=due_date, assignee_id=assignee_id))
+    if status:
+        task = update_task(db_session, task.id, {"status": status})
+    return task
+
+def reminders(published):
+    fired = [(event["type"], event["data"]["title"]) for event in published if event["type"] in ("task.due_soon", "task.overdue")]
+    published.clear()
+    return sorted(fired)
+
+def test_reminders_fire_once_per_deadline(db_session, list_id, published):
+    add_task(db_session, list_id, "soon", timedelta(hours=2))
+    add_task(db_session, list_id, "late", timedelta(hours=-1))
+    add_task(db_session, list_id, "finished", timedelta(hours=-1), status="done")
+    add_task(db_session, list_id, "later", timedelta(days=3))
+    scheduler = ReminderScheduler(db_session.get_bind())
+    scheduler.tick(NOW)
+    assert reminders(published) == [("task.due_soon", "soon"), ("task.overdue", "late")]
+    assert scheduler.heap == []  # "soon" turns overdue after the lookahead window
+
+    scheduler.tick(NOW, resync=True)
+    assert reminders(published) == []
+    scheduler.tick(NOW + timedelta(hours=2))
+    assert reminders(published) == [("task.overdue", "soon")]
+    assert db_session.query(TaskReminder).count() == 3
+    assert db_session.get(Board, 1).version == 6  # One per write; reminders don't version the board
+
+def test_edited_tasks_are_rescheduled(db_session, list_id, published):
+    moved = add_task(db_session, list_id, "moved", timedelta(days=3))
+    closed = add_task(db_session, list_id, "closed", timedelta(minutes=30))
+    scheduler = ReminderScheduler(db_session.get_bind())
+    scheduler.tick(NOW)
+    assert reminders(published) == [("task.due_soon", "closed")]
+
+    update_task(db_session, moved.id, {"due_date": NOW + timedelta(minutes=10)})
+    update_task(db_session, closed.id, {"status": "done"})
+    scheduler.tick(NOW + timedelta(minutes=1))
+    assert reminders(published) == [("task.due_soon", "moved")]
+    scheduler.tick(NOW + timedelta(hours=1))
+    assert reminders(published) == [("task.overdue", "moved")]
+
+    # A new deadline gets its own reminders
+    update_task(db_session, moved.id, {"due_date": NOW + timedelta(hours=1, minutes=30)})
+    scheduler.tick(NOW + timedelta(hours=1))
+    assert reminders(published) == [("task.due_soon", "moved")]
+
+def test_user_due_tasks(client, db_session, list_id, auth_headers, project_service):
+    now = datetime.utcnow()
+    for title, due_in, assignee_id, status in [("b", timedelta(days=2), 1, None), ("a", timedelta(days=1), 1, None),
+                                               ("c", timedelta(days=3), 1, None), ("past", timedelta(days=-1), 1, None),
+                                               ("done", timedelta(days=1), 1, "done"), ("other", timedelta(days=1), 2, None),
+                                               ("undated", None, 1, None)]:
+        task = create_task(db_session, TaskCreate(list_id=list_id, title=title, assignee_id=assignee_id,
+                                                  due_date=now + due_in if due_in is not None else None))
+        if status:
+            update_task(db_session, task.id, {"status": status})
+    first = client.get("/users/1/due", params={"limit": 2}, headers=auth_headers)
+    assert [task["title"] for task in first.json()] == ["a", "b"]
+    second = client.get("/users/1/due", params={"cursor": first.headers["X-Next-Cursor"]}, headers=auth_headers)
+    assert [task["title"] for task in second.json()] == ["c"]
+    assert "X-Next-Cursor" not in second.headers
+    overdue = client.get("/users/1/due", params={"include_overdue": True}, headers=auth_headers)
+    assert [task["title"] for task in overdue.json()] == ["past", "a", "b", "c"]
+    assert client.get("/users/2/due", headers=auth_headers).status_code == 403
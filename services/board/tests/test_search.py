@@ -0,0 +1,57 @@
+import pytest
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskMove
+from src.crud import create_board, create_list, create_task, update_task, move_task, delete_task
+from src.search import tokenize
+from src.models import TaskSearchTerm
+
+@pytest.fixture(scope="function")
+def lists(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Board"))
+    list_ = create_list(db_session, ListCreate(board_id=board.id, name="List", position=1))
+    other_board = create_board(db_session, BoardCreate(project_id=2, name="Other"))
+    other = create_list(db_session, ListCreate(board_id=other_board.id, name="Other", position=1))
+    return list_.id, other.id
+
+def search(client, headers, **params):
+    response = client.get("/search/tasks", params=params, headers=headers)
+    assert response.status_code == 200
+    return [task["title"] for task in response.json()], response.headers.get("X-Next-Cursor")
+
+def test_tokenize_folds_case_and_accents():
+    assert tokenize("Đặt LỊCH họp, a x-ray!") == ["dat", "lich", "hop", "ray"]
+
+def test_search_ranks_and_pages(client, db_session, lists, auth_headers, project_service):
+    list_id, _ = lists
+    create_task(db_session, TaskCreate(list_id=list_id, title="Fix login bug", description="Crash on login"))
+    create_task(db_session, TaskCreate(list_id=list_id, title="Write docs", description="Mention the login page"))
+    create_task(db_session, TaskCreate(list_id=list_id, title="Login bug in docs"))
+    create_task(db_session, TaskCreate(list_id=list_id, title="Unrelated"))
+
+    titles, cursor = search(client, auth_headers, q="LOGIN")
+    assert titles == ["Fix login bug", "Login bug in docs", "Write docs"]
+    assert cursor is None
+    assert search(client, auth_headers, q="login bug")[0] == ["Fix login bug", "Login bug in docs"]
+    first, cursor = search(client, auth_headers, q="login", limit=2)
+    second, cursor = search(client, auth_headers, q="login", limit=2, cursor=cursor)
+    assert (first + second, cursor) == (titles, None)
+    assert search(client, auth_headers, q="nothing")[0] == []
+    assert client.get("/search/tasks", params={"q": "!"}, headers=auth_headers).status_code == 422
+
+def test_index_follows_task_writes(client, db_session, lists, auth_headers, project_service):
+    list_id, other_id = lists
+    task = create_task(db_session, TaskCreate(list_id=list_id, title="Old title"))
+    update_task(db_session, task.id, {"title": "New title"})
+    assert search(client, auth_headers, q="old")[0] == []
+    assert search(client, auth_headers, q="new")[0] == ["New title"]
+    move_task(db_session, task.id, TaskMove(new_list_id=other_id))
+    assert {row.project_id for row in db_session.query(TaskSearchTerm)} == {2}
+    delete_task(db_session, task.id)
+    assert db_session.query(TaskSearchTerm).count() == 0
+
+def test_search_skips_forbidden_projects(client, db_session, lists, auth_headers, project_service):
+    list_id, other_id = lists
+    create_task(db_session, TaskCreate(list_id=list_id, title="Shared word"))
+    create_task(db_session, TaskCreate(list_id=other_id, title="Shared secret"))
+    project_service.allowed = {1}
+    assert search(client, auth_headers, q="shared")[0] == ["Shared word"]
+    assert search(client, auth_headers, q="shared", project_id=2)[0] == []
@@ -0,0 +1,63 @@
+import pytest
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate
+from src.crud import create_board, create_list, create_task, add_label, get_tasks_by_list
+from src.models import Task, TaskLabel
+
+@pytest.fixture(scope="function")
+def board_lists(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Board"))
+    todo = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+    done = create_list(db_session, ListCreate(board_id=board.id, name="Done", position=2))
+    other_board = create_board(db_session, BoardCreate(project_id=2, name="Other"))
+    other = create_list(db_session, ListCreate(board_id=other_board.id, name="Other", position=1))
+    return todo.id, done.id, other.id
+
+def test_batch_mixed_operations(client, db_session, board_lists, auth_headers, project_service):
+    todo, done, _ = board_lists
+    ids = [create_task(db_session, TaskCreate(list_id=todo, title=f"T{i}")).id for i in range(4)]
+    add_label(db_session, ids[3], TaskLabelCreate(label="bug"))
+    operations = [
+        {"op": "create", "data": {"list_id": done, "title": "New"}},
+        {"op": "move", "task_id": ids[0], "new_list_id": done},
+        {"op": "move", "task_id": ids[1], "new_list_id": done},
+        {"op": "update", "task_id": ids[2], "data": {"title": "Renamed", "status": "done", "created_at": "ignored"}},
+        {"op": "assign", "task_id": ids[2], "assignee_id": 9},
+        {"op": "delete", "task_id": ids[3]},
+        {"op": "assign", "task_id": ids[3], "assignee_id": 9},
+        {"op": "update", "task_id": 12345, "data": {"title": "x"}},
+        {"op": "create", "data": {"title": "No list"}},
+    ]
+    response = client.post("/tasks/batch", json={"operations": operations}, headers=auth_headers)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [201, 200, 200, 200, 200, 200, 404, 404, 422]
+    assert results[0]["task_id"] is not None
+
+    db_session.expire_all()
+    assert [task.title for task in get_tasks_by_list(db_session, done)] == ["New", "T0", "T1"]
+    renamed = db_session.get(Task, ids[2])
+    assert (renamed.title, renamed.status, renamed.assignee_id) == ("Renamed", "done", 9)
+    assert db_session.get(Task, ids[3]) is None
+    assert db_session.query(TaskLabel).count() == 0
+    # Only one project was touched, so only one permission call
+    assert len(project_service) == 1
+
+def test_batch_checks_permission_per_project(client, db_session, board_lists, auth_headers, project_service):
+    todo, _, other = board_lists
+    mine = create_task(db_session, TaskCreate(list_id=todo, title="Mine")).id
+    theirs = create_task(db_session, TaskCreate(list_id=other, title="Theirs")).id
+    project_service.allowed = {1}
+
+    operations = [
+        {"op": "assign", "task_id": mine, "assignee_id": 5},
+        {"op": "assign", "task_id": theirs, "assignee_id": 5},
+        {"op": "move", "task_id": mine, "new_list_id": other},
+        {"op": "update", "task_id": theirs, "data": {"title": "Hijacked"}},
+    ]
+    response = client.post("/tasks/batch", json={"operations": operations}, headers=auth_headers)
+    assert [result["status"] for result in response.json()["results"]] == [200, 403, 403, 403]
+    assert project_service == [("POST", "/projects/members/check")]
+    db_session.expire_all()
+    assert db_session.get(Task, mine).assignee_id == 5
+    assert db_session.get(Task, mine).list_id == todo
+    assert db_session.get(Task, theirs).title == "Theirs"
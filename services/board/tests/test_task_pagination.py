@@ -0,0 +1,41 @@
+import pytest
+from datetime import datetime
+from src.schemas import BoardCreate, ListCreate, TaskCreate
+from src.crud import create_board, create_list, create_task
+
+@pytest.fixture(scope="function")
+def list_id(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Backlog Board"))
+    list_ = create_list(db_session, ListCreate(board_id=board.id, name="Backlog", position=1))
+    for i in range(7):
+        task = create_task(db_session, TaskCreate(list_id=list_.id, title=f"Task {i}", priority="high" if i < 3 else "low",
+                                                  assignee_id=i % 3, due_date=datetime(2026, 1, i + 1)))
+        task.status = "done" if i % 2 else "todo"
+    db_session.commit()
+    return list_.id
+
+def fetch_all(client, url, headers):
+    titles, cursor = [], None
+    while True:
+        response = client.get(url, params={"limit": 3, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200
+        titles += [task["title"] for task in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return titles
+
+def test_pages_follow_cursor_to_the_end(client, list_id, auth_headers, project_service):
+    assert fetch_all(client, f"/lists/{list_id}/tasks", auth_headers) == [f"Task {i}" for i in range(7)]
+
+def test_filters_apply_before_paging(client, list_id, auth_headers, project_service):
+    url = f"/lists/{list_id}/tasks"
+    response = client.get(url, params={"status": "done", "priority": "high"}, headers=auth_headers)
+    assert [task["title"] for task in response.json()] == ["Task 1"]
+    response = client.get(url, params={"assignee_id": 0}, headers=auth_headers)
+    assert [task["title"] for task in response.json()] == ["Task 0", "Task 3", "Task 6"]
+    response = client.get(url, params={"due_after": "2026-01-02T00:00:00", "due_before": "2026-01-04T00:00:00"}, headers=auth_headers)
+    assert [task["title"] for task in response.json()] == ["Task 1", "Task 2"]
+
+def test_invalid_cursor_and_limit(client, list_id, auth_headers, project_service):
+    assert client.get(f"/lists/{list_id}/tasks", params={"cursor": "not-a-cursor"}, headers=auth_headers).status_code == 400
+    assert client.get(f"/lists/{list_id}/tasks", params={"limit": 0}, headers=auth_headers).status_code == 422
@@ -0,0 +1,60 @@
+import pytest
+import jwt
+from src.schemas import BoardCreate, ListCreate, TaskCreate
+from src.crud import create_board, create_list, create_task, get_task_ancestry
+from src.models import Task
+from src.auth import JWT_SECRET, ALGORITHM
+from src import main
+
+@pytest.fixture(scope="function")
+def task(db_session):
+    board = create_board(db_session, BoardCreate(project_id=3, name="Board"))
+    list_ = create_list(db_session, ListCreate(board_id=board.id, name="List", position=1))
+    return create_task(db_session, TaskCreate(list_id=list_.id, title="Task"))
+
+def test_task_ancestry_single_statement(db_session, task, query_log):
+    db_task, list_id, board_id, project_id = get_task_ancestry(db_session, task.id)
+    assert db_task.id == task.id
+    assert list_id == task.list_id
+    assert project_id == 3
+    assert len(query_log) == 1
+
+def test_update_task_route_round_trips(client, db_session, task, auth_headers, project_service, query_log):
+    task_id = task.id
+    db_session.expire_all()
+    query_log.clear()
+    response = client.patch(f"/tasks/{task_id}", json={"title": "Renamed"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+    selects = [s for s in query_log if s.lstrip().upper().startswith("SELECT")]
+    # One ancestry lookup, the search reindex read, the new board version and the refresh after commit
+    assert len(selects) == 4
+
+def test_task_routes_404_when_list_missing(client, db_session, auth_headers, project_service):
+    orphan = Task(list_id=999, title="Orphan")
+    db_session.add(orphan)
+    db_session.commit()
+    task_id = orphan.id
+    for method, path, body in [
+        ("put", f"/tasks/{task_id}/assign/2", None),
+        ("patch", f"/tasks/{task_id}", {"title": "x"}),
+        ("delete", f"/tasks/{task_id}", None),
+        ("put", f"/tasks/{task_id}/move", {"new_list_id": 1}),
+    ]:
+        response = client.request(method, path, json=body, headers=auth_headers)
+        assert response.status_code == 404
+        assert response.json()["detail"] == "List not found"
+
+def test_task_permission_endpoint(client, task, auth_headers, project_service):
+    response = client.get(f"/tasks/{task.id}/permission/1", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["project_id"] == 3
+
+def test_task_permission_for_another_user(client, task, auth_headers, project_service):
+    assert client.get(f"/tasks/{task.id}/permission/2", headers=auth_headers).status_code == 403
+    assert project_service == []
+    project_service.allowed = set()
+    token = jwt.encode({"sub": "project_service", "user_id": 0, "service": "project_service"}, JWT_SECRET, algorithm=ALGORITHM)
+    response = client.get(f"/tasks/{task.id}/permission/2", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+    assert main.permission_cache.get(3, 2) is None  # Not decided with user 2's own token
@@ -0,0 +1,58 @@
+import json
+import pytest
+from src.schemas import BoardCreate, ListCreate, TaskCreate, TaskLabelCreate, TaskAttachmentCreate
+from src.crud import create_board, create_list, create_task, add_label, add_attachment, get_board_full
+from src.models import Board
+from src.stats import get_board_stats
+from src.search import query_terms, document_frequencies, search_tasks
+
+@pytest.fixture(scope="function")
+def board_id(db_session):
+    board = create_board(db_session, BoardCreate(project_id=1, name="Roadmap"))
+    todo = create_list(db_session, ListCreate(board_id=board.id, name="Todo", position=1))
+    done = create_list(db_session, ListCreate(board_id=board.id, name="Done", position=2))
+    for i in range(5):
+        task = create_task(db_session, TaskCreate(list_id=todo.id if i % 2 else done.id, title=f"Ship feature {i}", priority="high"))
+        add_label(db_session, task.id, TaskLabelCreate(label="release" if i % 2 else "Backend"))
+    add_attachment(db_session, task.id, TaskAttachmentCreate(file_url="https://example.com/spec.pdf"))
+    return board.id
+
+def records(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_export_streams_every_record(client, board_id, auth_headers, project_service):
+    response = client.get(f"/boards/{board_id}/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    types = [record["type"] for record in records(response)]
+    assert types == ["board"] + ["list"] * 2 + ["task"] * 5 + ["board_label"] * 2 + ["label"] * 5 + ["attachment"]
+
+def test_import_round_trips_a_board(client, db_session, board_id, auth_headers, project_service, monkeypatch):
+    monkeypatch.setattr("src.main.IMPORT_BATCH_SIZE", 2)  # Several batches per record type
+    export = client.get(f"/boards/{board_id}/export", headers=auth_headers).content
+    response = client.post("/boards/import", params={"project_id": 2}, content=export, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert {key: body[key] for key in ("lists", "tasks", "labels", "attachments")} == {"lists": 2, "tasks": 5, "labels": 5, "attachments": 1}
+    new_id = body["board"]["id"]
+    assert body["board"]["project_id"] == 2
+
+    def shape(board_id):
+        full = get_board_full(db_session, db_session.get(Board, board_id))
+        return [(list_["name"], [(task["title"], task["position"], [label["label"] for label in task["labels"]],
+                                  [attachment["file_url"] for attachment in task["attachments"]]) for task in list_["tasks"]])
+                for list_ in full["lists"]]
+    assert shape(new_id) == shape(board_id)
+    assert get_board_stats(db_session, new_id)["total"] == 5
+    terms = query_terms("feature")
+    assert len(search_tasks(db_session, terms, document_frequencies(db_session, terms), [2], 10)) == 5
+    changes = client.get(f"/boards/{new_id}/changes", params={"since": 0}, headers=auth_headers).json()
+    assert changes["full"] is True
+
+def test_bad_import_is_rolled_back(client, db_session, board_id, auth_headers, project_service):
+    lines = client.get(f"/boards/{board_id}/export", headers=auth_headers).text.splitlines()
+    lines.insert(3, json.dumps({"type": "task", "data": {"id": 99, "list_id": 12345, "title": "Orphan"}}))
+    response = client.post("/boards/import", content="\n".join(lines), headers=auth_headers)
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Line 4: unknown list 12345"
+    assert db_session.query(Board).count() == 1
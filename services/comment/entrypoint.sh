@@ -16,6 +16,10 @@ if [ -z "$(ls -A migrations/versions)" ]; then
     alembic revision --autogenerate -m "Initial comment schema"
 fi
 
+# Move databases from a revision autogenerated on boot onto the committed history (see src/adopt_migrations.py)
+echo "[DOING] - Checking migration history..."
+python -m src.adopt_migrations || { echo "Migration failed"; exit 1; }
+
 # Apply migrations
 echo "[DOING] - Applying migrations..."
 alembic upgrade head || { echo "Migration failed"; exit 1; }
@@ -0,0 +1,28 @@
+"""Comment task index
+
+Revision ID: a2c7e4f9b618
+Revises: 6f1b9d3e7a42
+Create Date: 2026-10-19 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c7e4f9b618'
+down_revision: Union[str, Sequence[str], None] = '6f1b9d3e7a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_comments_task_id'), 'comments', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_comments_task_id'), table_name='comments')
@@ -0,0 +1,30 @@
+"""Comment project id
+
+Revision ID: c8e5a1d7f304
+Revises: a2c7e4f9b618
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e5a1d7f304'
+down_revision: Union[str, Sequence[str], None] = 'a2c7e4f9b618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('comments', sa.Column('project_id', sa.Integer(), nullable=True))
+    op.create_index('ix_comments_project_id_created_at', 'comments', ['project_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_project_id_created_at', table_name='comments')
+    op.drop_column('comments', 'project_id')
@@ -21,4 +21,11 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     except jwt.PyJWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return {"id": user_id, "email": email, "role": role, "token": token}
+    return {"id": user_id, "email": email, "role": role, "token": token, "service": payload.get("service")}
+
+# Internal routes called by another service (project_service's outbox relay and overview); its tokens
+# carry a "service" claim that auth_service never puts in user tokens
+def get_service_caller(current_user: dict = Depends(get_current_user)):
+    if not current_user["service"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Service token required")
+    return current_user
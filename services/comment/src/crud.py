@@ -1,9 +1,10 @@
+from sqlalchemy import select, delete
 from sqlalchemy.orm import Session
 from .models import Comment
 from .schemas import CommentCreate, CommentUpdate
 
-def create_comment(db: Session, comment: CommentCreate, user_id: int):
-    db_comment = Comment(task_id=comment.task_id, user_id=user_id, content=comment.content)
+def create_comment(db: Session, comment: CommentCreate, user_id: int, project_id: int = None):
+    db_comment = Comment(task_id=comment.task_id, project_id=project_id, user_id=user_id, content=comment.content)
     db.add(db_comment)
     db.commit()
     db.refresh(db_comment)
@@ -15,6 +16,9 @@ def get_comment(db: Session, comment_id: int):
 def get_comments_by_task(db: Session, task_id: int):
     return db.query(Comment).filter(Comment.task_id == task_id).all()
 
+def get_recent_project_comments(db: Session, project_id: int, limit: int):
+    return db.query(Comment).filter(Comment.project_id == project_id).order_by(Comment.created_at.desc(), Comment.id.desc()).limit(limit).all()
+
 def update_comment(db: Session, comment_id: int, update: CommentUpdate):
     db_comment = get_comment(db, comment_id)
     if db_comment:
@@ -29,4 +33,13 @@ def delete_comment(db: Session, comment_id: int):
     if db_comment:
         db.delete(db_comment)
         db.commit()
-    return db_comment
\ No newline at end of file
+    return db_comment
+
+# Delete every comment on task_ids, `chunk` rows per transaction; returns the number deleted
+def delete_comments_for_tasks(db: Session, task_ids, chunk: int = 1000):
+    deleted = 0
+    condition = Comment.task_id.in_(list(task_ids))
+    while ids := db.scalars(select(Comment.id).where(condition).limit(chunk)).all():
+        deleted += db.execute(delete(Comment).where(Comment.id.in_(ids))).rowcount
+        db.commit()
+    return deleted
@@ -1,10 +1,20 @@
-from fastapi import FastAPI, Depends, HTTPException
-import requests
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from .database import get_db
-from .schemas import CommentCreate, CommentUpdate, CommentResponse
-from .crud import create_comment, get_comment, get_comments_by_task, update_comment, delete_comment
-from .auth import get_current_user
+from .schemas import CommentCreate, CommentUpdate, CommentResponse, CommentPurge
+from .crud import create_comment, get_comment, get_comments_by_task, update_comment, delete_comment, delete_comments_for_tasks, get_recent_project_comments
+from .auth import get_current_user, get_service_caller
+from .http_client import upstreams, UpstreamUnavailable
+
+BOARD_SERVICE_URL = os.getenv("BOARD_SERVICE_URL", "http://board_service:8000")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await upstreams.aclose()
 
 app = FastAPI(
     root_path="/comment_service",
@@ -13,33 +23,49 @@ app = FastAPI(
     openapi_url="/openapi.json",
     docs_url="/docs",
     redoc_url="/edoc",
+    lifespan=lifespan,
 )
 
-def check_task_permission(task_id: int, user_id: int, token: str):
+# Returns the task's project_id
+async def check_task_permission(task_id: int, user_id: int, token: str):
     # Call board_service to check if user has permission on task (via project)
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"http://board_service:8000/tasks/{task_id}/permission/{user_id}", headers=headers)
-    if response.status_code != 200:
+    try:
+        status_code, data = await upstreams.request(BOARD_SERVICE_URL, "GET", f"/tasks/{task_id}/permission/{user_id}", headers=headers)
+    except UpstreamUnavailable:
+        raise HTTPException(status_code=503, detail="Board service unavailable")
+    if status_code != 200:
         raise HTTPException(status_code=403, detail="Not authorized for this task")
+    return (data or {}).get("project_id")
 
 @app.post("/comments", response_model=CommentResponse)
-def create_new_comment(comment: CommentCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Check permission (assuming token is obtained from request, simplify)
-    check_task_permission(comment.task_id, current_user["id"], "token_here")
-    return create_comment(db, comment, current_user["id"])
+async def create_new_comment(comment: CommentCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    project_id = await check_task_permission(comment.task_id, current_user["id"], current_user["token"])
+    return await run_in_threadpool(create_comment, db, comment, current_user["id"], project_id)
+
+# Latest comments on a project's tasks (project_service's overview, which checks membership)
+@app.get("/projects/{project_id}/comments/recent", response_model=list[CommentResponse])
+async def get_recent_comments(project_id: int, limit: int = Query(20, ge=1, le=100), caller: dict = Depends(get_service_caller), db: Session = Depends(get_db)):
+    return await run_in_threadpool(get_recent_project_comments, db, project_id, limit)
+
+# Delete the comments of deleted tasks (project_service's purge of a deleted project)
+@app.post("/comments/purge", response_model=dict)
+async def purge_comments(purge: CommentPurge, caller: dict = Depends(get_service_caller), db: Session = Depends(get_db)):
+    deleted = await run_in_threadpool(delete_comments_for_tasks, db, purge.task_ids)
+    return {"deleted": deleted}
 
 @app.get("/comments/{comment_id}", response_model=CommentResponse)
-def get_comment_detail(comment_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_comment = get_comment(db, comment_id)
+async def get_comment_detail(comment_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    db_comment = await run_in_threadpool(get_comment, db, comment_id)
     if not db_comment:
         raise HTTPException(status_code=404, detail="Comment not found")
-    check_task_permission(db_comment.task_id, current_user["id"], "token_here")
+    await check_task_permission(db_comment.task_id, current_user["id"], current_user["token"])
     return db_comment
 
 @app.get("/tasks/{task_id}/comments", response_model=list[CommentResponse])
-def get_task_comments(task_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    check_task_permission(task_id, current_user["id"], "token_here")
-    return get_comments_by_task(db, task_id)
+async def get_task_comments(task_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    await check_task_permission(task_id, current_user["id"], current_user["token"])
+    return await run_in_threadpool(get_comments_by_task, db, task_id)
 
 @app.put("/comments/{comment_id}", response_model=CommentResponse)
 def update_existing_comment(comment_id: int, update: CommentUpdate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -1,11 +1,16 @@
-from sqlalchemy import Column, Integer, Text, DateTime
+from sqlalchemy import Column, Integer, Text, DateTime, Index
 from .database import Base
 from datetime import datetime
 
 class Comment(Base):
     __tablename__ = "comments"
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, nullable=False)  # From board_db, not ForeignKey
+    task_id = Column(Integer, nullable=False, index=True)  # From board_db, not ForeignKey
+    project_id = Column(Integer, nullable=True)  # The task's project when commented, from board_service; None on older comments
     user_id = Column(Integer, nullable=False)  # From auth_db
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_comments_project_id_created_at", "project_id", "created_at"),  # Recent comments of a project
+    )
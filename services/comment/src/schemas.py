@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 class CommentCreate(BaseModel):
     task_id: int
@@ -12,8 +12,13 @@ class CommentUpdate(BaseModel):
 class CommentResponse(BaseModel):
     id: int
     task_id: int
+    project_id: Optional[int] = None
     user_id: int
     content: str
     created_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Tasks whose comments go, see POST /comments/purge
+class CommentPurge(BaseModel):
+    task_ids: List[int] = Field(..., max_length=5000)
@@ -0,0 +1,67 @@
+import pytest
+import jwt
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.database import Base, get_db
+from src.main import app
+from src.auth import JWT_SECRET, ALGORITHM
+from src.http_client import upstreams
+
+# Test DB: In-memory SQLite
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Fixture for test DB
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)  # Create tables
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)  # Cleanup after each test
+
+# Fixture for TestClient with override dependency
+@pytest.fixture(scope="function")
+def client(db_session):
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            db_session.close()
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.pop(get_db, None)  # Cleanup override
+
+# Fixture for a bearer token of user 1
+@pytest.fixture(scope="function")
+def auth_headers():
+    token = jwt.encode({"sub": "user@example.com", "user_id": 1, "role": "member"}, JWT_SECRET, algorithm=ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+# Fixture for a token like the ones project_service mints for its own calls
+@pytest.fixture(scope="function")
+def service_headers():
+    token = jwt.encode({"sub": "project_service", "user_id": 0, "service": "project_service"}, JWT_SECRET, algorithm=ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+# Fixture standing in for board_service: `tasks` maps the task ids the user may see to their project
+@pytest.fixture(scope="function", autouse=True)
+def board_service(monkeypatch):
+    tasks = {}
+    async def fake_request(base_url, method, path, **kwargs):
+        task_id = int(path.split("/")[2])
+        if task_id not in tasks:
+            return 403, {"detail": "Not authorized for this project"}
+        return 200, {"task_id": task_id, "project_id": tasks[task_id], "allowed": True}
+    monkeypatch.setattr(upstreams, "request", fake_request)
+    return tasks
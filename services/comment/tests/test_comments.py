@@ -0,0 +1,49 @@
+from src.crud import delete_comments_for_tasks
+from src.models import Comment
+
+def comment(client, headers, task_id, content):
+    return client.post("/comments", json={"task_id": task_id, "content": content}, headers=headers)
+
+def test_comment_records_the_task_project(client, auth_headers, board_service):
+    board_service.update({10: 1})
+    response = comment(client, auth_headers, 10, "First")
+    assert response.status_code == 200
+    assert (response.json()["task_id"], response.json()["project_id"]) == (10, 1)
+    assert comment(client, auth_headers, 11, "No access").status_code == 403
+
+def test_recent_project_comments_for_services(client, auth_headers, service_headers, board_service):
+    board_service.update({10: 1, 11: 1, 20: 2})
+    for task_id, content in [(10, "a"), (20, "other project"), (11, "b"), (10, "c")]:
+        comment(client, auth_headers, task_id, content)
+    path = "/projects/1/comments/recent"
+    assert client.get(path, headers=auth_headers).status_code == 403
+    response = client.get(path, params={"limit": 2}, headers=service_headers)
+    assert response.status_code == 200
+    assert [item["content"] for item in response.json()] == ["c", "b"]
+    assert [item["content"] for item in client.get(path, headers=service_headers).json()] == ["c", "b", "a"]
+    assert client.get("/projects/3/comments/recent", headers=service_headers).json() == []
+
+def test_purge_is_for_services_only(client, auth_headers, service_headers, board_service):
+    board_service.update({10: 1, 11: 1, 20: 2})
+    for task_id, content in [(10, "a"), (11, "b"), (20, "other project"), (10, "c")]:
+        comment(client, auth_headers, task_id, content)
+    assert client.post("/comments/purge", json={"task_ids": [10, 11]}, headers=auth_headers).status_code == 403
+    response = client.post("/comments/purge", json={"task_ids": [10, 11, 30]}, headers=service_headers)
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 3}
+    assert client.get("/projects/1/comments/recent", headers=service_headers).json() == []
+    assert [item["content"] for item in client.get("/projects/2/comments/recent", headers=service_headers).json()] == ["other project"]
+    assert client.post("/comments/purge", json={"task_ids": list(range(5001))}, headers=service_headers).status_code == 422
+
+def test_delete_comments_for_tasks_in_chunks(db_session, monkeypatch):
+    db_session.add_all([Comment(task_id=task_id, user_id=1, content=f"{task_id}-{index}") for task_id in (1, 2, 3) for index in range(3)])
+    db_session.commit()
+    commits = []
+    commit = db_session.commit
+    def counted_commit():
+        commits.append(1)
+        commit()
+    monkeypatch.setattr(db_session, "commit", counted_commit)
+    assert delete_comments_for_tasks(db_session, [1, 3], chunk=2) == 6
+    assert len(commits) == 3  # One transaction per chunk of 2
+    assert sorted(db_session.query(Comment.content)) == [("2-0",), ("2-1",), ("2-2",)]
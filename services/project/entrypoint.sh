@@ -16,10 +16,18 @@ if [ -z "$(ls -A migrations/versions)" ]; then
     alembic revision --autogenerate -m "Initial project schema"
 fi
 
+# Move databases from a revision autogenerated on boot onto the committed history (see src/adopt_migrations.py)
+echo "[DOING] - Checking migration history..."
+python -m src.adopt_migrations || { echo "Migration failed"; exit 1; }
+
 # Apply migrations
 echo "[DOING] - Applying migrations..."
 alembic upgrade head || { echo "Migration failed"; exit 1; }
 
+# Outbox relay: purges deleted projects' data in board_service and comment_service (see src/outbox.py)
+echo "[DOING] - Starting outbox relay..."
+python -m src.outbox &
+
 # Start application
 echo "[DOING] - Starting application..."
 exec uvicorn src.main:app --host 0.0.0.0 --port 8000 --workers 4
\ No newline at end of file
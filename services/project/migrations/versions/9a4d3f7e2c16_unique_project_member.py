@@ -0,0 +1,36 @@
+"""Unique project member
+
+Revision ID: 9a4d3f7e2c16
+Revises: 5c2e8b1f4a07
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d3f7e2c16'
+down_revision: Union[str, Sequence[str], None] = '5c2e8b1f4a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # add_member only refused the same role twice: keep one row per member, the owner row if any
+    op.execute(
+        "DELETE FROM project_members WHERE id NOT IN (SELECT id FROM ("
+        "SELECT COALESCE(MIN(CASE WHEN role = 'owner' THEN id END), MIN(id)) AS id"
+        " FROM project_members GROUP BY project_id, user_id) AS kept)"
+    )
+    with op.batch_alter_table('project_members') as batch_op:
+        batch_op.create_unique_constraint('uq_project_members_project_id_user_id', ['project_id', 'user_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('project_members') as batch_op:
+        batch_op.drop_constraint('uq_project_members_project_id_user_id', type_='unique')
@@ -0,0 +1,28 @@
+"""Project members user index
+
+Revision ID: d7b2e9c4f851
+Revises: 9a4d3f7e2c16
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b2e9c4f851'
+down_revision: Union[str, Sequence[str], None] = '9a4d3f7e2c16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_project_members_user_id_project_id', 'project_members', ['user_id', 'project_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_members_user_id_project_id', table_name='project_members')
@@ -0,0 +1,48 @@
+"""Project outbox
+
+Revision ID: e3a8c6f1d924
+Revises: d7b2e9c4f851
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a8c6f1d924'
+down_revision: Union[str, Sequence[str], None] = 'd7b2e9c4f851'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_table('project_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('event', sa.String(length=30), nullable=False),
+    sa.Column('target', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('rows_deleted', sa.Integer(), nullable=False),
+    sa.Column('progress', sa.String(length=50), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_project_outbox_project_id', 'project_outbox', ['project_id'], unique=False)
+    op.create_index('ix_project_outbox_status_available_at', 'project_outbox', ['status', 'available_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_outbox_status_available_at', table_name='project_outbox')
+    op.drop_index('ix_project_outbox_project_id', table_name='project_outbox')
+    op.drop_table('project_outbox')
+    op.drop_column('projects', 'deleted_at')
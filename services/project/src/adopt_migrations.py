@@ -0,0 +1,43 @@
+import os
+import sys
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+
+# Run by the entrypoint before `alembic upgrade head`. Databases created before
+# migrations/versions was committed were migrated by a revision autogenerated on first
+# boot: the file is still in the bind-mounted migrations/versions, and alembic_version
+# points at it. Such revision files are removed, and an alembic_version outside the
+# committed history is cleared (`alembic stamp --purge base`), so the initial revision
+# adopts the existing tables on upgrade.
+INITIAL_REVISION = "5c2e8b1f4a07"
+
+# Revision ids that descend from INITIAL_REVISION, and the revisions that do not
+def split_revisions(script: ScriptDirectory):
+    revisions = list(script.walk_revisions())
+    committed = set()
+    for revision in reversed(revisions):  # Bases first
+        down = revision.down_revision
+        if revision.revision == INITIAL_REVISION or set(down if isinstance(down, tuple) else (down,)) & committed:
+            committed.add(revision.revision)
+    return committed, [revision for revision in revisions if revision.revision not in committed]
+
+def adopt(config: Config, engine):
+    committed, stale = split_revisions(ScriptDirectory.from_config(config))
+    for revision in stale:
+        print(f"[DOING] - Removing revision {revision.revision} outside the committed history: {revision.path}", flush=True)
+        os.remove(revision.path)
+    if not inspect(engine).has_table("alembic_version"):
+        return
+    with engine.begin() as conn:
+        versions = conn.execute(text("SELECT version_num FROM alembic_version")).scalars().all()
+        if any(version not in committed for version in versions):
+            print(f"[DOING] - Clearing alembic_version {versions}, not in the committed history...", flush=True)
+            conn.execute(text("DELETE FROM alembic_version"))
+
+if __name__ == "__main__":
+    from .database import engine
+    try:
+        adopt(Config("alembic.ini"), engine)
+    except OSError as exc:
+        sys.exit(f"[ERROR] - Could not adopt the database: {exc}")
@@ -9,6 +9,8 @@ import os
 JWT_SECRET = os.getenv("JWT_SECRET")
 ALGORITHM = "HS256"
 
+SERVICE_TOKEN_TTL = timedelta(minutes=5)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth_service/token")  # Token from auth_service
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
@@ -22,3 +24,10 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
     except jwt.PyJWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     return {"id": user_id, "email": email, "role": role, "token": token}
+
+
+# Token for calls this service makes on its own (the outbox relay). The "service" claim
+# is never in auth_service's user tokens; the other services require it on internal routes.
+def create_service_token():
+    expires = datetime.now(timezone.utc) + SERVICE_TOKEN_TTL
+    return jwt.encode({"sub": "project_service", "user_id": 0, "service": "project_service", "exp": expires}, JWT_SECRET, algorithm=ALGORITHM)
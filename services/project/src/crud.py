@@ -1,5 +1,8 @@
-from sqlalchemy.orm import Session
-from .models import Project, ProjectMember
+from sqlalchemy import select, insert, func, and_, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from datetime import datetime
+from .models import Project, ProjectMember, ProjectOutbox
 from .schemas import ProjectCreate, ProjectMemberCreate
 
 def create_project(db: Session, project: ProjectCreate, owner_id: int):
@@ -13,37 +16,63 @@ def create_project(db: Session, project: ProjectCreate, owner_id: int):
     db.commit()
     return db_project
 
+# Steps of a project's purge, in order: comments go first, while board_service can still list the task ids
+PROJECT_PURGE_STEPS = ("comment", "board", "members")
+
+def _live_project(project_id):
+    return and_(Project.id == project_id, Project.deleted_at.is_(None))
+
 def get_project(db: Session, project_id: int):
-    return db.query(Project).filter(Project.id == project_id).first()
+    return db.query(Project).filter(_live_project(project_id)).first()
 
 def add_member(db: Session, project_id: int, member: ProjectMemberCreate):
     # Prevent owner from inviting themselves with any role except 'owner'
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = get_project(db, project_id)
     if project and member.user_id == project.owner_id:
         # Owner already exists as 'owner', cannot invite self with other role
         return None
 
-    # Prevent duplicate member with same role
-    existing = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == member.user_id,
-        ProjectMember.role == member.role
-    ).first()
-    if existing:
-        return None
-
+    # One role per member, enforced by uq_project_members_project_id_user_id
     db_member = ProjectMember(project_id=project_id, user_id=member.user_id, role=member.role)
     db.add(db_member)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
     db.refresh(db_member)
     return db_member
 
+# Users of user_ids already in project_id, one query
+def get_member_ids(db: Session, project_id: int, user_ids):
+    if not user_ids:
+        return set()
+    rows = db.query(ProjectMember.user_id).filter(ProjectMember.project_id == project_id, ProjectMember.user_id.in_(set(user_ids)))
+    return {user_id for user_id, in rows}
+
+# Add verified new members {user_id: role} in one INSERT. Returns False, inserting nothing,
+# when one of them joined concurrently (uq_project_members_project_id_user_id).
+def add_members(db: Session, project_id: int, members: dict):
+    if not members:
+        return True
+    rows = [{"project_id": project_id, "user_id": user_id, "role": role} for user_id, role in members.items()]
+    try:
+        db.execute(insert(ProjectMember.__table__), rows)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    return True
+
 def get_members(db: Session, project_id: int):
     return db.query(ProjectMember).filter(ProjectMember.project_id == project_id).all()
 
+def get_member(db: Session, project_id: int, user_id: int):
+    return db.query(ProjectMember).filter(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id).first()
+
 # Update project fields
 def update_project(db: Session, project_id: int, update_data: dict):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = get_project(db, project_id)
     if not project:
         return None
     allowed = {"name", "description"}
@@ -54,14 +83,18 @@ def update_project(db: Session, project_id: int, update_data: dict):
     db.refresh(project)
     return project
 
-# Delete project
+# Delete project: tombstone it and queue its purge steps in the outbox, in one transaction
 def delete_project(db: Session, project_id: int):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = get_project(db, project_id)
     if not project:
         return None
-    db.delete(project)
+    project.deleted_at = datetime.utcnow()
+    db.add_all(ProjectOutbox(project_id=project_id, event="project.deleted", target=target) for target in PROJECT_PURGE_STEPS)
     db.commit()
-    return True
+    return project
+
+def get_project_outbox(db: Session, project_id: int):
+    return db.query(ProjectOutbox).filter(ProjectOutbox.project_id == project_id).order_by(ProjectOutbox.id).all()
 
 # Update project member role
 def update_member_role(db: Session, project_id: int, user_id: int, new_role: str):
@@ -83,6 +116,46 @@ def delete_member(db: Session, project_id: int, user_id: int):
     return True
 
 # Get member role (returns None if not found)
+# (None for deleted projects: their members stay until the purge removes them)
 def get_member_role(db: Session, project_id: int, user_id: int):
-    member = db.query(ProjectMember).filter(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id).first()
-    return member.role if member else None
\ No newline at end of file
+    return (
+        db.query(ProjectMember.role)
+        .join(Project, _live_project(ProjectMember.project_id))
+        .filter(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id)
+        .scalar()
+    )
+
+# Roles of many (project_id, user_id) pairs in one query, {(project_id, user_id): role}
+def get_member_roles(db: Session, pairs):
+    if not pairs:
+        return {}
+    rows = db.query(ProjectMember.project_id, ProjectMember.user_id, ProjectMember.role).join(
+        Project, _live_project(ProjectMember.project_id)
+    ).filter(tuple_(ProjectMember.project_id, ProjectMember.user_id).in_(list(pairs)))
+    return {(project_id, user_id): role for project_id, user_id, role in rows}
+
+# One page of the projects user_id belongs to, as (project, role, member_count), ordered by
+# (created_at, id) and starting after the `after` key. Member counts come from a correlated
+# subquery over uq_project_members_project_id_user_id, in the same statement.
+def get_user_projects(db: Session, user_id: int, limit: int, after: tuple = None, role: str = None, newest_first: bool = True):
+    counted = aliased(ProjectMember)
+    member_count = select(func.count()).where(counted.project_id == Project.id).correlate(Project).scalar_subquery()
+    query = (
+        db.query(Project, ProjectMember.role, member_count.label("member_count"))
+        .join(ProjectMember, and_(ProjectMember.project_id == Project.id, ProjectMember.user_id == user_id))
+        .filter(Project.deleted_at.is_(None))
+    )
+    if role is not None:
+        query = query.filter(ProjectMember.role == role)
+    if after is not None:
+        created_at, project_id = after
+        # Expanded rather than a row comparison so MariaDB can range-scan
+        if newest_first:
+            query = query.filter(or_(Project.created_at < created_at, and_(Project.created_at == created_at, Project.id < project_id)))
+        else:
+            query = query.filter(or_(Project.created_at > created_at, and_(Project.created_at == created_at, Project.id > project_id)))
+    if newest_first:
+        query = query.order_by(Project.created_at.desc(), Project.id.desc())
+    else:
+        query = query.order_by(Project.created_at, Project.id)
+    return query.limit(limit).all()
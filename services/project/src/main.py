@@ -1,12 +1,27 @@
 import os
-import requests
-from fastapi import FastAPI, Depends, HTTPException, status, Body
+from datetime import datetime
+from typing import Literal
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, status, Body, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from .database import get_db
-from .schemas import ProjectCreate, ProjectResponse, ProjectMemberCreate, ProjectMemberResponse
-from .crud import create_project, get_project, add_member, get_members, get_member_role, update_project, delete_project, update_member_role, delete_member
-from .auth import get_current_user
+from .schemas import ProjectCreate, ProjectResponse, ProjectMemberCreate, ProjectMemberResponse, ProjectListItem, ProjectDeletionResponse, ProjectOverview, BulkMemberCreate, BulkMemberResponse, MemberCheckRequest, MemberCheckResponse
+from .crud import create_project, get_project, get_project_outbox, get_user_projects, add_member, add_members, get_member_ids, get_members, get_member, get_member_role, get_member_roles, update_project, delete_project, update_member_role, delete_member
+from .auth import get_current_user, create_service_token
+from .models import Project
+from .http_client import upstreams, UpstreamUnavailable
+from .overview import overview_cache, build_overview
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor, split_page
+
+AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://auth_service:8000")
+BOARD_SERVICE_URL = os.getenv("BOARD_SERVICE_URL", "http://board_service:8000")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await upstreams.aclose()
 
 app = FastAPI(
     root_path="/project_service",
@@ -15,12 +30,50 @@ app = FastAPI(
     openapi_url="/openapi.json",
     docs_url="/docs",
     redoc_url="/edoc",
+    lifespan=lifespan,
 )
 
+def deletion_status(db: Session, project: Project):
+    steps = get_project_outbox(db, project.id)
+    status_ = "done" if all(step.status == "done" for step in steps) else "pending"
+    return {"project_id": project.id, "deleted_at": project.deleted_at, "status": status_, "steps": steps}
+
+async def invalidate_board_permissions(project_id: int, user_id):
+    # Drop board_service's cached permission decision; best effort, its cache TTL covers failures.
+    # board_service only takes this from services
+    headers = {"Authorization": f"Bearer {create_service_token()}"}
+    try:
+        await upstreams.request(BOARD_SERVICE_URL, "POST", "/permission-cache/invalidate", json={"project_id": project_id, "user_id": user_id}, headers=headers)
+    except UpstreamUnavailable:
+        pass
+
 @app.post("/projects", response_model=ProjectResponse)
 def create_new_project(project: ProjectCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
     return create_project(db, project, owner_id=current_user["id"])
 
+# Projects the caller belongs to with their role and member count, newest first by default.
+# Keyset paginated: pass the X-Next-Cursor response header back as `cursor`.
+@app.get("/projects", response_model=list[ProjectListItem])
+def list_my_projects(response: Response, role: str = None, order: Literal["asc", "desc"] = "desc",
+                     limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str = None,
+                     current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    after = None
+    if cursor:
+        created_at, project_id = decode_cursor(cursor, 2)
+        if not isinstance(project_id, int) or not isinstance(created_at, str):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        try:
+            after = (datetime.fromisoformat(created_at), project_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = get_user_projects(db, current_user["id"], limit + 1, after, role, order == "desc")
+    rows, has_more = split_page(rows, limit)
+    if has_more:
+        last_project = rows[-1][0]
+        response.headers["X-Next-Cursor"] = encode_cursor(last_project.created_at.isoformat(), last_project.id)
+    return [dict(ProjectResponse.model_validate(project).model_dump(), role=role, member_count=member_count)
+            for project, role, member_count in rows]
+
 @app.get("/projects/{project_id}", response_model=ProjectResponse)
 def get_project_detail(project_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
     db_project = get_project(db, project_id)
@@ -32,24 +85,109 @@ def get_project_detail(project_id: int, current_user: dict = Depends(get_current
         raise HTTPException(status_code=403, detail="Not authorized")
     return db_project
 
+# Dashboard of a project (members only): members with names, boards with task counts per
+# status and recent comments, gathered from the other services concurrently (see overview.py).
+# Complete documents are cached for OVERVIEW_CACHE_TTL seconds; partial ones are not.
+@app.get("/projects/{project_id}/overview", response_model=ProjectOverview)
+async def get_project_overview(project_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    role = await run_in_threadpool(get_member_role, db, project_id, current_user.get("id"))
+    if not role:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    document = overview_cache.get(project_id)
+    if document is None:
+        version = overview_cache.version(project_id)
+        project = await run_in_threadpool(get_project, db, project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        members = await run_in_threadpool(get_members, db, project_id)
+        document = await build_overview(project, members, current_user.get("token"))
+        if not document["partial"]:
+            overview_cache.set(project_id, document, version)
+    return document
+
 @app.post("/projects/{project_id}/members", response_model=ProjectMemberResponse)
-def invite_member(project_id: int, member: ProjectMemberCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+async def invite_member(project_id: int, member: ProjectMemberCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
     # Check if current_user is owner
-    role = get_member_role(db, project_id, current_user.get("id"))
+    role = await run_in_threadpool(get_member_role, db, project_id, current_user.get("id"))
     if role != "owner":
         raise HTTPException(status_code=403, detail="Only owner can invite members")
     # Check user_id exists in auth_service
-    auth_url = os.getenv("AUTH_SERVICE_URL", "http://auth_service:8000")
     token = current_user.get("token")
     headers = {"Authorization": f"Bearer {token}"} if token else {}
-    user_resp = requests.get(f"{auth_url}/users/{member.user_id}", headers=headers)
-    if user_resp.status_code != 200:
-        return JSONResponse(status_code=user_resp.status_code, content=user_resp.json())
-    db_member = add_member(db, project_id, member)
+    try:
+        status_code, user_data = await upstreams.request(AUTH_SERVICE_URL, "GET", f"/users/{member.user_id}", headers=headers)
+    except UpstreamUnavailable:
+        raise HTTPException(status_code=503, detail="Auth service unavailable")
+    if status_code != 200:
+        return JSONResponse(status_code=status_code, content=user_data)
+    db_member = await run_in_threadpool(add_member, db, project_id, member)
     if db_member is None:
         raise HTTPException(status_code=400, detail="Cannot invite owner as member or duplicate member/role")
+    # Clear a cached denial so the new member gets access right away
+    overview_cache.invalidate(project_id)
+    await invalidate_board_permissions(project_id, member.user_id)
     return db_member
 
+# Invite many users at once (owner only). The invitees are verified with one auth_service
+# lookup, checked against current members with one query and inserted with one statement.
+# Returns a status per requested member; an invitee that can't be added doesn't fail the rest.
+@app.post("/projects/{project_id}/members/bulk", response_model=BulkMemberResponse)
+async def invite_members(project_id: int, invite: BulkMemberCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    role = await run_in_threadpool(get_member_role, db, project_id, current_user.get("id"))
+    if role != "owner":
+        raise HTTPException(status_code=403, detail="Only owner can invite members")
+    project = await run_in_threadpool(get_project, db, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    statuses, roles = {}, {}
+    results = []
+    for member in invite.members:
+        if member.user_id in roles:
+            status_ = "duplicate"
+        elif member.user_id == project.owner_id:
+            status_ = "owner"
+        else:
+            roles[member.user_id] = member.role
+            status_ = None
+        results.append((member, status_))
+    existing = await run_in_threadpool(get_member_ids, db, project_id, roles.keys())
+    candidates = [user_id for user_id in roles if user_id not in existing]
+    token = current_user.get("token")
+    if candidates:
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        try:
+            status_code, users = await upstreams.request(AUTH_SERVICE_URL, "POST", "/users/lookup", json={"ids": candidates}, headers=headers)
+        except UpstreamUnavailable:
+            raise HTTPException(status_code=503, detail="Auth service unavailable")
+        if status_code != 200:
+            return JSONResponse(status_code=status_code, content=users)
+        found = {user["id"] for user in users}
+        new_members = {user_id: roles[user_id] for user_id in candidates if user_id in found}
+        # Someone joined between the check and the insert: check again without them
+        while not await run_in_threadpool(add_members, db, project_id, new_members):
+            joined = await run_in_threadpool(get_member_ids, db, project_id, new_members.keys())
+            if not joined:
+                # Failed for another reason: the same insert would fail again
+                raise HTTPException(status_code=409, detail="Members could not be added")
+            existing |= joined
+            new_members = {user_id: role for user_id, role in new_members.items() if user_id not in joined}
+        for user_id in new_members:
+            statuses[user_id] = "added"
+        for user_id in candidates:
+            statuses.setdefault(user_id, "not_found" if user_id not in found else "already_member")
+    for user_id in existing:
+        statuses[user_id] = "already_member"
+    report = [
+        {"user_id": member.user_id, "role": member.role, "status": status_ or statuses[member.user_id]}
+        for member, status_ in results
+    ]
+    added = sum(1 for item in report if item["status"] == "added")
+    if added:
+        # One invalidation for the project instead of one per new member
+        overview_cache.invalidate(project_id)
+        await invalidate_board_permissions(project_id, None)
+    return {"added": added, "results": report}
+
 @app.get("/projects/{project_id}/members", response_model=list[ProjectMemberResponse])
 def get_project_members(project_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
     # Check role: from member role and above
@@ -58,6 +196,30 @@ def get_project_members(project_id: int, current_user: dict = Depends(get_curren
         raise HTTPException(status_code=403, detail="Not authorized")
     return get_members(db, project_id)
 
+# Get a single member (used by board_service to check permission)
+@app.get("/projects/{project_id}/members/{user_id}", response_model=ProjectMemberResponse)
+def get_project_member(project_id: int, user_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    role = get_member_role(db, project_id, current_user.get("id"))
+    if not role:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    member = get_member(db, project_id, user_id)
+    if not member:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return member
+
+# Roles of many (project_id, user_id) pairs in one call and one query (used by board_service).
+# Pairs in projects the caller is not a member of come back as None, like non-members.
+@app.post("/projects/members/check", response_model=MemberCheckResponse)
+def check_project_members(check: MemberCheckRequest, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    pairs = check.all_pairs()
+    caller_id = current_user.get("id")
+    found = get_member_roles(db, pairs | {(project_id, caller_id) for project_id, _ in pairs})
+    roles = {}
+    for project_id, user_id in pairs:
+        visible = (project_id, caller_id) in found
+        roles.setdefault(project_id, {})[user_id] = found.get((project_id, user_id)) if visible else None
+    return {"roles": roles}
+
 # Update project (owner only)
 @app.patch("/projects/{project_id}", response_model=ProjectResponse)
 def update_project_route(project_id: int, update_data: dict = Body(...), current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -67,39 +229,57 @@ def update_project_route(project_id: int, update_data: dict = Body(...), current
     project = update_project(db, project_id, update_data)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    overview_cache.invalidate(project_id)
     return project
 
-# Delete project (owner only)
-@app.delete("/projects/{project_id}", response_model=dict)
-def delete_project_route(project_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    role = get_member_role(db, project_id, current_user.get("id"))
+# Delete project (owner only). The project is gone for every read at once; its boards, tasks,
+# comments and members are purged in the background (see outbox.py). 202 with the purge status.
+@app.delete("/projects/{project_id}", response_model=ProjectDeletionResponse, status_code=202)
+async def delete_project_route(project_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    role = await run_in_threadpool(get_member_role, db, project_id, current_user.get("id"))
     if role != "owner":
         raise HTTPException(status_code=403, detail="Only owner can delete project")
-    result = delete_project(db, project_id)
-    if not result:
+    project = await run_in_threadpool(delete_project, db, project_id)
+    if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return {"detail": "Project deleted"}
+    overview_cache.invalidate(project_id)
+    await invalidate_board_permissions(project_id, None)
+    return await run_in_threadpool(deletion_status, db, project)
+
+# Progress of a project's purge (owner only)
+@app.get("/projects/{project_id}/deletion", response_model=ProjectDeletionResponse)
+def get_project_deletion(project_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    project = db.get(Project, project_id)
+    if not project or project.deleted_at is None:
+        raise HTTPException(status_code=404, detail="Project deletion not found")
+    if project.owner_id != current_user.get("id"):
+        raise HTTPException(status_code=403, detail="Only owner can see the project deletion")
+    return deletion_status(db, project)
 
 # Update member role (owner only)
 @app.patch("/projects/{project_id}/members/{user_id}", response_model=ProjectMemberResponse)
-def update_member_role_route(project_id: int, user_id: int, new_role: str = Body(..., embed=True), current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    role = get_member_role(db, project_id, current_user.get("id"))
+async def update_member_role_route(project_id: int, user_id: int, new_role: str = Body(..., embed=True), current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    role = await run_in_threadpool(get_member_role, db, project_id, current_user.get("id"))
     if role != "owner":
         raise HTTPException(status_code=403, detail="Only owner can update member role")
-    member = update_member_role(db, project_id, user_id, new_role)
+    member = await run_in_threadpool(update_member_role, db, project_id, user_id, new_role)
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
+    overview_cache.invalidate(project_id)
+    await invalidate_board_permissions(project_id, user_id)
     return member
 
 # Delete member (owner only, cannot remove self)
 @app.delete("/projects/{project_id}/members/{user_id}", response_model=dict)
-def delete_member_route(project_id: int, user_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    role = get_member_role(db, project_id, current_user.get("id"))
+async def delete_member_route(project_id: int, user_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    role = await run_in_threadpool(get_member_role, db, project_id, current_user.get("id"))
     if role != "owner":
         raise HTTPException(status_code=403, detail="Only owner can delete member")
     if user_id == current_user.get("id"):
         raise HTTPException(status_code=400, detail="Owner cannot remove self")
-    result = delete_member(db, project_id, user_id)
+    result = await run_in_threadpool(delete_member, db, project_id, user_id)
     if not result:
         raise HTTPException(status_code=404, detail="Member not found")
+    overview_cache.invalidate(project_id)
+    await invalidate_board_permissions(project_id, user_id)
     return {"detail": "Member deleted"}
\ No newline at end of file
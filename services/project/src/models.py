@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, UniqueConstraint
 from .database import Base
 from datetime import datetime
 
@@ -9,6 +9,7 @@ class Project(Base):
     description = Column(Text)
     owner_id = Column(Integer, nullable=False)  # user_id from auth_db, no ForeignKey because cross-DB
     created_at = Column(DateTime, default=datetime.utcnow)
+    deleted_at = Column(DateTime, nullable=True)  # Tombstone: hidden at once, dependent data purged through project_outbox
 
 class ProjectMember(Base):
     __tablename__ = "project_members"
@@ -17,6 +18,35 @@ class ProjectMember(Base):
     user_id = Column(Integer, nullable=False)
     role = Column(String(50), nullable=False)  # e.g., 'owner', 'member', 'guest'
 
+    __table_args__ = (
+        # One role per member; also serves membership lookups by (project_id, user_id)
+        UniqueConstraint("project_id", "user_id", name="uq_project_members_project_id_user_id"),
+        Index("ix_project_members_user_id_project_id", "user_id", "project_id"),  # GET /projects: a user's memberships
+    )
+
+# Transactional outbox: rows written in the same transaction as the change they announce and
+# relayed to the other services by `python -m src.outbox`. A deleted project gets one row per
+# purge step ('comment', 'board', then 'members'), run one after the other in id order.
+class ProjectOutbox(Base):
+    __tablename__ = "project_outbox"
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, nullable=False)
+    event = Column(String(30), nullable=False)  # 'project.deleted'
+    target = Column(String(20), nullable=False)
+    status = Column(String(10), nullable=False, default="pending")  # 'pending' or 'done'
+    attempts = Column(Integer, nullable=False, default=0)  # Failed deliveries so far
+    rows_deleted = Column(Integer, nullable=False, default=0)
+    progress = Column(String(50), nullable=True)  # Where an interrupted step resumes, e.g. the last task id handled
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Not retried before this
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_project_outbox_status_available_at", "status", "available_at"),
+        Index("ix_project_outbox_project_id", "project_id"),
+    )
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,113 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+from .models import ProjectMember, ProjectOutbox
+from .auth import create_service_token
+from .http_client import upstreams, UpstreamUnavailable
+
+# Relays project_outbox to the other services, as one process next to the API workers
+# (`python -m src.outbox`). Each pending row is a purge step of a deleted project; a
+# project's steps run in id order, a step only once the ones before it are done. Steps are
+# done in chunks with their progress committed in between, so a restart resumes them, and
+# a failed delivery is retried later with backoff, without holding up other projects.
+BOARD_SERVICE_URL = os.getenv("BOARD_SERVICE_URL", "http://board_service:8000")
+COMMENT_SERVICE_URL = os.getenv("COMMENT_SERVICE_URL", "http://comment_service:8000")
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))  # Seconds between scans, and between board purge status checks
+OUTBOX_RETRY_DELAY = float(os.getenv("OUTBOX_RETRY_DELAY", "30"))  # Seconds, times the failed attempts so far
+OUTBOX_MAX_RETRY_DELAY = float(os.getenv("OUTBOX_MAX_RETRY_DELAY", "3600"))
+OUTBOX_CHUNK_SIZE = int(os.getenv("OUTBOX_CHUNK_SIZE", "1000"))  # Task ids per comment purge call, members per DELETE
+
+class DeliveryFailed(Exception):
+    pass
+
+async def _call(base_url: str, method: str, path: str, **kwargs):
+    headers = {"Authorization": f"Bearer {create_service_token()}"}
+    try:
+        status_code, data = await upstreams.request(base_url, method, path, headers=headers, **kwargs)
+    except UpstreamUnavailable as exc:
+        raise DeliveryFailed(str(exc))
+    if status_code != 200:
+        raise DeliveryFailed(f"{method} {path}: {status_code} {data}")
+    return data
+
+# Comments of the project's tasks: board_service pages the task ids, comment_service deletes
+async def _purge_comments(db: Session, entry: ProjectOutbox, chunk: int):
+    while True:
+        after = int(entry.progress or 0)
+        task_ids = await _call(BOARD_SERVICE_URL, "GET", f"/projects/{entry.project_id}/task-ids", params={"after": after, "limit": chunk})
+        if not task_ids:
+            return True
+        result = await _call(COMMENT_SERVICE_URL, "POST", "/comments/purge", json={"task_ids": task_ids})
+        entry.rows_deleted += result["deleted"]
+        entry.progress = str(task_ids[-1])
+        db.commit()
+
+# Boards: board_service tombstones them and purges in the background; True once it reports done
+async def _purge_boards(db: Session, entry: ProjectOutbox, chunk: int):
+    result = await _call(BOARD_SERVICE_URL, "POST", f"/projects/{entry.project_id}/purge")
+    entry.rows_deleted = result["rows_deleted"]
+    db.commit()
+    return result["done"]
+
+# The project's own member rows; the tombstoned project row stays for GET /projects/{id}/deletion
+async def _purge_members(db: Session, entry: ProjectOutbox, chunk: int):
+    condition = ProjectMember.project_id == entry.project_id
+    while ids := db.scalars(select(ProjectMember.id).where(condition).limit(chunk)).all():
+        entry.rows_deleted += db.execute(delete(ProjectMember).where(ProjectMember.id.in_(ids))).rowcount
+        db.commit()
+    return True
+
+STEPS = {"comment": _purge_comments, "board": _purge_boards, "members": _purge_members}
+
+# The next step of every project with pending steps, if it is due
+def _due_entries(db: Session, now: datetime):
+    first_pending = {}
+    for entry in db.scalars(select(ProjectOutbox).where(ProjectOutbox.status == "pending").order_by(ProjectOutbox.id)):
+        first_pending.setdefault(entry.project_id, entry)
+    return [entry for entry in first_pending.values() if entry.available_at <= now]
+
+async def _deliver(db: Session, entry: ProjectOutbox, chunk: int):
+    try:
+        done = await STEPS[entry.target](db, entry, chunk)
+    except DeliveryFailed as exc:
+        db.rollback()
+        entry.attempts += 1
+        entry.last_error = str(exc)[:1000]
+        delay = min(OUTBOX_RETRY_DELAY * entry.attempts, OUTBOX_MAX_RETRY_DELAY)
+        entry.available_at = datetime.utcnow() + timedelta(seconds=delay)
+        print(f"[WARN] - outbox {entry.id} ({entry.target}, project {entry.project_id}) failed: {exc}", flush=True)
+    else:
+        if done:
+            entry.status = "done"
+            entry.finished_at = datetime.utcnow()
+        else:
+            entry.available_at = datetime.utcnow() + timedelta(seconds=OUTBOX_POLL_INTERVAL)
+    db.commit()
+
+# Deliver every due step once; returns how many were attempted
+async def relay_once(bind, chunk: int = OUTBOX_CHUNK_SIZE):
+    with Session(bind=bind) as db:
+        entries = _due_entries(db, datetime.utcnow())
+        for entry in entries:
+            await _deliver(db, entry, chunk)
+        return len(entries)
+
+async def run(bind, interval: float = OUTBOX_POLL_INTERVAL):
+    try:
+        while True:
+            try:
+                await relay_once(bind)
+            except Exception as exc:
+                print(f"[WARN] - outbox relay: {exc!r}", flush=True)
+            await asyncio.sleep(interval)
+    finally:
+        await upstreams.aclose()
+
+def main():
+    from .database import engine
+    asyncio.run(run(engine))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from .auth import create_service_token
+from .schemas import ProjectResponse
+from .http_client import upstreams, UpstreamUnavailable
+
+# GET /projects/{id}/overview: the project and its members from project_db, plus member
+# names (auth_service), boards with task counts per status (board_service) and recent
+# comments (comment_service). The three upstreams are called at once over the shared
+# connection pools, each within OVERVIEW_UPSTREAM_TIMEOUT; one that fails or is too slow
+# leaves its part empty and is listed in `unavailable` instead of failing the page.
+AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://auth_service:8000")
+BOARD_SERVICE_URL = os.getenv("BOARD_SERVICE_URL", "http://board_service:8000")
+COMMENT_SERVICE_URL = os.getenv("COMMENT_SERVICE_URL", "http://comment_service:8000")
+OVERVIEW_UPSTREAM_TIMEOUT = float(os.getenv("OVERVIEW_UPSTREAM_TIMEOUT", "1"))  # Seconds per upstream call
+OVERVIEW_RECENT_COMMENTS = int(os.getenv("OVERVIEW_RECENT_COMMENTS", "20"))
+OVERVIEW_CACHE_TTL = float(os.getenv("OVERVIEW_CACHE_TTL", "30"))
+OVERVIEW_CACHE_MAX_ENTRIES = int(os.getenv("OVERVIEW_CACHE_MAX_ENTRIES", "1000"))
+USER_LOOKUP_MAX = 1000  # Ids per auth_service /users/lookup call
+
+class OverviewCache:
+    """LRU + TTL cache of assembled overview documents keyed by project_id.
+
+    Membership and project changes invalidate the project's entry. The cache is per
+    process, so other uvicorn workers keep their copy until the TTL runs out. A
+    document built while its project was invalidated is not stored: the build may
+    have read the members from before the change.
+    """
+
+    def __init__(self, ttl: float = OVERVIEW_CACHE_TTL, max_entries: int = OVERVIEW_CACHE_MAX_ENTRIES, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # project_id -> (document, expires_at)
+        self._versions = {}  # project_id -> invalidations seen, for builds in flight
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, project_id: int):
+        """Return the cached document or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None or entry[1] <= self._clock():
+                self._entries.pop(project_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(project_id)
+            self.hits += 1
+            return entry[0]
+
+    def version(self, project_id: int):
+        with self._lock:
+            return self._versions.get(project_id, 0)
+
+    def set(self, project_id: int, document: dict, version: int):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            if self._versions.get(project_id, 0) != version:
+                return
+            self._entries[project_id] = (document, self._clock() + self.ttl)
+            self._entries.move_to_end(project_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, project_id: int):
+        with self._lock:
+            self._versions[project_id] = self._versions.get(project_id, 0) + 1
+            if self._entries.pop(project_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+overview_cache = OverviewCache()
+
+class UpstreamFailed(Exception):
+    pass
+
+async def _call(base_url: str, method: str, path: str, token: str, **kwargs):
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        status_code, data = await asyncio.wait_for(
+            upstreams.request(base_url, method, path, headers=headers, **kwargs), OVERVIEW_UPSTREAM_TIMEOUT
+        )
+    except (UpstreamUnavailable, asyncio.TimeoutError) as exc:
+        raise UpstreamFailed(f"{method} {path}: {exc!r}")
+    if status_code != 200:
+        raise UpstreamFailed(f"{method} {path}: {status_code}")
+    return data
+
+async def _user_names(user_ids: list, token: str):
+    chunks = [user_ids[start:start + USER_LOOKUP_MAX] for start in range(0, len(user_ids), USER_LOOKUP_MAX)]
+    pages = await asyncio.gather(*(_call(AUTH_SERVICE_URL, "POST", "/users/lookup", token, json={"ids": chunk}) for chunk in chunks))
+    return {user["id"]: user["name"] for users in pages for user in users}
+
+async def _boards(project_id: int, token: str):
+    return await _call(BOARD_SERVICE_URL, "GET", f"/projects/{project_id}/boards", token)
+
+# comment_service serves this to services only: the caller's membership is checked here
+async def _recent_comments(project_id: int):
+    return await _call(COMMENT_SERVICE_URL, "GET", f"/projects/{project_id}/comments/recent",
+                       create_service_token(), params={"limit": OVERVIEW_RECENT_COMMENTS})
+
+# The overview document of `project`, with `members` already read from project_db
+async def build_overview(project, members, token: str):
+    names, boards, comments = await asyncio.gather(
+        _user_names([member.user_id for member in members], token),
+        _boards(project.id, token),
+        _recent_comments(project.id),
+        return_exceptions=True,
+    )
+    unavailable = []
+    for upstream, result in (("auth", names), ("board", boards), ("comment", comments)):
+        if isinstance(result, BaseException):
+            if not isinstance(result, UpstreamFailed):
+                raise result
+            print(f"[WARN] - overview of project {project.id}: {result}", flush=True)
+            unavailable.append(upstream)
+    if "auth" in unavailable:
+        names = {}
+    return {
+        "project": ProjectResponse.model_validate(project).model_dump(),  # Plain data, the document outlives the session
+        "members": [
+            {"user_id": member.user_id, "role": member.role, "name": names.get(member.user_id)} for member in members
+        ],
+        "boards": boards if "board" not in unavailable else [],
+        "recent_comments": comments if "comment" not in unavailable else [],
+        "unavailable": unavailable,
+        "partial": bool(unavailable),
+        "generated_at": datetime.utcnow(),
+    }
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 class ProjectCreate(BaseModel):
     name: str
@@ -15,6 +15,56 @@ class ProjectResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+# A project in the caller's project list
+class ProjectListItem(ProjectResponse):
+    role: str  # The caller's role
+    member_count: int
+
+class ProjectPurgeStep(BaseModel):
+    target: str  # 'comment', 'board' or 'members'
+    status: str  # 'pending' or 'done'
+    attempts: int  # Failed deliveries, retried with backoff
+    rows_deleted: int
+    last_error: Optional[str]
+    finished_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ProjectDeletionResponse(BaseModel):
+    project_id: int
+    deleted_at: datetime
+    status: str  # 'done' once every step is
+    steps: List[ProjectPurgeStep]
+
+class OverviewMember(BaseModel):
+    user_id: int
+    role: str
+    name: Optional[str]  # None when auth_service is unavailable
+
+class OverviewBoard(BaseModel):
+    id: int
+    name: str
+    created_at: datetime
+    is_template: bool = False
+    by_status: dict[str, int]  # Task counts per status
+    total: int
+
+class OverviewComment(BaseModel):
+    id: int
+    task_id: int
+    user_id: int
+    content: str
+    created_at: datetime
+
+class ProjectOverview(BaseModel):
+    project: ProjectResponse
+    members: List[OverviewMember]
+    boards: List[OverviewBoard]
+    recent_comments: List[OverviewComment]  # Newest first
+    unavailable: List[str]  # Upstreams left out: 'auth', 'board' or 'comment'
+    partial: bool
+    generated_at: datetime
+
 class ProjectMemberCreate(BaseModel):
     user_id: int
     role: str  # e.g., 'owner', 'member', 'guest'
@@ -26,3 +76,45 @@ class ProjectMemberResponse(BaseModel):
     role: str
 
     model_config = ConfigDict(from_attributes=True)
+
+BULK_INVITE_MAX = 1000  # Members per bulk invitation
+
+class BulkMemberCreate(BaseModel):
+    members: List[ProjectMemberCreate] = Field(..., min_length=1, max_length=BULK_INVITE_MAX)
+
+class BulkMemberResult(BaseModel):
+    user_id: int
+    role: str
+    status: str  # 'added', 'already_member', 'not_found', 'duplicate' (listed twice) or 'owner'
+
+class BulkMemberResponse(BaseModel):
+    added: int
+    results: List[BulkMemberResult]
+
+MEMBER_CHECK_MAX = 1000  # Pairs per membership check
+
+class MemberPair(BaseModel):
+    project_id: int
+    user_id: int
+
+# Either explicit pairs, or one user with many projects (or both)
+class MemberCheckRequest(BaseModel):
+    pairs: List[MemberPair] = Field(default_factory=list)
+    user_id: Optional[int] = None
+    project_ids: List[int] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def check_size(self):
+        if self.project_ids and self.user_id is None:
+            raise ValueError("project_ids needs user_id")
+        if len(self.pairs) + len(self.project_ids) > MEMBER_CHECK_MAX:
+            raise ValueError(f"At most {MEMBER_CHECK_MAX} pairs per check")
+        return self
+
+    def all_pairs(self):
+        pairs = {(pair.project_id, pair.user_id) for pair in self.pairs}
+        pairs.update((project_id, self.user_id) for project_id in self.project_ids)
+        return pairs
+
+class MemberCheckResponse(BaseModel):
+    roles: dict[int, dict[int, Optional[str]]]  # project_id -> user_id -> role, None when not a member
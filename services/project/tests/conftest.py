@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+import jwt
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.database import Base, get_db
+from src.main import app
+from src.auth import JWT_SECRET, ALGORITHM
+from src.http_client import upstreams, UpstreamUnavailable
+from src.overview import overview_cache
+
+# Test DB: In-memory SQLite
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Fixture for test DB
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)  # Create tables
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)  # Cleanup after each test
+
+# Fixture for TestClient with override dependency
+@pytest.fixture(scope="function")
+def client(db_session):
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            db_session.close()
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.pop(get_db, None)  # Cleanup override
+
+# Fixture for bearer tokens: user_headers(user_id)
+@pytest.fixture(scope="function")
+def user_headers():
+    def headers(user_id: int):
+        token = jwt.encode({"sub": f"user{user_id}@example.com", "user_id": user_id, "role": "member"}, JWT_SECRET, algorithm=ALGORITHM)
+        return {"Authorization": f"Bearer {token}"}
+    return headers
+
+# Fixture for a bearer token of user 1
+@pytest.fixture(scope="function")
+def auth_headers(user_headers):
+    return user_headers(1)
+
+# Calls made to the fake auth, board and comment services, as (service, method, path).
+# auth_service knows the users in `users`; services in `down` are unreachable and
+# services in `slow` answer after `delay` seconds.
+class UpstreamCalls(list):
+    def __init__(self):
+        super().__init__()
+        self.users = set(range(1, 100))
+        self.boards = []  # GET /projects/{id}/boards
+        self.comments = []  # GET /projects/{id}/comments/recent
+        self.down = set()
+        self.slow = set()
+        self.delay = 5
+
+    def answer(self, service: str, method: str, path: str, json: dict):
+        if service == "auth" and path == "/users/lookup":
+            return 200, [{"id": user_id, "name": f"User {user_id}"} for user_id in json["ids"] if user_id in self.users]
+        if service == "auth" and path.startswith("/users/"):
+            user_id = int(path.split("/")[2])
+            return (200, {"id": user_id, "name": f"User {user_id}"}) if user_id in self.users else (404, {"detail": "User not found"})
+        if service == "board" and path == "/permission-cache/invalidate":
+            return 200, {"invalidated": 0}
+        if service == "board" and path.endswith("/boards"):
+            return 200, self.boards
+        if service == "comment" and path.endswith("/comments/recent"):
+            return 200, self.comments
+        return 404, {"detail": "Not Found"}
+
+# Fixture standing in for auth_service, board_service and comment_service (every test:
+# no request leaves the process)
+@pytest.fixture(scope="function", autouse=True)
+def services(monkeypatch):
+    calls = UpstreamCalls()
+    async def fake_request(base_url, method, path, json=None, **kwargs):
+        service = base_url.removeprefix("http://").split("_")[0]
+        calls.append((service, method, path))
+        if service in calls.down:
+            raise UpstreamUnavailable(base_url)
+        if service in calls.slow:
+            await asyncio.sleep(calls.delay)
+        return calls.answer(service, method, path, json)
+    monkeypatch.setattr(upstreams, "request", fake_request)
+    overview_cache.clear()
+    yield calls
+    overview_cache.clear()
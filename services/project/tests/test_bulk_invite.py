@@ -0,0 +1,62 @@
+import pytest
+from src.schemas import ProjectCreate, ProjectMemberCreate
+from src.crud import create_project, add_member, add_members
+from src.models import ProjectMember
+from src import main
+
+# Project owned by user 1 with user 2 already a member
+@pytest.fixture(scope="function")
+def project_id(db_session):
+    project = create_project(db_session, ProjectCreate(name="Web"), owner_id=1)
+    add_member(db_session, project.id, ProjectMemberCreate(user_id=2, role="member"))
+    return project.id
+
+def invite(client, project_id, headers, *members):
+    return client.post(f"/projects/{project_id}/members/bulk", json={"members": [{"user_id": user_id, "role": role} for user_id, role in members]}, headers=headers)
+
+def members(db_session, project_id):
+    return dict(db_session.query(ProjectMember.user_id, ProjectMember.role).filter(ProjectMember.project_id == project_id))
+
+def test_bulk_invite_reports_each_member(client, db_session, project_id, auth_headers, services):
+    services.users.discard(99)
+    response = invite(client, project_id, auth_headers, (3, "member"), (4, "guest"), (3, "guest"), (1, "member"), (99, "member"), (2, "guest"))
+    assert response.status_code == 200
+    assert response.json() == {"added": 2, "results": [
+        {"user_id": 3, "role": "member", "status": "added"},
+        {"user_id": 4, "role": "guest", "status": "added"},
+        {"user_id": 3, "role": "guest", "status": "duplicate"},
+        {"user_id": 1, "role": "member", "status": "owner"},
+        {"user_id": 99, "role": "member", "status": "not_found"},
+        {"user_id": 2, "role": "guest", "status": "already_member"},
+    ]}
+    assert members(db_session, project_id) == {1: "owner", 2: "member", 3: "member", 4: "guest"}
+    # One auth lookup for the new candidates, one board permission invalidation for the project
+    assert [call for call in services if call[0] == "auth"] == [("auth", "POST", "/users/lookup")]
+    assert [call for call in services if call[0] == "board"] == [("board", "POST", "/permission-cache/invalidate")]
+
+def test_bulk_invite_is_owner_only(client, project_id, user_headers):
+    assert invite(client, project_id, user_headers(2), (3, "member")).status_code == 403
+
+def test_bulk_invite_retries_without_members_who_joined_meanwhile(client, db_session, project_id, auth_headers, monkeypatch):
+    attempts = []
+    def racing_add_members(db, project_id, new_members):
+        attempts.append(sorted(new_members))
+        if len(attempts) == 1:
+            add_member(db, project_id, ProjectMemberCreate(user_id=4, role="guest"))  # Joined between check and insert
+        return add_members(db, project_id, new_members)
+    monkeypatch.setattr(main, "add_members", racing_add_members)
+    response = invite(client, project_id, auth_headers, (3, "member"), (4, "member"))
+    assert [result["status"] for result in response.json()["results"]] == ["added", "already_member"]
+    assert attempts == [[3, 4], [3]]
+    assert members(db_session, project_id) == {1: "owner", 2: "member", 3: "member", 4: "guest"}
+
+def test_bulk_invite_gives_up_when_the_insert_keeps_failing(client, db_session, project_id, auth_headers, monkeypatch):
+    attempts = []
+    def failing_add_members(db, project_id, new_members):
+        attempts.append(sorted(new_members))
+        return False  # Not a concurrent join: nobody new is a member
+    monkeypatch.setattr(main, "add_members", failing_add_members)
+    response = invite(client, project_id, auth_headers, (3, "member"))
+    assert response.status_code == 409
+    assert attempts == [[3]]
+    assert members(db_session, project_id) == {1: "owner", 2: "member"}
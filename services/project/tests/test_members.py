@@ -0,0 +1,39 @@
+import pytest
+from src.schemas import ProjectCreate, ProjectMemberCreate
+from src.crud import create_project, add_member
+from src.models import ProjectMember
+
+# Project 1 owned by user 1 with user 3 as member, project 2 owned by user 2
+@pytest.fixture(scope="function")
+def projects(db_session):
+    first = create_project(db_session, ProjectCreate(name="Web"), owner_id=1)
+    second = create_project(db_session, ProjectCreate(name="Ops"), owner_id=2)
+    add_member(db_session, first.id, ProjectMemberCreate(user_id=3, role="member"))
+    return first.id, second.id
+
+def test_member_check_returns_roles(client, projects, auth_headers):
+    first, second = projects
+    body = {"pairs": [{"project_id": first, "user_id": 3}, {"project_id": first, "user_id": 4}, {"project_id": second, "user_id": 2}],
+            "user_id": 1, "project_ids": [first, second]}
+    response = client.post("/projects/members/check", json=body, headers=auth_headers)
+    assert response.status_code == 200
+    # Project 2 is not visible to user 1: its roles come back as null, even the owner's
+    assert response.json() == {"roles": {
+        str(first): {"1": "owner", "3": "member", "4": None},
+        str(second): {"1": None, "2": None},
+    }}
+
+def test_member_check_limits(client, auth_headers):
+    assert client.post("/projects/members/check", json={"project_ids": [1]}, headers=auth_headers).status_code == 422
+    pairs = [{"project_id": 1, "user_id": user_id} for user_id in range(1001)]
+    assert client.post("/projects/members/check", json={"pairs": pairs}, headers=auth_headers).status_code == 422
+
+def test_member_is_added_once(client, db_session, projects, auth_headers):
+    first, _ = projects
+    assert add_member(db_session, first, ProjectMemberCreate(user_id=3, role="guest")) is None  # Unique (project, user)
+    response = client.post(f"/projects/{first}/members", json={"user_id": 3, "role": "member"}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post(f"/projects/{first}/members", json={"user_id": 1, "role": "member"}, headers=auth_headers)
+    assert response.status_code == 400  # The owner
+    assert db_session.query(ProjectMember).filter(ProjectMember.project_id == first).count() == 2
+    assert client.post(f"/projects/{first}/members", json={"user_id": 5, "role": "member"}, headers=auth_headers).status_code == 200
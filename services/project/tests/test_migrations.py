@@ -0,0 +1,33 @@
+import glob
+import importlib.util
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+def load_revisions():
+    revisions = {}
+    for path in glob.glob("migrations/versions/*.py"):
+        spec = importlib.util.spec_from_file_location(path, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        revisions[module.revision] = module
+    return revisions
+
+def test_unique_member_migration_keeps_one_row_per_member():
+    revisions = load_revisions()
+    engine = sa.create_engine("sqlite://")
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            revisions["5c2e8b1f4a07"].upgrade()
+            conn.execute(sa.text("INSERT INTO projects (id, name, owner_id) VALUES (1, 'Web', 1)"))
+            conn.execute(sa.text(
+                "INSERT INTO project_members (id, project_id, user_id, role) VALUES "
+                "(1, 1, 2, 'member'), (2, 1, 1, 'member'), (3, 1, 1, 'owner'), (4, 1, 2, 'guest'), (5, 1, 3, 'member')"
+            ))
+            revisions["9a4d3f7e2c16"].upgrade()
+            rows = conn.execute(sa.text("SELECT id, user_id, role FROM project_members ORDER BY id")).all()
+            # The owner row wins for the owner, else the first row
+            assert rows == [(1, 2, "member"), (3, 1, "owner"), (5, 3, "member")]
+            with pytest.raises(sa.exc.IntegrityError):
+                conn.execute(sa.text("INSERT INTO project_members (project_id, user_id, role) VALUES (1, 3, 'guest')"))
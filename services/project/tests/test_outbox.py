@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+import jwt
+from datetime import datetime, timedelta
+from src.schemas import ProjectCreate, ProjectMemberCreate
+from src.crud import create_project, add_member, delete_project, get_project_outbox
+from src.models import ProjectMember
+from src.http_client import upstreams
+from src import outbox
+from tests.conftest import engine
+
+# Deleted project with three members and five tasks (ids 1-5) in board_service
+@pytest.fixture(scope="function")
+def project_id(db_session):
+    project = create_project(db_session, ProjectCreate(name="Gone"), owner_id=1)
+    for user_id in (2, 3):
+        add_member(db_session, project.id, ProjectMemberCreate(user_id=user_id, role="member"))
+    delete_project(db_session, project.id)
+    return project.id
+
+# Fake board_service and comment_service for the relay; `fail` holds the calls that
+# answer 503 while set, `board_done` is what POST /projects/{id}/purge reports
+class Upstream(list):
+    def __init__(self):
+        super().__init__()
+        self.task_ids = [1, 2, 3, 4, 5]
+        self.fail = set()
+        self.board_done = True
+
+@pytest.fixture(scope="function")
+def upstream(monkeypatch):
+    calls = Upstream()
+    async def fake_request(base_url, method, path, json=None, params=None, headers=None):
+        assert "service" in jwt.decode(headers["Authorization"].split()[1], options={"verify_signature": False})
+        calls.append((method, path, params or json))
+        if (method, path) in calls.fail or (method, path, (params or {}).get("after")) in calls.fail:
+            return 503, {"detail": "Unavailable"}
+        if path.endswith("/task-ids"):
+            return 200, [task_id for task_id in calls.task_ids if task_id > params["after"]][:params["limit"]]
+        if path == "/comments/purge":
+            return 200, {"deleted": 2 * len(json["task_ids"])}
+        return 200, {"rows_deleted": 40, "done": calls.board_done}
+    monkeypatch.setattr(upstreams, "request", fake_request)
+    monkeypatch.setattr(outbox, "OUTBOX_POLL_INTERVAL", 0)
+    return calls
+
+def relay():
+    return asyncio.run(outbox.relay_once(engine, chunk=2))
+
+def steps(db_session, project_id):
+    db_session.expire_all()
+    return [(step.target, step.status, step.attempts, step.rows_deleted) for step in get_project_outbox(db_session, project_id)]
+
+def test_steps_run_in_order_one_per_pass(db_session, project_id, upstream):
+    upstream.board_done = False
+    assert relay() == 1
+    task_ids = f"/projects/{project_id}/task-ids"
+    assert [call[1] for call in upstream] == [task_ids, "/comments/purge"] * 3 + [task_ids]
+    assert steps(db_session, project_id) == [("comment", "done", 0, 10), ("board", "pending", 0, 0), ("members", "pending", 0, 0)]
+    upstream.clear()
+    relay()  # board_service is still purging: the members step waits
+    assert upstream == [("POST", f"/projects/{project_id}/purge", None)]
+    assert steps(db_session, project_id)[1:] == [("board", "pending", 0, 40), ("members", "pending", 0, 0)]
+    upstream.board_done = True
+    relay()
+    assert db_session.query(ProjectMember).count() == 3  # Not in the same pass as the board step
+    relay()
+    assert steps(db_session, project_id)[1:] == [("board", "done", 0, 40), ("members", "done", 0, 3)]
+    assert db_session.query(ProjectMember).count() == 0
+    assert relay() == 0
+
+def test_failed_step_is_retried_with_backoff_and_resumes(db_session, project_id, upstream):
+    upstream.fail = {("GET", f"/projects/{project_id}/task-ids", 2)}  # Fails after the first chunk
+    started = datetime.utcnow()
+    relay()
+    comment = get_project_outbox(db_session, project_id)[0]
+    assert (comment.status, comment.attempts, comment.progress, comment.rows_deleted) == ("pending", 1, "2", 4)
+    assert "503" in comment.last_error
+    assert comment.available_at >= started + timedelta(seconds=outbox.OUTBOX_RETRY_DELAY)
+    upstream.clear()
+    assert relay() == 0  # Not due yet, and the board step doesn't run early
+    assert upstream == []
+
+    comment.available_at = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    relay()  # Fails again: the delay grows with the attempts
+    db_session.expire_all()
+    assert comment.attempts == 2
+    assert comment.available_at >= datetime.utcnow() + timedelta(seconds=2 * outbox.OUTBOX_RETRY_DELAY - 5)
+
+    upstream.fail = set()
+    upstream.clear()
+    comment.available_at = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    relay()
+    assert upstream[0] == ("GET", f"/projects/{project_id}/task-ids", {"after": 2, "limit": 2})  # Resumed from progress
+    assert steps(db_session, project_id) == [("comment", "done", 2, 10), ("board", "pending", 0, 0), ("members", "pending", 0, 0)]
+    assert not any(call[1].endswith("/purge") and call[1] != "/comments/purge" for call in upstream)
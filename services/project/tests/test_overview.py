@@ -0,0 +1,83 @@
+import pytest
+from src.schemas import ProjectCreate, ProjectMemberCreate
+from src.crud import create_project, add_member
+from src.overview import overview_cache
+from src import overview
+
+BOARD = {"id": 5, "project_id": 1, "name": "Web", "created_at": "2026-05-01T09:00:00", "version": 3, "is_template": False,
+         "by_status": {"todo": 2, "done": 1}, "total": 3}
+COMMENT = {"id": 9, "task_id": 7, "project_id": 1, "user_id": 2, "content": "Looks good", "created_at": "2026-05-02T10:00:00"}
+
+# Project owned by user 1 with user 2 as member, one board and one comment upstream
+@pytest.fixture(scope="function")
+def project_id(db_session, services):
+    project = create_project(db_session, ProjectCreate(name="Web"), owner_id=1)
+    add_member(db_session, project.id, ProjectMemberCreate(user_id=2, role="member"))
+    services.boards.append(BOARD)
+    services.comments.append(COMMENT)
+    return project.id
+
+def upstream_calls(services):
+    return sorted(call for call in services if call[2] != "/permission-cache/invalidate")
+
+def test_overview_gathers_every_service(client, project_id, auth_headers, services):
+    response = client.get(f"/projects/{project_id}/overview", headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["project"]["name"] == "Web"
+    assert body["members"] == [{"user_id": 1, "role": "owner", "name": "User 1"}, {"user_id": 2, "role": "member", "name": "User 2"}]
+    assert body["boards"] == [{key: BOARD[key] for key in ("id", "name", "created_at", "is_template", "by_status", "total")}]
+    assert [comment["content"] for comment in body["recent_comments"]] == ["Looks good"]
+    assert (body["partial"], body["unavailable"]) == (False, [])
+    assert upstream_calls(services) == [
+        ("auth", "POST", "/users/lookup"),
+        ("board", "GET", f"/projects/{project_id}/boards"),
+        ("comment", "GET", f"/projects/{project_id}/comments/recent"),
+    ]
+
+def test_overview_is_for_members_only(client, project_id, user_headers, services):
+    assert client.get(f"/projects/{project_id}/overview", headers=user_headers(3)).status_code == 403
+    assert services == []
+
+def test_overview_is_cached_until_membership_changes(client, project_id, auth_headers, user_headers, services):
+    first = client.get(f"/projects/{project_id}/overview", headers=auth_headers).json()
+    hits = overview_cache.hits
+    services.clear()
+    assert client.get(f"/projects/{project_id}/overview", headers=user_headers(2)).json() == first  # Cache hit
+    assert services == []
+    assert overview_cache.hits == hits + 1
+
+    assert client.post(f"/projects/{project_id}/members", json={"user_id": 3, "role": "guest"}, headers=auth_headers).status_code == 200
+    services.clear()
+    body = client.get(f"/projects/{project_id}/overview", headers=user_headers(3)).json()
+    assert [member["user_id"] for member in body["members"]] == [1, 2, 3]
+    assert len(upstream_calls(services)) == 3  # Rebuilt
+
+    client.delete(f"/projects/{project_id}/members/3", headers=auth_headers)
+    assert client.get(f"/projects/{project_id}/overview", headers=user_headers(3)).status_code == 403
+    body = client.get(f"/projects/{project_id}/overview", headers=auth_headers).json()
+    assert [member["user_id"] for member in body["members"]] == [1, 2]
+
+    client.patch(f"/projects/{project_id}", json={"name": "Web 2"}, headers=auth_headers)
+    assert client.get(f"/projects/{project_id}/overview", headers=auth_headers).json()["project"]["name"] == "Web 2"
+
+def test_slow_or_failing_upstreams_give_a_partial_uncached_overview(client, project_id, auth_headers, services, monkeypatch):
+    monkeypatch.setattr(overview, "OVERVIEW_UPSTREAM_TIMEOUT", 0.05)
+    services.slow.add("board")
+    services.down.add("auth")
+    body = client.get(f"/projects/{project_id}/overview", headers=auth_headers).json()
+    assert (body["partial"], sorted(body["unavailable"])) == (True, ["auth", "board"])
+    assert (body["boards"], [member["name"] for member in body["members"]]) == ([], [None, None])
+    assert [comment["content"] for comment in body["recent_comments"]] == ["Looks good"]
+
+    services.slow.clear()
+    services.down.clear()
+    services.clear()
+    body = client.get(f"/projects/{project_id}/overview", headers=auth_headers).json()  # Partial documents aren't cached
+    assert (body["partial"], len(upstream_calls(services))) == (False, 3)
+
+def test_build_racing_an_invalidation_is_not_stored(project_id):
+    version = overview_cache.version(project_id)
+    overview_cache.invalidate(project_id)  # A member changed while the document was being built
+    overview_cache.set(project_id, {"stale": True}, version)
+    assert overview_cache.get(project_id) is None
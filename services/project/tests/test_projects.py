@@ -0,0 +1,62 @@
+import pytest
+from datetime import datetime, timedelta
+from src.schemas import ProjectCreate, ProjectMemberCreate
+from src.crud import create_project, add_member, delete_project
+
+T0 = datetime(2026, 5, 1, 9, 0)
+
+# Five projects for user 1: three created at the same instant (a tie on the sort key),
+# one newer, one older. User 1 owns all but "guest-of", where user 2 is the owner.
+@pytest.fixture(scope="function")
+def projects(db_session):
+    ids = {}
+    for name, created_at, owner_id in [
+        ("old", T0 - timedelta(days=1), 1), ("tie-a", T0, 1), ("tie-b", T0, 1), ("tie-c", T0, 1), ("guest-of", T0 + timedelta(days=1), 2),
+    ]:
+        project = create_project(db_session, ProjectCreate(name=name), owner_id=owner_id)
+        project.created_at = created_at
+        ids[name] = project.id
+    db_session.commit()
+    add_member(db_session, ids["guest-of"], ProjectMemberCreate(user_id=1, role="guest"))
+    for user_id in (3, 4):
+        add_member(db_session, ids["tie-b"], ProjectMemberCreate(user_id=user_id, role="member"))
+    return ids
+
+def names(response):
+    return [project["name"] for project in response.json()]
+
+def pages(client, headers, **params):
+    result, cursor = [], None
+    while True:
+        response = client.get("/projects", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200
+        result.append(names(response))
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return result
+
+def test_list_projects_newest_first_with_roles_and_counts(client, projects, auth_headers):
+    response = client.get("/projects", headers=auth_headers)
+    assert names(response) == ["guest-of", "tie-c", "tie-b", "tie-a", "old"]
+    items = {item["name"]: item for item in response.json()}
+    assert (items["guest-of"]["role"], items["guest-of"]["member_count"]) == ("guest", 2)
+    assert (items["tie-b"]["role"], items["tie-b"]["member_count"]) == ("owner", 3)
+    assert "X-Next-Cursor" not in response.headers
+
+def test_pages_across_a_tie_on_created_at(client, projects, auth_headers):
+    assert pages(client, auth_headers, limit=2) == [["guest-of", "tie-c"], ["tie-b", "tie-a"], ["old"]]
+    assert pages(client, auth_headers, limit=2, order="asc") == [["old", "tie-a"], ["tie-b", "tie-c"], ["guest-of"]]
+    assert pages(client, auth_headers, limit=1, order="asc")[1:4] == [["tie-a"], ["tie-b"], ["tie-c"]]
+
+def test_list_projects_by_role(client, projects, auth_headers, user_headers):
+    assert names(client.get("/projects", params={"role": "guest"}, headers=auth_headers)) == ["guest-of"]
+    assert names(client.get("/projects", params={"role": "owner", "order": "asc", "limit": 2}, headers=auth_headers)) == ["old", "tie-a"]
+    assert names(client.get("/projects", headers=user_headers(3))) == ["tie-b"]
+
+def test_list_projects_leaves_out_deleted_projects(client, db_session, projects, auth_headers):
+    delete_project(db_session, projects["tie-b"])
+    assert names(client.get("/projects", headers=auth_headers)) == ["guest-of", "tie-c", "tie-a", "old"]
+
+def test_list_projects_rejects_bad_cursors(client, projects, auth_headers):
+    for cursor in ("not-a-cursor", "WzFd", "WyJub3QgYSBkYXRlIiwxXQ"):  # garbage, [1], ["not a date",1]
+        assert client.get("/projects", params={"cursor": cursor}, headers=auth_headers).status_code == 400